@@ -8,9 +8,22 @@ from pathlib import Path
 from backend.job_matcher import JobMatcher
 from backend.resume_parser import ResumeParser
 from backend.mcq_generator import MCQGenerator
+from backend.analysis_executor import get_executor
+from backend.report_generator import ReportGenerator, prune_exports
+from backend.history_store import HistoryStore
+from config.settings import EXPORT_DIR
 
 # Import frontend components
 from frontend.pages.home import render_home_page
+from frontend.pages.batch_jobs import render_batch_jobs_page
+from frontend.pages.search import render_search_page
+from frontend.pages.export import render_history_page, download_results
+from frontend.components.performance_panel import render_performance_panel
+from frontend.components.session import session_id
+from frontend.components.charts import render_pool_charts
+from frontend.components.fragments import fragment, session_cached
+
+RANKING_PAGE_SIZES = [10, 25, 50, 100]
 
 # Page settings
 st.set_page_config(
@@ -29,6 +42,12 @@ if 'candidates' not in st.session_state:
     st.session_state.candidates = []
 if 'job_skills' not in st.session_state:
     st.session_state.job_skills = []
+if 'analysis_results' not in st.session_state:
+    st.session_state.analysis_results = None
+if 'analysis_version' not in st.session_state:
+    st.session_state.analysis_version = 0  # bumped with every new analysis, invalidating derived exports
+if 'mcq_results' not in st.session_state:
+    st.session_state.mcq_results = None
 
 def render_analysis_page():
     """Render the candidate analysis page"""
@@ -56,36 +75,52 @@ def render_analysis_page():
         accept_multiple_files=True
     )
     
+    # Once an analysis exists, new resumes can be merged into it instead of starting over
+    add_mode = False
+    if st.session_state.analysis_results:
+        add_mode = st.radio(
+            "Analysis mode",
+            ["🔍 New analysis", "➕ Add to analysis"],
+            horizontal=True,
+            help="Add to analysis parses only the new files and merges them into the current ranking"
+        ) == "➕ Add to analysis"
+    
     if resume_files and st.session_state.job_description:
-        if st.button("🔍 Analyze Candidates", type="primary"):
-            with st.spinner("Analyzing candidates..."):
+        button_label = "➕ Add to Analysis" if add_mode else "🔍 Analyze Candidates"
+        if st.button(button_label, type="primary"):
+            with st.spinner("Adding candidates..." if add_mode else "Analyzing candidates..."):
                 try:
-                    # Initialize components
-                    job_matcher = JobMatcher()
-                    
-                    # Save uploaded files temporarily
-                    temp_files = []
-                    with tempfile.TemporaryDirectory() as temp_dir:
-                        for resume_file in resume_files:
-                            temp_path = os.path.join(temp_dir, resume_file.name)
-                            with open(temp_path, 'wb') as f:
-                                f.write(resume_file.getbuffer())
-                            temp_files.append(temp_path)
-                        
-                        # Perform analysis
-                        results = job_matcher.match_resumes_to_job(
-                            temp_files, 
-                            st.session_state.job_description,
-                            st.session_state.job_title
-                        )
+                    # Parsing runs in the shared process pool, a few files per task queued fairly
+                    # with other sessions; duplicates are checked against the persistent pool index.
+                    # Tasks still queued from an analysis this session abandoned are dropped first.
+                    executor = get_executor()
+                    executor.cancel_session(session_id())
+                    uploads = [(resume_file.name, resume_file.getvalue()) for resume_file in resume_files]
+                    results = executor.match_uploads(
+                        session_id(),
+                        uploads,
+                        st.session_state.job_description,
+                        st.session_state.job_title,
+                        base_results=st.session_state.analysis_results if add_mode else None
+                    )
                     
                     if 'error' in results:
                         st.error(f"Error: {results['error']}")
                     else:
-                        # Store results in session state
+                        # Store results in session state and the run history
+                        st.session_state.analysis_results = results
+                        st.session_state.analysis_version += 1
+                        results['run_id'] = HistoryStore().record_results(
+                            results, st.session_state.job_description
+                        )
                         st.session_state.candidates = results['candidates']
                         st.session_state.job_skills = results['extracted_skills']
                         
+                        if add_mode:
+                            st.info(f"➕ Added {len(results['added_files'])} new candidate(s)")
+                            if results['skipped_files']:
+                                st.warning(f"Skipped files already in the analysis: {', '.join(results['skipped_files'])}")
+                        
                         # Display results
                         display_analysis_results(results)
                         
@@ -94,15 +129,9 @@ def render_analysis_page():
                     st.error("Please check your files and try again.")
     
     # Display previous results if available
-    elif st.session_state.candidates:
+    elif st.session_state.analysis_results:
         st.info("📋 Showing previous analysis results")
-        results = {
-            'candidates': st.session_state.candidates,
-            'extracted_skills': st.session_state.job_skills,
-            'shortlist': st.session_state.candidates[:3],
-            'total_candidates': len(st.session_state.candidates)
-        }
-        display_analysis_results(results)
+        display_analysis_results(st.session_state.analysis_results)
 
 def display_analysis_results(results):
     """Display the analysis results"""
@@ -152,100 +181,167 @@ def display_analysis_results(results):
     else:
         st.warning("No technical skills detected in job description")
     
-    # Display candidates
+    # Pool overview (binned, so it stays light for large pools)
+    with st.expander("📈 Pool Overview", expanded=False):
+        render_pool_charts(results['candidates'], results['extracted_skills'])
+    
+    render_candidate_rankings()
+    render_export_controls()
+
+@fragment
+def render_candidate_rankings():
+    """Candidate expanders, a page at a time; changing the page size reruns only this part"""
+    candidates = st.session_state.analysis_results['candidates']
     st.subheader("👥 Candidate Rankings")
+    shown = len(candidates)
+    if len(candidates) > RANKING_PAGE_SIZES[0]:
+        choice = st.selectbox("Show", RANKING_PAGE_SIZES + ["All"], index=1, key="rankings_shown",
+                              format_func=lambda size: f"All {len(candidates)}" if size == "All" else f"Top {size}")
+        shown = len(candidates) if choice == "All" else choice
     
-    for idx, candidate in enumerate(results['candidates']):
-        with st.expander(f"#{idx+1} {candidate['name']} - Score: {candidate['overall_score']:.1f}/10"):
-            col1, col2 = st.columns(2)
+    for idx, candidate in enumerate(candidates[:shown]):
+        render_candidate(idx, candidate)
+
+def render_candidate(idx, candidate):
+    """One candidate's expander with contact details, skills and score breakdown"""
+    duplicate_tag = " 🔁 Duplicate" if candidate.get('is_duplicate') else ""
+    with st.expander(f"#{idx+1} {candidate['name']} - Score: {candidate['overall_score']:.1f}/10{duplicate_tag}"):
+        if candidate.get('is_duplicate'):
+            st.warning(
+                f"🔁 {candidate['duplicate_type'].title()} duplicate of **{candidate['duplicate_of']}** "
+                f"(similarity {candidate['duplicate_similarity']:.0%}) - features reused from the earlier resume"
+            )
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Contact Information:**")
+            st.write(f"📧 {candidate['email']}")
+            st.write(f"📱 {candidate['phone']}")
+            st.write(f"📄 {candidate['file_name']}")
             
-            with col1:
-                st.write("**Contact Information:**")
-                st.write(f"📧 {candidate['email']}")
-                st.write(f"📱 {candidate['phone']}")
-                st.write(f"📄 {candidate['file_name']}")
-                
-                st.write("**Experience:**")
-                st.write(f"🕐 {candidate['experience_years']} years")
-                st.write(f"📊 Level: {candidate['experience_level']}")
-                st.write(f"💼 Projects: {candidate['projects_count']}")
+            st.write("**Experience:**")
+            st.write(f"🕐 {candidate['experience_years']} years")
+            if candidate.get('experience_periods'):
+                st.caption(f"From dates: {candidate['experience_months']} months ({', '.join(candidate['experience_periods'])})")
+            if candidate.get('declared_experience_years') is not None:
+                st.caption(f"Declared: {candidate['declared_experience_years']} years")
+            st.write(f"📊 Level: {candidate['experience_level']}")
+            st.write(f"💼 Projects: {candidate['projects_count']}")
+        
+        with col2:
+            st.write("**Skills Matched:**")
+            if candidate['skills']:
+                # Display candidate skills using the same styling as job skills
+                skills_to_show = candidate['skills'][:10]  # Show first 10 skills
+                for i in range(0, len(skills_to_show), 3):
+                    cols = st.columns(3)
+                    for j, skill in enumerate(skills_to_show[i:i+3]):
+                        with cols[j]:
+                            st.markdown(f"""
+                            <div style="
+                                background-color: #e8f5e8;
+                                color: #155724;
+                                padding: 3px 8px;
+                                border-radius: 12px;
+                                text-align: center;
+                                margin: 1px;
+                                font-size: 11px;
+                                font-weight: 500;
+                                border: 1px solid #d4edda;
+                            ">
+                                {skill}{' ≈' if skill in candidate.get('fuzzy_skills', ()) else ''}
+                            </div>
+                            """, unsafe_allow_html=True)
+                if candidate.get('fuzzy_skills'):
+                    st.caption("≈ matched a misspelling or variant (partial credit)")
+            else:
+                st.write("No matching skills found")
             
-            with col2:
-                st.write("**Skills Matched:**")
-                if candidate['skills']:
-                    # Display candidate skills using the same styling as job skills
-                    skills_to_show = candidate['skills'][:10]  # Show first 10 skills
-                    for i in range(0, len(skills_to_show), 3):
-                        cols = st.columns(3)
-                        for j, skill in enumerate(skills_to_show[i:i+3]):
-                            with cols[j]:
-                                st.markdown(f"""
-                                <div style="
-                                    background-color: #e8f5e8;
-                                    color: #155724;
-                                    padding: 3px 8px;
-                                    border-radius: 12px;
-                                    text-align: center;
-                                    margin: 1px;
-                                    font-size: 11px;
-                                    font-weight: 500;
-                                    border: 1px solid #d4edda;
-                                ">
-                                    {skill}
-                                </div>
-                                """, unsafe_allow_html=True)
-                else:
-                    st.write("No matching skills found")
-                
-                st.write("**Scoring Breakdown:**")
-                st.write(f"• **Skill Match:** {candidate['skill_match']}/10")
-                st.write(f"• **Project Relevance:** {candidate.get('project_relevance', 0):.1f}/10")
-                st.write(f"• **Experience Level:** {candidate.get('experience_score', 0):.1f}/10")
-                st.write(f"• **Overall Score:** {candidate['overall_score']:.1f}/10")
-                
-                # Add relevance explanation
-                st.write("**Why This Candidate Ranks Here:**")
-                relevance_reasons = []
-                if candidate['skill_match'] >= 7:
-                    relevance_reasons.append("✅ Strong skill alignment with job requirements")
-                elif candidate['skill_match'] >= 5:
-                    relevance_reasons.append("⚠️ Moderate skill match with room for growth")
-                else:
-                    relevance_reasons.append("❌ Limited skill match - may need extensive training")
-                
-                if candidate['experience_years'] >= 3:
-                    relevance_reasons.append("✅ Solid experience in relevant field")
-                elif candidate['experience_years'] >= 1:
-                    relevance_reasons.append("⚠️ Some experience, suitable for junior roles")
-                else:
-                    relevance_reasons.append("❌ Entry-level candidate - requires mentoring")
-                
-                if candidate['projects_count'] >= 3:
-                    relevance_reasons.append("✅ Demonstrated project delivery capability")
-                elif candidate['projects_count'] >= 1:
-                    relevance_reasons.append("⚠️ Limited project experience shown")
-                else:
-                    relevance_reasons.append("❌ No clear project experience mentioned")
-                
-                for reason in relevance_reasons:
-                    st.write(f"  {reason}")
+            st.write("**Scoring Breakdown:**")
+            st.write(f"• **Skill Match:** {candidate['skill_match']}/10")
+            st.write(f"• **Project Relevance:** {candidate.get('project_relevance', 0):.1f}/10")
+            st.write(f"• **Experience Level:** {candidate.get('experience_score', 0):.1f}/10")
+            st.write(f"• **Overall Score:** {candidate['overall_score']:.1f}/10")
             
-            # Show projects if available
-            if candidate.get('projects'):
-                st.write("**Recent Projects:**")
-                for project in candidate['projects'][:3]:
-                    st.write(f"• {project}")
-    
-    # Export option
+            # Add relevance explanation
+            st.write("**Why This Candidate Ranks Here:**")
+            relevance_reasons = []
+            if candidate['skill_match'] >= 7:
+                relevance_reasons.append("✅ Strong skill alignment with job requirements")
+            elif candidate['skill_match'] >= 5:
+                relevance_reasons.append("⚠️ Moderate skill match with room for growth")
+            else:
+                relevance_reasons.append("❌ Limited skill match - may need extensive training")
+            
+            if candidate['experience_years'] >= 3:
+                relevance_reasons.append("✅ Solid experience in relevant field")
+            elif candidate['experience_years'] >= 1:
+                relevance_reasons.append("⚠️ Some experience, suitable for junior roles")
+            else:
+                relevance_reasons.append("❌ Entry-level candidate - requires mentoring")
+            
+            if candidate['projects_count'] >= 3:
+                relevance_reasons.append("✅ Demonstrated project delivery capability")
+            elif candidate['projects_count'] >= 1:
+                relevance_reasons.append("⚠️ Limited project experience shown")
+            else:
+                relevance_reasons.append("❌ No clear project experience mentioned")
+            
+            for reason in relevance_reasons:
+                st.write(f"  {reason}")
+        
+        # Show projects if available
+        if candidate.get('projects'):
+            st.write("**Recent Projects:**")
+            for project in candidate['projects'][:3]:
+                st.write(f"• {project}")
+
+@fragment
+def render_export_controls():
+    """CSV export and PDF dossiers; their buttons rerun only this part of the page"""
+    results = st.session_state.analysis_results
+    version = st.session_state.analysis_version
     st.subheader("📤 Export Results")
-    if st.button("Download Results as CSV"):
-        csv_data = generate_csv_export(results['candidates'])
-        st.download_button(
-            label="📥 Download CSV",
-            data=csv_data,
-            file_name=f"candidate_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv"
-        )
+    if results.get('run_id'):
+        # Exported from the stored run, so the file matches the history
+        download_results(results['run_id'])
+    else:
+        csv_data, file_name = session_cached('analysis_csv', version, lambda: (
+            generate_csv_export(results['candidates']),
+            f"candidate_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        ))
+        st.download_button(label="📥 Download Results as CSV", data=csv_data, file_name=file_name, mime="text/csv")
+    
+    # One PDF dossier per candidate, rendered in the shared worker pool
+    report_scope = st.radio("PDF dossiers for", ["Shortlist", "All candidates"], horizontal=True)
+    if st.button("📄 Generate PDF Dossiers"):
+        report_candidates = results['shortlist'] if report_scope == "Shortlist" else results['candidates']
+        matcher = JobMatcher()
+        analyses = [
+            matcher.get_candidate_analysis(candidate, results['extracted_skills'])
+            for candidate in report_candidates
+        ]
+        # Only the latest archive of a session is kept, and abandoned ones expire
+        previous = st.session_state.pop('dossier_zip', None)
+        if previous:
+            previous[2].unlink(missing_ok=True)
+        prune_exports(EXPORT_DIR, 'dossiers_*.zip')
+        zip_path = EXPORT_DIR / f"dossiers_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{session_id()[:8]}.zip"
+        with st.spinner(f"Rendering {len(analyses)} dossier(s)..."):
+            with ReportGenerator(executor=get_executor(), session_id=session_id()) as generator:
+                generator.write_zip(analyses, zip_path, results.get('job_title'))
+        st.session_state.dossier_zip = (version, report_scope, zip_path)
+    
+    # The last archive stays downloadable until the analysis or scope changes
+    dossier = st.session_state.get('dossier_zip')
+    if dossier and dossier[:2] == (version, report_scope) and dossier[2].exists():
+        with open(dossier[2], 'rb') as f:
+            st.download_button(
+                label="📥 Download Dossiers (.zip)",
+                data=f,
+                file_name=dossier[2].name,
+                mime="application/zip"
+            )
 
 def generate_csv_export(candidates):
     """Generate CSV data for export"""
@@ -296,7 +392,11 @@ def render_mcq_generation():
     with col2:
         st.write(f"**Skills Required:** {len(st.session_state.job_skills)}")
     
-    # MCQ Generation Options
+    render_mcq_panel()
+
+@fragment
+def render_mcq_panel():
+    """MCQ options, questions and download; generated questions stay in session state"""
     st.subheader("⚙️ MCQ Options")
     col1, col2 = st.columns(2)
     with col1:
@@ -304,6 +404,8 @@ def render_mcq_generation():
     with col2:
         difficulty = st.selectbox("Difficulty Level", ["Easy", "Medium", "Hard"], index=1)
     
+    # Questions belong to the job they were generated for
+    job_key = (st.session_state.job_description, tuple(st.session_state.job_skills))
     if st.button("🎯 Generate MCQs", type="primary"):
         with st.spinner("Generating MCQs..."):
             try:
@@ -316,31 +418,38 @@ def render_mcq_generation():
                     num_questions,
                     difficulty
                 )
-                
-                st.success(f"✅ Generated {len(mcqs)} MCQs!")
-                
-                # Display MCQs
-                for idx, mcq in enumerate(mcqs, 1):
-                    with st.expander(f"Question {idx}: {mcq['question'][:50]}..."):
-                        st.write(f"**Question:** {mcq['question']}")
-                        st.write("**Options:**")
-                        for option_idx, option in enumerate(mcq['options'], 1):
-                            prefix = "✅" if option_idx == mcq['correct_answer'] else "  "
-                            st.write(f"{prefix} {chr(64+option_idx)}. {option}")
-                        st.write(f"**Explanation:** {mcq.get('explanation', 'No explanation provided')}")
-                
-                # Export MCQs
-                if st.button("📥 Download MCQs"):
-                    mcq_text = format_mcqs_for_export(mcqs)
-                    st.download_button(
-                        label="Download MCQs as Text",
-                        data=mcq_text,
-                        file_name=f"mcqs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-                        mime="text/plain"
-                    )
-                    
+                st.session_state.mcq_results = {
+                    'job_key': job_key,
+                    'mcqs': mcqs,
+                    'text': format_mcqs_for_export(mcqs),
+                    'file_name': f"mcqs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
+                }
             except Exception as e:
                 st.error(f"Error generating MCQs: {str(e)}")
+    
+    generated = st.session_state.mcq_results
+    if not generated or generated['job_key'] != job_key:
+        return
+    mcqs = generated['mcqs']
+    st.success(f"✅ Generated {len(mcqs)} MCQs!")
+    
+    # Display MCQs
+    for idx, mcq in enumerate(mcqs, 1):
+        with st.expander(f"Question {idx}: {mcq['question'][:50]}..."):
+            st.write(f"**Question:** {mcq['question']}")
+            st.write("**Options:**")
+            for option_idx, option in enumerate(mcq['options'], 1):
+                prefix = "✅" if option_idx == mcq['correct_answer'] else "  "
+                st.write(f"{prefix} {chr(64+option_idx)}. {option}")
+            st.write(f"**Explanation:** {mcq.get('explanation', 'No explanation provided')}")
+    
+    # Export MCQs
+    st.download_button(
+        label="📥 Download MCQs",
+        data=generated['text'],
+        file_name=generated['file_name'],
+        mime="text/plain"
+    )
 
 def format_mcqs_for_export(mcqs):
     """Format MCQs for text export"""
@@ -368,7 +477,7 @@ def format_mcqs_for_export(mcqs):
 def main():
     # Sidebar Navigation
     st.sidebar.title("🧭 Navigation")
-    page = st.sidebar.radio("Select Page", ["🏠 Home", "📊 Candidate Analysis", "❓ Generate MCQs"])
+    page = st.sidebar.radio("Select Page", ["🏠 Home", "📊 Candidate Analysis", "❓ Generate MCQs", "📦 Batch Jobs", "🔎 Search", "🗂️ History"])
     
     # App Title
     st.title("🤖 AI HR Recruitment Assistant")
@@ -381,6 +490,15 @@ def main():
         render_analysis_page()
     elif page == "❓ Generate MCQs":
         render_mcq_generation()
+    elif page == "📦 Batch Jobs":
+        render_batch_jobs_page()
+    elif page == "🔎 Search":
+        render_search_page()
+    elif page == "🗂️ History":
+        render_history_page()
+    
+    # Rendered after the page so it reflects the run that just finished
+    render_performance_panel()
     
     # Footer
     st.markdown("---")
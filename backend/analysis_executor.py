@@ -0,0 +1,249 @@
+import atexit
+import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Tuple, Callable
+
+from backend.job_matcher import JobMatcher
+from backend.metrics import metrics, get_logger, log_event
+from backend.search_index import SearchIndex, get_search_store
+from backend.workers import init_worker, parse_resume_bytes, parse_upload_chunk
+from config.settings import ANALYSIS_WORKERS, ANALYSIS_MAX_IN_FLIGHT, ANALYSIS_CHUNK_FILES, SEARCH_ENABLED
+
+logger = get_logger('analysis_executor')
+
+
+class AnalysisExecutor:
+    """Process pool shared by every session of a server, with fair per-session queuing
+
+    Tasks are queued per session and handed to the pool round-robin across
+    sessions, never more than ``max_in_flight`` at a time. Analyses are split
+    into tasks of a few files each, so a session that submits a thousand
+    resumes only gets every n-th free slot while others are waiting, and
+    CPU-heavy parsing runs outside the server process so it does not hold
+    the GIL for everyone else. If a worker dies (crash, OOM kill) the pool is
+    replaced: the tasks that were running in it fail, queued ones run on.
+    """
+
+    def __init__(self, workers: int = ANALYSIS_WORKERS, max_in_flight: int = ANALYSIS_MAX_IN_FLIGHT):
+        self.workers = workers
+        self.max_in_flight = max(1, max_in_flight)
+        self.pool = self._start_pool()
+        self._queues: 'OrderedDict[str, deque]' = OrderedDict()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        # Skill extraction, scoring and ranking run in the server process
+        self.matcher = JobMatcher()
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker)
+        # Start every worker now, from the thread creating the pool: under Streamlit,
+        # __main__ is the page script, which spawn/forkserver workers would re-run
+        list(pool.map(_warm_up, range(self.workers)))
+        return pool
+
+    def _replace_pool(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """Swap a pool whose worker died for a new one (once, however many of its tasks report it)"""
+        with self._lock:
+            if self.pool is broken and not self._closed:
+                self.pool = self._start_pool()
+                log_event(logger, 'analysis_pool_restarted', logging.WARNING, workers=self.workers)
+            pool = self.pool
+        broken.shutdown(wait=False)
+        return pool
+
+    def submit(self, session_id: str, fn: Callable, *args) -> Future:
+        """Queue ``fn(*args)`` for a session; the returned future resolves when it has run"""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Analysis executor is shut down')
+            self._queues.setdefault(session_id, deque()).append((future, fn, args))
+        self._dispatch()
+        return future
+
+    def _next_tasks(self) -> List[Tuple[Future, Callable, tuple]]:
+        """Take tasks for the free slots, one per session in turn (call with the lock held)"""
+        tasks = []
+        while self._in_flight < self.max_in_flight and self._queues:
+            session_id, queue = self._queues.popitem(last=False)
+            future, fn, args = queue.popleft()
+            if queue:
+                # Back of the line until every other waiting session had a turn
+                self._queues[session_id] = queue
+            if future.set_running_or_notify_cancel():
+                self._in_flight += 1
+                tasks.append((future, fn, args))
+        return tasks
+
+    def _dispatch(self):
+        with self._lock:
+            tasks = self._next_tasks()
+            pool = self.pool
+        # Submit outside the lock: done callbacks of fast tasks re-enter _dispatch
+        for future, fn, args in tasks:
+            try:
+                try:
+                    pool_future = pool.submit(fn, *args)
+                except BrokenProcessPool:
+                    # The pool broke after this task was taken from its queue; it never ran
+                    pool = self._replace_pool(pool)
+                    pool_future = pool.submit(fn, *args)
+            except Exception as e:
+                future.set_exception(e)
+                self._task_done()
+                continue
+            pool_future.add_done_callback(lambda done, future=future, pool=pool: self._finish(future, pool, done))
+
+    def _finish(self, future: Future, pool: ProcessPoolExecutor, pool_future: Future):
+        error = pool_future.exception()
+        if error is not None:
+            if isinstance(error, BrokenProcessPool):
+                self._replace_pool(pool)
+            future.set_exception(error)
+        else:
+            future.set_result(pool_future.result())
+        self._task_done()
+
+    def _task_done(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._dispatch()
+
+    def pending(self, session_id: str = None) -> int:
+        """Tasks still waiting for a slot (for one session, or in total)"""
+        with self._lock:
+            if session_id is not None:
+                return len(self._queues.get(session_id, ()))
+            return sum(len(queue) for queue in self._queues.values())
+
+    def map(self, session_id: str, fn: Callable, *iterables) -> List[Any]:
+        """Run ``fn`` over the arguments for a session and return the results in order"""
+        futures = [self.submit(session_id, fn, *args) for args in zip(*iterables)]
+        return [future.result() for future in futures]
+
+    def parse_uploads(self, session_id: str, uploads: List[Tuple[str, bytes]],
+                      job_skills: List[str] = None) -> List[Dict[str, Any]]:
+        """Parse uploaded (file name, bytes) pairs in the pool, in upload order"""
+        futures = [self.submit(session_id, parse_resume_bytes, name, data, job_skills) for name, data in uploads]
+        candidates = []
+        with metrics.run('parse_uploads'):
+            for future in futures:
+                candidate, worker_run = future.result()
+                metrics.merge_run(worker_run)
+                candidates.append(candidate)
+        return candidates
+
+    def match_uploads(self, session_id: str, uploads: List[Tuple[str, bytes]], job_description: str,
+                      job_title: str = None, base_results: Dict[str, Any] = None,
+                      chunk_files: int = ANALYSIS_CHUNK_FILES) -> Dict[str, Any]:
+        """Run an analysis (or an append to ``base_results``) of uploaded resumes
+
+        Uploads are parsed in the pool as one task per ``chunk_files`` files,
+        queued fairly with other sessions' tasks; their texts are written to
+        the search index as one segment. The results have the format of
+        JobMatcher.match_resumes_to_job (or append_resumes_to_analysis).
+        """
+        matcher = self.matcher
+        with metrics.run('match_uploads'):
+            if base_results is None:
+                if not job_description or not job_description.strip():
+                    return {'error': 'Job description is required', 'extracted_skills': [], 'candidates': [],
+                            'shortlist': []}
+                if not uploads:
+                    return {'error': 'At least one resume file is required', 'extracted_skills': [],
+                            'candidates': [], 'shortlist': []}
+                job_skills = matcher.extract_skills_from_job_description(job_description, job_title)
+                if not job_skills:
+                    log_event(logger, 'no_job_skills_detected', logging.WARNING, job_title=job_title)
+                skipped = []
+            else:
+                job_skills = base_results.get('extracted_skills', [])
+                names, skipped = matcher.select_new_files(base_results, [name for name, _ in uploads])
+                by_name = dict(uploads)
+                uploads = [(name, by_name[name]) for name in names]
+
+            candidates = self._parse_in_chunks(session_id, uploads, job_skills, max(1, chunk_files))
+            if base_results is not None:
+                return matcher.add_candidates_to_analysis(base_results, candidates, skipped)
+            return matcher.build_match_results(candidates, job_skills, job_description, job_title)
+
+    def _parse_in_chunks(self, session_id: str, uploads: List[Tuple[str, bytes]], job_skills: List[str],
+                         chunk_files: int) -> List[Dict[str, Any]]:
+        futures = [self.submit(session_id, parse_upload_chunk, uploads[start:start + chunk_files], job_skills)
+                   for start in range(0, len(uploads), chunk_files)]
+        candidates = []
+        search_index = SearchIndex() if SEARCH_ENABLED else None
+        try:
+            for future in futures:
+                chunk_candidates, chunk_index, worker_run = future.result()
+                metrics.merge_run(worker_run)
+                candidates.extend(chunk_candidates)
+                if search_index is not None and chunk_index is not None:
+                    search_index.merge(chunk_index)
+        except BaseException:
+            # The analysis has failed: chunks still waiting for a slot need not run
+            for future in futures:
+                future.cancel()
+            raise
+        _flag_cross_chunk_duplicates(candidates)
+        if search_index is not None:
+            store = get_search_store()
+            store.write(search_index)
+            store.compact_in_background()
+        return candidates
+
+    def cancel_session(self, session_id: str) -> int:
+        """Drop a session's queued (not yet running) tasks, e.g. when it starts over or disconnects"""
+        with self._lock:
+            queue = self._queues.pop(session_id, deque())
+        for future, _, _ in queue:
+            future.cancel()
+        return len(queue)
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            queues, self._queues = self._queues, OrderedDict()
+        for queue in queues.values():
+            for future, _, _ in queue:
+                future.cancel()
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _warm_up(_):
+    return True
+
+
+def _flag_cross_chunk_duplicates(candidates: List[Dict[str, Any]]):
+    """Mark exact copies that chunks parsed at the same time could not see in each other's index entries"""
+    first_by_hash = {}
+    for candidate in candidates:
+        digest = candidate.get('content_hash')
+        if not digest or candidate.get('raw_text') == 'Failed to parse resume':
+            continue
+        original = first_by_hash.setdefault(digest, candidate['file_name'])
+        if original != candidate['file_name'] and not candidate.get('is_duplicate'):
+            metrics.increment('duplicates')
+            candidate.update(is_duplicate=True, duplicate_of=original, duplicate_type='exact',
+                             duplicate_similarity=1.0)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> AnalysisExecutor:
+    """The server process's shared executor, created on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = AnalysisExecutor()
+                atexit.register(_executor.shutdown)
+                log_event(logger, 'analysis_executor_started', logging.INFO,
+                          workers=_executor.workers, max_in_flight=_executor.max_in_flight)
+    return _executor
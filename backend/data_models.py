@@ -57,3 +57,12 @@ class MCQQuestion:
     difficulty: str
     skill: str = ""
     explanation: str = ""
+
+@dataclass
+class ResumeSection:
+    label: str
+    heading: str
+    start_line: int
+    end_line: int   # exclusive
+    start: int      # character offsets into the resume text
+    end: int
@@ -0,0 +1,238 @@
+import hashlib
+import pickle
+import re
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from config.settings import DEDUP_NUM_PERM, DEDUP_BANDS, DEDUP_SHINGLE_SIZE, DEDUP_THRESHOLD
+
+# Mersenne-like prime just above 2**32 for universal hashing of 32-bit shingle hashes
+_PRIME = np.uint64(4294967311)
+_NON_WORD = re.compile(r'[^a-z0-9@.+#]+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS params (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    file_name TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    skills_key BLOB NOT NULL,
+    candidate BLOB NOT NULL
+);
+"""
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse punctuation/whitespace so layout changes do not matter"""
+    return _NON_WORD.sub(' ', text.lower()).strip()
+
+
+def content_hash(text: str) -> str:
+    """Exact-duplicate fingerprint of a resume's normalised text"""
+    return hashlib.sha1(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+class MinHasher:
+    """MinHash signatures over word shingles, vectorised with NumPy"""
+
+    def __init__(self, num_perm: int = DEDUP_NUM_PERM, shingle_size: int = DEDUP_SHINGLE_SIZE, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        # a < 2**31 keeps a * x + b below 2**64 for 32-bit x
+        self.a = rng.integers(1, 2 ** 31, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 2 ** 31, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+
+    def shingles(self, normalized: str) -> np.ndarray:
+        words = normalized.split()
+        size = self.shingle_size
+        if len(words) < size:
+            grams = [' '.join(words)] if words else []
+        else:
+            grams = {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+        return np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64)
+
+    def signature(self, normalized: str) -> np.ndarray:
+        hashes = self.shingles(normalized)
+        if hashes.size == 0:
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        permuted = (np.outer(hashes, self.a) + self.b) % _PRIME
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def estimated_similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the two shingle sets"""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+class DuplicateIndex:
+    """Exact and near-duplicate lookup for resumes, backed by MinHash LSH
+
+    Every indexed resume is stored with its parsed features, so a later
+    duplicate can reuse them instead of being parsed from scratch. The index
+    can be persisted to disk to detect duplicates across batches.
+
+    On disk it is a SQLite table of entries shared by the UI, pool workers
+    and the watch daemon. ``save`` appends only the entries added since the
+    last save and, in the same transaction, merges in those other processes
+    have saved meanwhile, so concurrent writers never overwrite each other.
+    Band buckets are slices of the stored signatures and are rebuilt in
+    memory on load.
+    """
+
+    def __init__(self, threshold: float = DEDUP_THRESHOLD, num_perm: int = DEDUP_NUM_PERM,
+                 bands: int = DEDUP_BANDS, path: str = None):
+        if num_perm % bands:
+            raise ValueError('num_perm must be divisible by bands')
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self.path = Path(path) if path else None
+        self.entries: List[Dict[str, Any]] = []
+        self.signatures: List[np.ndarray] = []
+        self.exact: Dict[str, int] = {}
+        self.buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._unsaved: List[int] = []
+        self._last_row = 0  # highest stored row already in memory
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def fingerprint(self, text: str) -> Tuple[str, np.ndarray]:
+        normalized = normalize_text(text)
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest(), self.hasher.signature(normalized)
+
+    def find(self, text: str = None, fingerprint: Tuple[str, np.ndarray] = None) -> Optional[Dict[str, Any]]:
+        """Best earlier match for a resume, or None
+
+        Returns the stored entry plus ``match_type`` ('exact' or 'near') and
+        the estimated ``similarity``.
+        """
+        digest, signature = fingerprint or self.fingerprint(text)
+        with self._lock:
+            if digest in self.exact:
+                return dict(self.entries[self.exact[digest]], match_type='exact', similarity=1.0)
+
+            candidates = set()
+            for key in self._band_keys(signature):
+                candidates.update(self.buckets.get(key, ()))
+
+            best, best_similarity = None, self.threshold
+            for entry_id in candidates:
+                similarity = estimated_similarity(signature, self.signatures[entry_id])
+                if similarity >= best_similarity:
+                    best, best_similarity = entry_id, similarity
+
+        if best is None:
+            return None
+        return dict(self.entries[best], match_type='near', similarity=round(best_similarity, 3))
+
+    def add(self, file_name: str, candidate: Dict[str, Any], skills_key: tuple,
+            text: str = None, fingerprint: Tuple[str, np.ndarray] = None) -> int:
+        """Index a parsed resume together with the features extracted from it"""
+        digest, signature = fingerprint or self.fingerprint(text)
+        with self._lock:
+            entry_id = self._insert(file_name, digest, signature, candidate, skills_key)
+            self._unsaved.append(entry_id)
+        return entry_id
+
+    def _insert(self, file_name: str, digest: str, signature: np.ndarray, candidate: Dict[str, Any],
+                skills_key: tuple) -> int:
+        entry_id = len(self.entries)
+        self.entries.append({
+            'entry_id': entry_id,
+            'file_name': file_name,
+            'content_hash': digest,
+            'candidate': candidate,
+            'skills_key': skills_key,
+        })
+        self.signatures.append(signature)
+        self.exact.setdefault(digest, entry_id)
+        for key in self._band_keys(signature):
+            self.buckets.setdefault(key, []).append(entry_id)
+        return entry_id
+
+    @contextmanager
+    def _connect(self):
+        if self.path is None:
+            raise ValueError('No path given for saving the duplicate index')
+        conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _merge_stored(self, conn: sqlite3.Connection):
+        """Load the entries other processes stored since this index last read the table"""
+        rows = conn.execute(
+            'SELECT id, file_name, content_hash, signature, skills_key, candidate FROM entries '
+            'WHERE id > ? ORDER BY id', (self._last_row,)
+        )
+        for row_id, file_name, digest, signature, skills_key, candidate in rows:
+            self._insert(file_name, digest, np.frombuffer(signature, dtype=np.uint32),
+                         pickle.loads(candidate), pickle.loads(skills_key))
+            self._last_row = row_id
+
+    def refresh(self):
+        """Pick up the entries other processes saved since this index last read the table"""
+        with self._lock, self._connect() as conn:
+            self._merge_stored(conn)
+
+    def save(self):
+        """Append the entries added since the last save, and pick up the ones other processes saved"""
+        with self._lock, self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            unsaved = [self.entries[entry_id] for entry_id in self._unsaved]
+            signatures = [self.signatures[entry_id] for entry_id in self._unsaved]
+            self._merge_stored(conn)
+            last_row = self._last_row
+            for entry, signature in zip(unsaved, signatures):
+                last_row = conn.execute(
+                    'INSERT INTO entries (file_name, content_hash, signature, skills_key, candidate) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (entry['file_name'], entry['content_hash'], signature.astype(np.uint32).tobytes(),
+                     pickle.dumps(entry['skills_key'], protocol=pickle.HIGHEST_PROTOCOL),
+                     pickle.dumps(entry['candidate'], protocol=pickle.HIGHEST_PROTOCOL))
+                ).lastrowid
+            conn.execute('COMMIT')
+            self._last_row = last_row
+            self._unsaved = []
+
+    @classmethod
+    def load_or_create(cls, path: str, **kwargs) -> 'DuplicateIndex':
+        """Load a persisted index, or start an empty one that will save to ``path``
+
+        The signature shape is fixed when the table is created; a stored
+        index keeps its own ``num_perm`` and ``bands``.
+        """
+        index = cls(path=path, **kwargs)
+        with index._connect() as conn:
+            conn.executescript(SCHEMA)
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany('INSERT OR IGNORE INTO params (name, value) VALUES (?, ?)',
+                             [('num_perm', index.hasher.num_perm), ('bands', index.bands)])
+            params = dict(conn.execute('SELECT name, value FROM params'))
+            conn.execute('COMMIT')
+            if (params['num_perm'], params['bands']) != (index.hasher.num_perm, index.bands):
+                index = cls(num_perm=params['num_perm'], bands=params['bands'], path=path,
+                            **{k: v for k, v in kwargs.items() if k not in ('num_perm', 'bands')})
+            index._merge_stored(conn)
+        return index
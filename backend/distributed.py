@@ -0,0 +1,345 @@
+import argparse
+import heapq
+import ipaddress
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from multiprocessing.managers import BaseManager
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+from backend.job_matcher import JobMatcher
+from backend.job_queue import expand_resume_paths
+from backend.metrics import get_logger, log_event
+from backend.workers import parse_resume_bytes
+from config.settings import (
+    DIST_HOST, DIST_PORT, DIST_AUTHKEY, DIST_DEFAULT_AUTHKEY, DIST_SHARD_SIZE, DIST_TOP_K, DIST_LEASE_SECONDS,
+    DIST_MAX_ATTEMPTS
+)
+
+logger = get_logger('distributed')
+
+# Fields of a candidate sent back to the coordinator (no raw text or project descriptions)
+COMPACT_FIELDS = [
+    'name', 'email', 'phone', 'file_name', 'skills', 'fuzzy_skills', 'skill_match', 'experience_years',
+    'experience_level', 'projects_count', 'project_relevance', 'overall_score',
+]
+
+# Shard states
+PENDING, LEASED, DONE, FAILED = 'pending', 'leased', 'done', 'failed'
+
+
+def compact_record(candidate: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: candidate.get(field) for field in COMPACT_FIELDS}
+
+
+def _merge_key(record: Dict[str, Any]) -> tuple:
+    # The file name breaks ties, so the merged ranking does not depend on arrival order
+    return JobMatcher.rank_key(record) + (record['file_name'],)
+
+
+class ShardCoordinator:
+    """Splits a resume corpus into shards, leases them to workers and merges their top-k
+
+    Workers on other hosts talk to it through ``CoordinatorManager``. A shard
+    is leased to one worker at a time and re-dispatched when that worker stops
+    heartbeating for ``lease_seconds``; results for a shard that is already
+    done (from a worker presumed dead) are ignored, so every resume counts
+    once. Resume bytes travel with the shard, so workers need no shared disk.
+    Once every worker that registered has been silent for ``lease_seconds``,
+    the unfinished shards are failed, so ``wait`` does not block forever.
+    """
+
+    def __init__(self, job_description: str, resume_paths: List[str], job_title: str = None,
+                 shard_size: int = DIST_SHARD_SIZE, top_k: int = DIST_TOP_K,
+                 lease_seconds: float = DIST_LEASE_SECONDS, max_attempts: int = DIST_MAX_ATTEMPTS):
+        self.job_description = job_description
+        self.job_title = job_title
+        self.job_skills = JobMatcher().extract_skills_from_job_description(job_description, job_title)
+        self.top_k = top_k
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.shards = [
+            {'files': resume_paths[i:i + shard_size], 'status': PENDING, 'attempts': 0,
+             'worker_id': None, 'lease_expires': None}
+            for i in range(0, len(resume_paths), shard_size)
+        ]
+        self.top: List[Dict[str, Any]] = []
+        self.scored = 0
+        self.failed_files: List[str] = []
+        self.workers: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def register(self, worker_id: str) -> Dict[str, Any]:
+        """Called once by each worker; returns what it needs to score shards"""
+        with self._lock:
+            self.workers[worker_id] = time.time()
+        log_event(logger, 'worker_registered', worker_id=worker_id)
+        return {'job_skills': self.job_skills, 'job_description': self.job_description, 'job_title': self.job_title}
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Lease the next pending (or expired) shard, with its files' bytes, or None"""
+        now = time.time()
+        with self._lock:
+            self.workers[worker_id] = now
+            self._expire_leases(now)
+            for shard_id, shard in enumerate(self.shards):
+                if shard['status'] == PENDING:
+                    shard.update(status=LEASED, worker_id=worker_id, lease_expires=now + self.lease_seconds)
+                    shard['attempts'] += 1
+                    break
+            else:
+                return None
+
+        files = []
+        for path in shard['files']:
+            try:
+                files.append((Path(path).name, Path(path).read_bytes()))
+            except OSError as e:
+                log_event(logger, 'shard_file_unreadable', logging.WARNING, file=str(path), error=str(e))
+        return {'shard_id': shard_id, 'files': files}
+
+    def _expire_leases(self, now: float):
+        """Requeue shards whose lease ran out, or fail those out of attempts (call with the lock held)"""
+        for shard_id, shard in enumerate(self.shards):
+            if shard['status'] == LEASED and shard['lease_expires'] < now:
+                log_event(logger, 'shard_lease_expired', logging.WARNING,
+                          shard=shard_id, worker_id=shard['worker_id'])
+                if shard['attempts'] < self.max_attempts:
+                    shard['status'] = PENDING
+                else:
+                    self._fail(shard)
+
+    def _fail(self, shard: Dict[str, Any]):
+        shard['status'] = FAILED
+        self.failed_files.extend(Path(path).name for path in shard['files'])
+
+    def heartbeat(self, worker_id: str, shard_id: int) -> bool:
+        """Extend a lease; False if the shard is no longer this worker's"""
+        with self._lock:
+            self.workers[worker_id] = time.time()
+            shard = self.shards[shard_id]
+            if shard['status'] != LEASED or shard['worker_id'] != worker_id:
+                return False
+            shard['lease_expires'] = time.time() + self.lease_seconds
+            return True
+
+    def submit(self, worker_id: str, shard_id: int, records: List[Dict[str, Any]],
+               failed_files: List[str], scored: int) -> bool:
+        """Merge a finished shard's top-k records into the global ranking"""
+        with self._lock:
+            shard = self.shards[shard_id]
+            if shard['status'] in (DONE, FAILED):
+                return False
+            shard.update(status=DONE, worker_id=worker_id, lease_expires=None)
+            self.top = heapq.nsmallest(self.top_k, self.top + records, key=_merge_key)
+            self.scored += scored
+            self.failed_files.extend(failed_files)
+        log_event(logger, 'shard_done', shard=shard_id, worker_id=worker_id, scored=scored)
+        return True
+
+    def finished(self) -> bool:
+        """Whether every shard is done or failed, after expiring leases and giving up on lost workers"""
+        now = time.time()
+        with self._lock:
+            self._expire_leases(now)
+            unfinished = [shard for shard in self.shards if shard['status'] not in (DONE, FAILED)]
+            if unfinished and self.workers and max(self.workers.values()) < now - self.lease_seconds:
+                # Every worker that joined has gone quiet: nobody is left to score these
+                log_event(logger, 'workers_lost', logging.ERROR, workers=len(self.workers), shards=len(unfinished))
+                for shard in unfinished:
+                    self._fail(shard)
+                unfinished = []
+            return not unfinished
+
+    def progress(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {state: 0 for state in (PENDING, LEASED, DONE, FAILED)}
+            for shard in self.shards:
+                counts[shard['status']] += 1
+            return {
+                'shards': len(self.shards),
+                **counts,
+                'scored': self.scored,
+                'failed_files': len(self.failed_files),
+                'workers': len(self.workers),
+            }
+
+    def results(self) -> Dict[str, Any]:
+        """Merged ranking, shaped like JobMatcher.build_match_results"""
+        with self._lock:
+            return {
+                'extracted_skills': self.job_skills,
+                'candidates': list(self.top),
+                'shortlist': self.top[:3],
+                'total_candidates': self.scored,
+                'failed_files': list(self.failed_files),
+                'skills_found': len(self.job_skills),
+                'job_title': self.job_title or 'Not specified',
+            }
+
+    def wait(self, timeout: float = None, poll_interval: float = 0.5) -> bool:
+        """Block until every shard is done or failed; False on timeout"""
+        deadline = None if timeout is None else time.time() + timeout
+        while not self.finished():
+            if deadline is not None and time.time() > deadline:
+                return False
+            time.sleep(poll_interval)
+        return True
+
+
+class CoordinatorManager(BaseManager):
+    """TCP transport between the coordinator and remote workers"""
+
+
+CoordinatorManager.register('coordinator')
+
+
+def is_loopback(host: str) -> bool:
+    """Whether every address ``host`` resolves to is a loopback address"""
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host or None, None)}
+    except socket.gaierror:
+        return False
+    return bool(addresses) and all(ipaddress.ip_address(address.split('%')[0]).is_loopback for address in addresses)
+
+
+def serve_coordinator(coordinator: ShardCoordinator, host: str = DIST_HOST, port: int = DIST_PORT,
+                      authkey: bytes = DIST_AUTHKEY) -> Tuple[Tuple[str, int], threading.Thread]:
+    """Serve the coordinator from a background thread; returns the bound address
+
+    The manager unpickles whatever authenticated clients send, so the
+    well-known default key is refused on anything but a loopback address.
+    """
+    if authkey == DIST_DEFAULT_AUTHKEY and not is_loopback(host):
+        raise ValueError(f'Refusing to serve on {host!r} with the default key: set HR_DIST_AUTHKEY')
+    manager = CoordinatorManager(address=(host, port), authkey=authkey)
+    manager.register('coordinator', callable=lambda: coordinator)
+    server = manager.get_server()
+    thread = threading.Thread(target=server.serve_forever, name='shard-coordinator', daemon=True)
+    thread.start()
+    log_event(logger, 'coordinator_listening', host=server.address[0], port=server.address[1],
+              shards=len(coordinator.shards))
+    return server.address, thread
+
+
+def connect(address: Tuple[str, int], authkey: bytes = DIST_AUTHKEY):
+    """Proxy of a remote coordinator"""
+    manager = CoordinatorManager(address=tuple(address), authkey=authkey)
+    manager.connect()
+    return manager.coordinator()
+
+
+def score_shard(files: List[Tuple[str, bytes]], job_skills: List[str], job_matcher: JobMatcher,
+                top_k: int = DIST_TOP_K) -> Tuple[List[Dict[str, Any]], List[str], int]:
+    """Parse and score one shard; returns its top-k compact records, failed files and scored count"""
+    candidates = [parse_resume_bytes(file_name, data, job_skills)[0] for file_name, data in files]
+    ranked = job_matcher.score_candidates(candidates, job_skills)
+    scored_files = {candidate['file_name'] for candidate in ranked}
+    failed = [file_name for file_name, _ in files if Path(file_name).name not in scored_files]
+    return [compact_record(candidate) for candidate in ranked[:top_k]], failed, len(ranked)
+
+
+class _Heartbeat:
+    """Keeps a shard lease alive from a side thread while the shard is scored"""
+
+    def __init__(self, coordinator, worker_id: str, shard_id: int, interval: float):
+        self.coordinator = coordinator
+        self.worker_id = worker_id
+        self.shard_id = shard_id
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, daemon=True)
+
+    def _beat(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if not self.coordinator.heartbeat(self.worker_id, self.shard_id):
+                    return
+            except (EOFError, OSError):
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_shard_worker(address: Tuple[str, int], authkey: bytes = DIST_AUTHKEY, worker_id: str = None,
+                     poll_interval: float = 1.0, heartbeat_interval: float = None) -> int:
+    """Score shards from a coordinator until it has none left; returns shards completed"""
+    worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}'
+    coordinator = connect(address, authkey)
+    job = coordinator.register(worker_id)
+    job_matcher = JobMatcher()
+    heartbeat_interval = heartbeat_interval or max(DIST_LEASE_SECONDS / 3, 0.1)
+    completed = 0
+
+    try:
+        while True:
+            shard = coordinator.claim(worker_id)
+            if shard is None:
+                if coordinator.finished():
+                    break
+                # Shards are leased elsewhere; wait in case one of them is re-dispatched
+                time.sleep(poll_interval)
+                continue
+            with _Heartbeat(coordinator, worker_id, shard['shard_id'], heartbeat_interval):
+                records, failed, scored = score_shard(shard['files'], job['job_skills'], job_matcher)
+            if coordinator.submit(worker_id, shard['shard_id'], records, failed, scored):
+                completed += 1
+    except (EOFError, ConnectionError) as e:
+        # The coordinator went away (usually because the run finished)
+        log_event(logger, 'coordinator_disconnected', logging.WARNING, worker_id=worker_id, error=str(e))
+
+    log_event(logger, 'shard_worker_stopped', worker_id=worker_id, shards=completed)
+    return completed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sharded resume scoring across hosts')
+    parser.add_argument('--host', default=DIST_HOST)
+    parser.add_argument('--port', type=int, default=DIST_PORT)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    coordinate = commands.add_parser('coordinator', help='Serve shards of a corpus and merge the ranking')
+    coordinate.add_argument('--jd', required=True, help='Path to the job description (.txt)')
+    coordinate.add_argument('--title', default=None)
+    coordinate.add_argument('--shard-size', type=int, default=DIST_SHARD_SIZE)
+    coordinate.add_argument('--top', type=int, default=DIST_TOP_K)
+    coordinate.add_argument('--output', default=None, help='Write the merged results here as JSON')
+    coordinate.add_argument('resumes', nargs='+', help='Resume files or directories')
+
+    work = commands.add_parser('worker', help='Score shards served by a coordinator')
+    work.add_argument('--worker-id', default=None)
+
+    args = parser.parse_args()
+    if args.command == 'worker':
+        run_shard_worker((args.host, args.port), worker_id=args.worker_id)
+        return
+
+    coordinator = ShardCoordinator(
+        Path(args.jd).read_text(encoding='utf-8'), expand_resume_paths(args.resumes), args.title,
+        shard_size=args.shard_size, top_k=args.top
+    )
+    try:
+        serve_coordinator(coordinator, args.host, args.port)
+    except ValueError as e:
+        parser.error(str(e))
+    while not coordinator.wait(timeout=10):
+        print(json.dumps(coordinator.progress()))
+    results = coordinator.results()
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    for rank, candidate in enumerate(results['candidates'][:10], 1):
+        print(f"{rank:>3}. {candidate['overall_score']:>4}  {candidate['name']}  ({candidate['file_name']})")
+
+
+if __name__ == '__main__':
+    main()
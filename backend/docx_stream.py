@@ -0,0 +1,86 @@
+import re
+import zipfile
+from typing import List
+from xml.etree.ElementTree import XMLPullParser
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_NS = '{http://schemas.openxmlformats.org/markup-compatibility/2006}'
+
+# Elements that contribute text, and what they contribute
+TEXT_TAG = W_NS + 't'
+BREAK_TAGS = {W_NS + 'br': '\n', W_NS + 'cr': '\n', W_NS + 'tab': '\t'}
+PARAGRAPH_TAG = W_NS + 'p'
+# Text boxes are stored twice (DrawingML + VML fallback); only read the first copy
+FALLBACK_TAG = MC_NS + 'Fallback'
+
+HEADER_PART = re.compile(r'^word/header\d*\.xml$')
+FOOTER_PART = re.compile(r'^word/footer\d*\.xml$')
+MAIN_PART = 'word/document.xml'
+
+CHUNK_SIZE = 64 * 1024
+
+
+def docx_text_parts(zip_file: zipfile.ZipFile) -> List[str]:
+    """Names of the XML parts holding text, in reading order: headers, body, footers"""
+    names = zip_file.namelist()
+    headers = sorted(name for name in names if HEADER_PART.match(name))
+    footers = sorted(name for name in names if FOOTER_PART.match(name))
+    return headers + [MAIN_PART] + footers
+
+
+def stream_part_text(zip_file: zipfile.ZipFile, part_name: str, out: List[str]):
+    """Append the text of one WordprocessingML part to ``out``
+
+    The part is decompressed and parsed in fixed-size chunks, and every
+    element is detached from its parent as soon as it has been handled, so
+    memory use is bounded by the nesting depth rather than the document size.
+    Paragraphs anywhere in the part (body, table cells, text boxes) end with
+    a newline.
+    """
+    parser = XMLPullParser(events=('start', 'end'))
+    stack = []
+    fallback_depth = 0
+
+    with zip_file.open(part_name) as stream:
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if chunk:
+                parser.feed(chunk)
+            else:
+                parser.close()
+
+            for event, elem in parser.read_events():
+                tag = elem.tag
+                if event == 'start':
+                    stack.append(elem)
+                    if tag == FALLBACK_TAG:
+                        fallback_depth += 1
+                    continue
+
+                stack.pop()
+                if tag == FALLBACK_TAG:
+                    fallback_depth -= 1
+                elif not fallback_depth:
+                    if tag == TEXT_TAG:
+                        if elem.text:
+                            out.append(elem.text)
+                    elif tag == PARAGRAPH_TAG:
+                        out.append('\n')
+                    elif tag in BREAK_TAGS:
+                        out.append(BREAK_TAGS[tag])
+
+                # Detach the finished element; its parent only ever holds one child
+                if stack:
+                    stack[-1].remove(elem)
+
+            if not chunk:
+                break
+
+
+def extract_docx_text(file_path: str) -> str:
+    """Extract text from headers, body (incl. tables and text boxes) and footers of a .docx"""
+    pieces = []
+    with zipfile.ZipFile(file_path) as zip_file:
+        for part_name in docx_text_parts(zip_file):
+            stream_part_text(zip_file, part_name, pieces)
+    return ''.join(pieces)
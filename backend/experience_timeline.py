@@ -0,0 +1,124 @@
+import re
+from datetime import date
+from typing import List, Dict, Any, Optional, Tuple
+
+# Month indices are year * 12 + (month - 1); ranges are half-open [start, end)
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+EARLIEST_YEAR = 1950
+MAX_DECLARED_YEARS = 50
+
+_MONTH_NAME = (r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+               r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)')
+_YEAR = r'(?:19|20)\d{2}'
+_PRESENT = r'(?:present|current(?:ly)?|now|today|date|ongoing)'
+
+
+def _date(prefix: str) -> str:
+    """One date: 'Jan 2019', 'January, 2019', '03/2021', '2021-03' or a bare year"""
+    return (
+        rf'(?:(?P<{prefix}name>{_MONTH_NAME})\.?,?\s*(?:\'(?P<{prefix}short>\d{{2}})|(?P<{prefix}nyear>{_YEAR}))'
+        rf'|(?P<{prefix}num>0?[1-9]|1[0-2])\s*[/.]\s*(?P<{prefix}nmyear>{_YEAR})'
+        rf'|(?P<{prefix}iyear>{_YEAR})[-/.](?P<{prefix}inum>0[1-9]|1[0-2])(?!\d)'
+        rf'|(?P<{prefix}year>{_YEAR}))'
+    )
+
+
+# Every employment range in one scan: a start date, a dash or 'to', and an end date or 'present'.
+# The leading word boundary and first-letter lookahead let the engine skip most positions cheaply.
+RANGE_PATTERN = re.compile(
+    rf'\b(?=[jfmasond\d])(?<![\w/.])(?<!\d-){_date("s_")}\s*(?:-|–|—|to|until|till|through|thru)\s*'
+    rf'(?:(?P<present>{_PRESENT})|{_date("e_")})(?![\w/]|-\d)',
+    re.IGNORECASE,
+)
+
+# Self-declared totals: '5+ years of experience', 'over 6 yrs of professional experience', 'Experience: 4 years'
+DECLARED_PATTERN = re.compile(
+    r'\b(?=[\de])(?:(?P<a>\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)\.?\s*(?:of\s+)?(?:[a-z-]+\s+){0,2}?(?:experience|exp\b)'
+    r'|experience\s*:?\s*(?P<b>\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?))',
+    re.IGNORECASE,
+)
+
+
+def _month_index(match: re.Match, prefix: str) -> Optional[Tuple[int, bool]]:
+    """(month index, whether the month was given) of a matched date"""
+    group = lambda name: match.group(prefix + name)
+    if group('name'):
+        year = int(group('nyear')) if group('nyear') else 2000 + int(group('short'))
+        return year * 12 + MONTHS[group('name')[:3].lower()] - 1, True
+    if group('num'):
+        return int(group('nmyear')) * 12 + int(group('num')) - 1, True
+    if group('iyear'):
+        return int(group('iyear')) * 12 + int(group('inum')) - 1, True
+    if group('year'):
+        return int(group('year')) * 12, False
+    return None
+
+
+def parse_timeline(text: str) -> Dict[str, Any]:
+    """Employment ranges and the self-declared years of experience in a text
+
+    Ranges are (start, end) month indices with ``end`` exclusive, or None for
+    ranges running to the present, so the result does not depend on the
+    current date and can be cached with the document. A month-precise end
+    includes that month; a bare end year is read as its January, except in
+    a single-year range ('2020 - 2020'), which covers that year.
+    """
+    ranges = []
+    for match in RANGE_PATTERN.finditer(text):
+        start, _ = _month_index(match, 's_')
+        if start // 12 < EARLIEST_YEAR:
+            continue
+        if match.group('present'):
+            ranges.append((start, None))
+            continue
+        end, precise = _month_index(match, 'e_')
+        if precise:
+            end += 1
+        elif end <= start:
+            end = start + 12 - start % 12
+        if end > start:
+            ranges.append((start, end))
+
+    declared = [float(m.group('a') or m.group('b')) for m in DECLARED_PATTERN.finditer(text)]
+    declared = [int(years) if years.is_integer() else years for years in declared if years <= MAX_DECLARED_YEARS]
+    return {'ranges': ranges, 'declared_years': max(declared) if declared else None}
+
+
+def merge_ranges(ranges: List[Tuple[int, Optional[int]]], today: date = None) -> List[Tuple[int, int]]:
+    """Overlapping and adjacent ranges merged, open ends closed at the current month and future parts dropped"""
+    today = today or date.today()
+    now = today.year * 12 + today.month  # exclusive: the current month counts
+    merged: List[List[int]] = []
+    for start, end in sorted((start, min(now if end is None else end, now)) for start, end in ranges):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def experience_summary(timeline: Dict[str, Any], today: date = None) -> Dict[str, Any]:
+    """Total months from the merged ranges next to the declared years
+
+    ``experience_years`` is the computed figure, rounded to whole years,
+    when the text has any dated ranges, and the declared one otherwise.
+    """
+    merged = merge_ranges(timeline['ranges'], today)
+    months = sum(end - start for start, end in merged)
+    declared = timeline['declared_years']
+    if merged:
+        years = int(months / 12 + 0.5)
+    else:
+        years = int(declared) if declared is not None else 0
+    return {
+        'experience_years': years,
+        'experience_months': months,
+        'declared_experience_years': declared,
+        'experience_periods': [f'{start // 12}-{start % 12 + 1:02d} to {(end - 1) // 12}-{(end - 1) % 12 + 1:02d}'
+                               for start, end in merged],
+    }
@@ -0,0 +1,176 @@
+import re
+import threading
+from typing import List, Dict, Any, Optional, Set, Tuple, Iterable
+
+from backend.skill_taxonomy import SkillTaxonomy, get_taxonomy
+from config.settings import FUZZY_MAX_EDIT_DISTANCE, FUZZY_MIN_LENGTH, FUZZY_SKILL_WEIGHT
+
+# How a skill was found
+EXACT, FUZZY = 'exact', 'fuzzy'
+
+# Tokens keep '+' and '#' (c++, c#); dots, hyphens, slashes and spaces separate them
+_TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+_SEPARATORS = re.compile(r'[^a-z0-9+#]')
+
+# Longest run of tokens joined when looking for split-up surface forms ('postgre sql', 'type script')
+MAX_JOINED_TOKENS = 3
+MIN_VARIANT_LENGTH = 4  # shorter compacted forms ('go', 'r', 'js') only count when written exactly
+# A skill name plus one of these is an English word built on it ('reacts', 'dockers', 'springy'), not a typo
+INFLECTION_SUFFIXES = ('s', 'es', 'd', 'ed', 'ing', 'er', 'ers', 'y')
+CACHE_SIZE = 100_000
+
+
+def compact(surface: str) -> str:
+    """A surface form without separators: 'Node.js' and 'node js' both become 'nodejs'"""
+    return _SEPARATORS.sub('', surface.lower())
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (adjacent transpositions count once), or limit + 1 beyond ``limit``"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def _deletes(word: str, distance: int) -> Set[str]:
+    """The word and every string reachable from it by up to ``distance`` character deletions"""
+    results, frontier = {word}, {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        results |= frontier
+    return results
+
+
+class FuzzySkillMatcher:
+    """Finds misspelled and re-spaced skill names with a symmetric-delete index
+
+    Every compacted taxonomy surface form is stored under all strings
+    obtained by deleting up to its allowed number of characters. A resume
+    token is looked up through its own deletions, so candidates come from a
+    few dictionary probes rather than a comparison against every skill, and
+    only those candidates are verified with a bounded edit distance. Token
+    lookups are cached, which keeps a document scan linear in its length.
+
+    Short names are too close to ordinary words to be corrected: forms
+    shorter than ``min_length`` must match exactly, forms up to 9 characters
+    allow one edit and longer ones ``max_distance``. The first letter must
+    match. Neither the taxonomy's ``fuzzy_ignore`` words nor a skill name
+    with an inflection suffix ('reacts', 'pythons') is ever corrected.
+    """
+
+    def __init__(self, taxonomy: SkillTaxonomy, max_distance: int = FUZZY_MAX_EDIT_DISTANCE,
+                 min_length: int = FUZZY_MIN_LENGTH):
+        self.taxonomy = taxonomy
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self.compact_ids: Dict[str, int] = {}
+        for surface, skill_id in taxonomy.surface_ids.items():
+            self.compact_ids.setdefault(compact(surface), skill_id)
+        self.deletes: Dict[str, List[str]] = {}
+        for key in self.compact_ids:
+            for deleted in _deletes(key, self.allowed_distance(len(key))):
+                self.deletes.setdefault(deleted, []).append(key)
+        self.max_key_length = max(map(len, self.compact_ids), default=0)
+        self._cache: Dict[str, Optional[Tuple[int, int]]] = {}
+
+    def allowed_distance(self, length: int) -> int:
+        if length < self.min_length:
+            return 0
+        return min(self.max_distance, 1 if length <= 9 else 2)
+
+    def is_inflection(self, token: str) -> bool:
+        """Whether a token is a skill name plus a plural or verb ending"""
+        return any(token.endswith(suffix) and token[:-len(suffix)] in self.compact_ids
+                   for suffix in INFLECTION_SUFFIXES)
+
+    def lookup(self, token: str) -> Optional[Tuple[int, int]]:
+        """(skill id, edit distance) of the closest skill for a single token, or None"""
+        if token in self._cache:
+            return self._cache[token]
+        result = None
+        if token in self.compact_ids:
+            if len(token) >= MIN_VARIANT_LENGTH:
+                result = (self.compact_ids[token], 0)
+        elif (self.allowed_distance(len(token)) and token not in self.taxonomy.fuzzy_ignore
+              and len(token) <= self.max_key_length + self.max_distance and not self.is_inflection(token)):
+            best_key, best_distance = None, self.max_distance + 1
+            for deleted in _deletes(token, self.max_distance):
+                for key in self.deletes.get(deleted, ()):
+                    if key[0] != token[0]:
+                        continue
+                    limit = min(self.allowed_distance(len(key)), best_distance)
+                    distance = edit_distance(token, key, limit)
+                    if distance <= limit and (distance, key) < (best_distance, best_key or key):
+                        best_key, best_distance = key, distance
+            if best_key is not None:
+                result = (self.compact_ids[best_key], best_distance)
+        if len(self._cache) >= CACHE_SIZE:
+            self._cache.clear()
+        self._cache[token] = result
+        return result
+
+    def find(self, text: str, exclude: Iterable[int] = ()) -> Dict[int, Dict[str, Any]]:
+        """Skill ids found only by fuzzy matching, with the text as written and its edit distance
+
+        ``exclude`` holds ids already matched exactly (see SkillTaxonomy.match_ids).
+        Runs of up to MAX_JOINED_TOKENS tokens are joined to catch split names
+        ('Postgre SQL'); single tokens are also corrected for misspellings.
+        """
+        exclude = set(exclude)
+        tokens = _TOKEN.findall(text.lower())
+        found: Dict[int, Dict[str, Any]] = {}
+        for start in range(len(tokens)):
+            for count in range(2, MAX_JOINED_TOKENS + 1):
+                if start + count > len(tokens):
+                    break
+                joined = ''.join(tokens[start:start + count])
+                skill_id = self.compact_ids.get(joined)
+                if skill_id is not None and len(joined) >= MIN_VARIANT_LENGTH:
+                    self._record(found, exclude, skill_id, ' '.join(tokens[start:start + count]), 0)
+            match = self.lookup(tokens[start])
+            if match is not None:
+                self._record(found, exclude, match[0], tokens[start], match[1])
+        return found
+
+    @staticmethod
+    def _record(found, exclude, skill_id, surface, distance):
+        if skill_id in exclude:
+            return
+        current = found.get(skill_id)
+        if current is None or distance < current['distance']:
+            found[skill_id] = {'surface': surface, 'distance': distance}
+
+
+_matcher: Optional[FuzzySkillMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_fuzzy_matcher(taxonomy: SkillTaxonomy = None) -> FuzzySkillMatcher:
+    """Shared matcher for the shared taxonomy, rebuilt when the taxonomy is reloaded"""
+    global _matcher
+    taxonomy = taxonomy or get_taxonomy()
+    matcher = _matcher
+    if matcher is not None and matcher.taxonomy is taxonomy:
+        return matcher
+    with _matcher_lock:
+        if _matcher is None or _matcher.taxonomy is not taxonomy:
+            _matcher = FuzzySkillMatcher(taxonomy)
+        return _matcher
+
+
+def weighted_skill_count(skills: List[str], fuzzy_skills: List[str]) -> float:
+    """Skill match credit: one per exact skill, FUZZY_SKILL_WEIGHT per fuzzy one"""
+    if not fuzzy_skills:
+        return len(skills)
+    return round(len(skills) - len(fuzzy_skills) * (1 - FUZZY_SKILL_WEIGHT), 2)
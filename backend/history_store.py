@@ -0,0 +1,319 @@
+import csv
+import hashlib
+import io
+import json
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional
+
+from backend.metrics import get_logger, log_event
+from config.settings import HISTORY_DB
+
+logger = get_logger('history_store')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    requisition TEXT NOT NULL,
+    job_title TEXT,
+    jd_hash TEXT NOT NULL,
+    job_skills TEXT NOT NULL,
+    source TEXT NOT NULL,
+    fingerprint TEXT,
+    total_candidates INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_candidates (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    candidate_hash TEXT NOT NULL,
+    name TEXT,
+    email TEXT,
+    phone TEXT,
+    file_name TEXT,
+    overall_score REAL,
+    project_relevance REAL,
+    skill_match REAL,
+    experience_years INTEGER,
+    experience_level TEXT,
+    projects_count INTEGER,
+    skills TEXT,
+    PRIMARY KEY (run_id, rank)
+);
+CREATE TABLE IF NOT EXISTS candidate_skills (
+    skill TEXT NOT NULL,
+    candidate_hash TEXT NOT NULL,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    overall_score REAL
+);
+-- Best score per (skill, candidate), maintained on write so leaderboards are an index range scan
+CREATE TABLE IF NOT EXISTS skill_leaders (
+    skill TEXT NOT NULL,
+    candidate_hash TEXT NOT NULL,
+    best_score REAL,
+    runs INTEGER NOT NULL,
+    last_run_id INTEGER NOT NULL,
+    PRIMARY KEY (skill, candidate_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_requisition ON runs(requisition, created_at);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs(created_at);
+CREATE INDEX IF NOT EXISTS idx_runs_jd ON runs(jd_hash);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_runs_fingerprint ON runs(fingerprint) WHERE fingerprint IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_run_candidates_hash ON run_candidates(candidate_hash, run_id);
+CREATE INDEX IF NOT EXISTS idx_candidate_skills ON candidate_skills(skill, candidate_hash, overall_score);
+CREATE INDEX IF NOT EXISTS idx_candidate_skills_run ON candidate_skills(run_id);
+CREATE INDEX IF NOT EXISTS idx_skill_leaders_score ON skill_leaders(skill, best_score DESC);
+"""
+
+CANDIDATE_COLUMNS = [
+    'rank', 'name', 'email', 'phone', 'file_name', 'overall_score', 'project_relevance', 'skill_match',
+    'experience_years', 'experience_level', 'projects_count', 'skills',
+]
+
+
+def jd_hash(job_description: str) -> str:
+    """Whitespace-insensitive fingerprint of a job description"""
+    return hashlib.sha256(' '.join(job_description.split()).encode('utf-8')).hexdigest()
+
+
+def requisition_key(job_title: str = None, job_description: str = '') -> str:
+    """Default requisition id: the normalised job title, else the JD hash"""
+    if job_title and job_title.strip() and job_title != 'Not specified':
+        return re.sub(r'\s+', ' ', job_title.strip().lower())
+    return f'jd-{jd_hash(job_description)[:12]}'
+
+
+def candidate_hash(candidate: Dict[str, Any]) -> str:
+    """The candidate's resume content hash, or a stable stand-in when it was not computed"""
+    if candidate.get('content_hash'):
+        return candidate['content_hash']
+    identity = candidate.get('email') if candidate.get('email') not in (None, '', 'Not provided') \
+        else candidate.get('file_name', '')
+    return hashlib.sha1(str(identity).lower().encode('utf-8')).hexdigest()
+
+
+class HistoryStore:
+    """Every analysis run with its ranked candidates, kept in SQLite
+
+    A run stores the requisition, JD hash and extracted skills; each of its
+    candidates is one ``run_candidates`` row keyed by resume content hash,
+    plus one ``candidate_skills`` row per skill. Indexes on requisition,
+    candidate hash, skill and date serve the history queries without table
+    scans. Exports are produced from a stored run.
+    """
+
+    def __init__(self, db_path: str = HISTORY_DB):
+        self.db_path = str(db_path)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA foreign_keys=ON')
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def record_run(self, job_description: str, job_skills: List[str], candidates: List[Dict[str, Any]],
+                   job_title: str = None, requisition: str = None, source: str = 'analysis',
+                   fingerprint: str = None) -> int:
+        """Store a ranked analysis and return its run id
+
+        A run with the same ``fingerprint`` (same uploads and skills) is only
+        stored once; its existing id is returned.
+        """
+        requisition = requisition or requisition_key(job_title, job_description)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            if fingerprint is not None:
+                row = conn.execute('SELECT id FROM runs WHERE fingerprint = ?', (fingerprint,)).fetchone()
+                if row is not None:
+                    conn.execute('COMMIT')
+                    return row['id']
+
+            run_id = conn.execute(
+                'INSERT INTO runs (requisition, job_title, jd_hash, job_skills, source, fingerprint, '
+                'total_candidates, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (requisition, job_title, jd_hash(job_description), json.dumps(job_skills), source,
+                 fingerprint, len(candidates), now)
+            ).lastrowid
+
+            rows, skill_rows = [], []
+            for rank, candidate in enumerate(candidates, 1):
+                digest = candidate_hash(candidate)
+                skills = candidate.get('skills', [])
+                rows.append((
+                    run_id, rank, digest, candidate.get('name'), candidate.get('email'), candidate.get('phone'),
+                    candidate.get('file_name'), candidate.get('overall_score'), candidate.get('project_relevance'),
+                    candidate.get('skill_match'), candidate.get('experience_years'),
+                    candidate.get('experience_level'), candidate.get('projects_count'), json.dumps(skills),
+                ))
+                skill_rows.extend(
+                    (skill.lower(), digest, run_id, candidate.get('overall_score')) for skill in set(skills)
+                )
+            conn.executemany(
+                'INSERT INTO run_candidates (run_id, rank, candidate_hash, name, email, phone, file_name, '
+                'overall_score, project_relevance, skill_match, experience_years, experience_level, '
+                'projects_count, skills) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            conn.executemany(
+                'INSERT INTO candidate_skills (skill, candidate_hash, run_id, overall_score) VALUES (?, ?, ?, ?)',
+                skill_rows
+            )
+            # A resume uploaded twice in one run counts as one run for its skills, at its best score
+            leaders = {}
+            for skill, digest, _, score in skill_rows:
+                best = leaders.get((skill, digest))
+                leaders[(skill, digest)] = score if best is None or (score is not None and score > best) else best
+            conn.executemany(
+                'INSERT INTO skill_leaders (skill, candidate_hash, best_score, runs, last_run_id) '
+                'VALUES (?, ?, ?, 1, ?) ON CONFLICT (skill, candidate_hash) DO UPDATE SET '
+                'best_score = MAX(best_score, excluded.best_score), runs = runs + 1, last_run_id = excluded.last_run_id',
+                [(skill, digest, score, run_id) for (skill, digest), score in leaders.items()]
+            )
+            conn.execute('COMMIT')
+
+        log_event(logger, 'run_recorded', run_id=run_id, requisition=requisition, candidates=len(candidates))
+        return run_id
+
+    def record_results(self, results: Dict[str, Any], job_description: str, requisition: str = None,
+                       source: str = 'analysis', fingerprint: str = None) -> int:
+        """Store a JobMatcher.match_resumes_to_job result"""
+        job_title = results.get('job_title')
+        return self.record_run(
+            job_description, results.get('extracted_skills', []), results.get('candidates', []),
+            None if job_title == 'Not specified' else job_title, requisition, source, fingerprint
+        )
+
+    def runs(self, requisition: str = None, since: float = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent runs first, optionally for one requisition and/or after a date"""
+        clauses, params = [], []
+        if requisition:
+            clauses.append('requisition = ?')
+            params.append(requisition)
+        if since is not None:
+            clauses.append('created_at >= ?')
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self._connect() as conn:
+            rows = conn.execute(
+                f'SELECT * FROM runs {where} ORDER BY created_at DESC, id DESC LIMIT ?', (*params, limit)
+            ).fetchall()
+        return [self._run(row) for row in rows]
+
+    def get_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM runs WHERE id = ?', (run_id,)).fetchone()
+        return self._run(row) if row else None
+
+    def requisitions(self) -> List[Dict[str, Any]]:
+        """Requisitions with their run count and latest run date"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT requisition, COUNT(*) AS runs, MAX(created_at) AS last_run FROM runs '
+                'GROUP BY requisition ORDER BY last_run DESC'
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def run_candidates(self, run_id: int, limit: int = None) -> List[Dict[str, Any]]:
+        """A stored run's ranking"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT * FROM run_candidates WHERE run_id = ? ORDER BY rank LIMIT ?',
+                (run_id, -1 if limit is None else limit)
+            ).fetchall()
+        return [self._candidate(row) for row in rows]
+
+    def candidate_history(self, candidate_hash: str) -> List[Dict[str, Any]]:
+        """One candidate's scores across every stored run, newest first"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT rc.*, r.requisition, r.job_title, r.created_at FROM run_candidates rc '
+                'JOIN runs r ON r.id = rc.run_id WHERE rc.candidate_hash = ? '
+                'ORDER BY r.created_at DESC, r.id DESC',
+                (candidate_hash,)
+            ).fetchall()
+        return [self._candidate(row) for row in rows]
+
+    def find_candidates(self, text: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Candidates whose name, email or file name contains ``text``, with their run count"""
+        pattern = f'%{text}%'
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT candidate_hash, MAX(name) AS name, MAX(email) AS email, COUNT(*) AS runs, '
+                'MAX(overall_score) AS best_score FROM run_candidates '
+                'WHERE name LIKE ? OR email LIKE ? OR file_name LIKE ? '
+                'GROUP BY candidate_hash ORDER BY best_score DESC LIMIT ?',
+                (pattern, pattern, pattern, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def top_scorers_for_skill(self, skill: str, limit: int = 20, since: float = None) -> List[Dict[str, Any]]:
+        """Candidates with a skill, by their best overall score in any run (or any run since a date)"""
+        if since is None:
+            best = ('SELECT candidate_hash, best_score, runs, last_run_id AS run_id FROM skill_leaders '
+                    'WHERE skill = ? ORDER BY best_score DESC LIMIT ?')
+            params = (skill.lower(), limit)
+        else:
+            best = ('SELECT cs.candidate_hash, MAX(cs.overall_score) AS best_score, COUNT(*) AS runs, '
+                    'MAX(cs.run_id) AS run_id FROM candidate_skills cs WHERE cs.skill = ? '
+                    'AND cs.run_id IN (SELECT id FROM runs WHERE created_at >= ?) '
+                    'GROUP BY cs.candidate_hash ORDER BY best_score DESC LIMIT ?')
+            params = (skill.lower(), since, limit)
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT best.candidate_hash, best.best_score, best.runs, rc.name, rc.email, rc.file_name '
+                f'FROM ({best}) best '
+                'JOIN run_candidates rc ON rc.run_id = best.run_id AND rc.candidate_hash = best.candidate_hash '
+                'GROUP BY best.candidate_hash ORDER BY best.best_score DESC',
+                params
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def export_csv(self, run_id: int) -> str:
+        """A stored run's ranking as CSV"""
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=CANDIDATE_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        for candidate in self.run_candidates(run_id):
+            writer.writerow(dict(candidate, skills='; '.join(candidate['skills'])))
+        return output.getvalue()
+
+    def delete_run(self, run_id: int):
+        """Remove a run and recompute the leaderboard entries it contributed to"""
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            pairs = conn.execute(
+                'SELECT DISTINCT skill, candidate_hash FROM candidate_skills WHERE run_id = ?', (run_id,)
+            ).fetchall()
+            conn.execute('DELETE FROM runs WHERE id = ?', (run_id,))
+            for skill, digest in pairs:
+                conn.execute('DELETE FROM skill_leaders WHERE skill = ? AND candidate_hash = ?', (skill, digest))
+                conn.execute(
+                    'INSERT INTO skill_leaders (skill, candidate_hash, best_score, runs, last_run_id) '
+                    'SELECT skill, candidate_hash, MAX(overall_score), COUNT(DISTINCT run_id), MAX(run_id) FROM candidate_skills '
+                    'WHERE skill = ? AND candidate_hash = ? GROUP BY skill, candidate_hash',
+                    (skill, digest)
+                )
+            conn.execute('COMMIT')
+
+    @staticmethod
+    def _run(row: sqlite3.Row) -> Dict[str, Any]:
+        run = dict(row)
+        run['job_skills'] = json.loads(run['job_skills'])
+        return run
+
+    @staticmethod
+    def _candidate(row: sqlite3.Row) -> Dict[str, Any]:
+        candidate = dict(row)
+        candidate['skills'] = json.loads(candidate['skills'] or '[]')
+        return candidate
@@ -0,0 +1,237 @@
+import argparse
+import json
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any, Tuple
+from urllib.parse import urlparse
+
+from backend.job_matcher import JobMatcher
+from backend.mcq_generator import MCQGenerator
+from backend.metrics import metrics, get_logger, log_event
+from backend.workers import init_worker, parse_resume_bytes
+from config.settings import (
+    RESUME_EXTENSIONS, API_HOST, API_PORT, API_WORKERS, API_MAX_QUEUED_FILES, API_MAX_BODY_BYTES
+)
+
+logger = get_logger('http_service')
+
+
+class ServiceBusy(Exception):
+    """Raised when the worker pool has no room for another request"""
+
+
+class BadRequest(Exception):
+    """Raised for malformed or incomplete requests"""
+
+
+class RequestTooLarge(Exception):
+    """Raised for requests that exceed a limit however long the client waits"""
+
+
+class MatchingService:
+    """Warm matcher/MCQ generator in front of a bounded resume-parsing process pool"""
+
+    def __init__(self, workers: int = API_WORKERS, max_queued_files: int = API_MAX_QUEUED_FILES):
+        self.job_matcher = JobMatcher()
+        self.mcq_generator = MCQGenerator()
+        self.max_queued_files = max_queued_files
+        self._queued_files = 0
+        self._lock = threading.Lock()
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+        # Start every worker now so the first request does not pay for imports
+        list(self.pool.map(_warm_up, range(workers)))
+
+    def _reserve(self, count: int):
+        if count > self.max_queued_files:
+            raise RequestTooLarge(f'{count} resumes sent, at most {self.max_queued_files} are accepted per request')
+        with self._lock:
+            if self._queued_files + count > self.max_queued_files:
+                raise ServiceBusy(f'{self._queued_files} files already queued')
+            self._queued_files += count
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._queued_files -= 1
+
+    def match(self, job_description: str, job_title: str, resumes: List[Tuple[str, bytes]]) -> Dict[str, Any]:
+        """Parse uploaded resumes in the pool and rank them against the job description"""
+        if not job_description or not job_description.strip():
+            raise BadRequest('job_description is required')
+        if not resumes:
+            raise BadRequest('At least one resume file is required')
+
+        self._reserve(len(resumes))
+        with metrics.run('http_match'):
+            job_skills = self.job_matcher.extract_skills_from_job_description(job_description, job_title)
+            futures = []
+            try:
+                for file_name, data in resumes:
+                    future = self.pool.submit(parse_resume_bytes, file_name, data, job_skills)
+                    future.add_done_callback(self._release)
+                    futures.append(future)
+            except Exception:
+                # Slots for files that never made it into the pool
+                for _ in range(len(resumes) - len(futures)):
+                    self._release()
+                raise
+
+            candidates = []
+            for future in futures:
+                candidate, worker_run = future.result()
+                metrics.merge_run(worker_run)
+                candidates.append(candidate)
+
+            return self.job_matcher.build_match_results(candidates, job_skills, job_description, job_title)
+
+    def generate_mcqs(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Generate MCQs, extracting job skills from the description if none are given"""
+        job_description = payload.get('job_description', '')
+        job_skills = payload.get('job_skills')
+        if job_skills is None:
+            if not job_description.strip():
+                raise BadRequest('job_description or job_skills is required')
+            job_skills = self.job_matcher.extract_skills_from_job_description(
+                job_description, payload.get('job_title')
+            )
+        return self.mcq_generator.generate_mcqs(
+            job_description,
+            job_skills,
+            int(payload.get('num_questions', 10)),
+            payload.get('difficulty', 'medium'),
+        )
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _warm_up(_):
+    return True
+
+
+def parse_multipart(content_type: str, body: bytes) -> Tuple[Dict[str, str], List[Tuple[str, bytes]]]:
+    """Split a multipart/form-data body into text fields and uploaded files"""
+    message = BytesParser(policy=HTTP).parsebytes(
+        b'Content-Type: ' + content_type.encode('latin-1') + b'\r\n\r\n' + body
+    )
+    if not message.is_multipart():
+        raise BadRequest('Expected a multipart/form-data body')
+
+    fields, files = {}, []
+    for part in message.iter_parts():
+        name = part.get_param('name', header='content-disposition')
+        file_name = part.get_filename()
+        payload = part.get_payload(decode=True) or b''
+        if file_name:
+            files.append((name, file_name, payload))
+        elif name:
+            fields[name] = payload.decode(part.get_content_charset() or 'utf-8')
+
+    # A job description may be sent either as a text field or as a .txt upload
+    resumes = []
+    for name, file_name, payload in files:
+        if name == 'job_description' and 'job_description' not in fields:
+            fields['job_description'] = payload.decode('utf-8', errors='replace')
+            continue
+        extension = file_name.rsplit('.', 1)[-1].lower()
+        if extension not in RESUME_EXTENSIONS:
+            raise BadRequest(f'Unsupported file type: {file_name}')
+        resumes.append((file_name, payload))
+    return fields, resumes
+
+
+class MatchingRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for MatchingService"""
+
+    service: MatchingService = None
+    server_version = 'HRAssistant/1.0'
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif path == '/metrics':
+            self._send(200, metrics.to_prometheus().encode('utf-8'), 'text/plain; version=0.0.4')
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        try:
+            body = self._read_body()
+            if path == '/match':
+                fields, resumes = parse_multipart(self.headers.get('Content-Type', ''), body)
+                results = self.service.match(
+                    fields.get('job_description', ''), fields.get('job_title') or None, resumes
+                )
+                self._send_json(422 if 'error' in results else 200, results)
+            elif path == '/mcqs':
+                payload = json.loads(body or b'{}')
+                self._send_json(200, {'mcqs': self.service.generate_mcqs(payload)})
+            else:
+                self._send_json(404, {'error': 'Not found'})
+        except ServiceBusy as e:
+            self._send_json(429, {'error': f'Server busy: {e}'}, {'Retry-After': '1'})
+        except RequestTooLarge as e:
+            self._send_json(413, {'error': str(e)})
+        except (BadRequest, ValueError) as e:
+            self._send_json(400, {'error': str(e)})
+        except Exception as e:
+            log_event(logger, 'request_failed', logging.ERROR, path=path, error=str(e))
+            self._send_json(500, {'error': 'Internal server error'})
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > API_MAX_BODY_BYTES:
+            raise RequestTooLarge(f'Request body exceeds {API_MAX_BODY_BYTES} bytes')
+        return self.rfile.read(length)
+
+    def _send_json(self, status: int, payload: Any, headers: Dict[str, str] = None):
+        self._send(status, json.dumps(payload, default=str).encode('utf-8'), 'application/json', headers)
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Dict[str, str] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log_event(logger, 'http_request', logging.DEBUG, client=self.client_address[0], line=format % args)
+
+
+def create_server(host: str = API_HOST, port: int = API_PORT, service: MatchingService = None) -> ThreadingHTTPServer:
+    """Build an HTTP server bound to a (possibly new) MatchingService"""
+    handler = type('BoundMatchingRequestHandler', (MatchingRequestHandler,), {
+        'service': service or MatchingService()
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the HR assistant matching HTTP service')
+    parser.add_argument('--host', default=API_HOST)
+    parser.add_argument('--port', type=int, default=API_PORT)
+    parser.add_argument('--workers', type=int, default=API_WORKERS)
+    parser.add_argument('--max-queued-files', type=int, default=API_MAX_QUEUED_FILES)
+    args = parser.parse_args()
+
+    service = MatchingService(args.workers, args.max_queued_files)
+    server = create_server(args.host, args.port, service)
+    log_event(logger, 'http_service_started', host=args.host, port=server.server_port, workers=args.workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,52 +1,47 @@
 import re
+import json
+import logging
+from bisect import bisect_right
+from itertools import islice
+from pathlib import Path
 from typing import List, Dict, Any
+import numpy as np
 from backend.resume_parser import ResumeParser
+from backend.dedup import DuplicateIndex
+from backend.search_index import SearchIndex
+from backend.metrics import metrics, get_logger, log_event
+from backend.skill_taxonomy import get_taxonomy
+from backend.project_scorer import ProjectDepthScorer
+from backend.spill_store import SpillStore
+from config.settings import DEDUP_ENABLED, FUZZY_SKILL_WEIGHT, SPILL_MEMORY_BUDGET, SPILL_SCORE_BATCH, SPILL_RESULT_TOP_K
+
+logger = get_logger('job_matcher')
 
 class JobMatcher:
-    def __init__(self):
-        self.resume_parser = ResumeParser()
+    # Weights prioritizing project implementation
+    PROJECT_WEIGHT = 0.6  # 60% weight to projects
+    SKILL_WEIGHT = 0.3    # 30% to skills
+    EXP_WEIGHT = 0.1      # 10% to experience
+    
+    def __init__(self, duplicate_index: DuplicateIndex = None, search_index: SearchIndex = None):
+        # Every parsed resume is also added to the full-text search index, when one is given
+        self.resume_parser = ResumeParser(search_index=search_index)
+        # Persistent pool index for cross-batch duplicates; a fresh one per batch otherwise
+        self.duplicate_index = duplicate_index
+        self._project_scorer = None
         
     def extract_skills_from_job_description(self, job_description: str, job_title: str = None) -> List[str]:
         """Extract skills from job description with enhanced matching"""
         if not job_description or not job_description.strip():
             return []
             
-        skill_keywords = [
-            'python', 'java', 'javascript', 'react', 'node.js', 'sql', 'mongodb', 
-            'html', 'css', 'git', 'docker', 'kubernetes', 'aws', 'azure', 'gcp',
-            'machine learning', 'data science', 'tensorflow', 'pytorch', 'flask',
-            'django', 'express', 'angular', 'vue', 'typescript', 'c++', 'c#',
-            'php', 'ruby', 'go', 'rust', 'scala', 'kotlin', 'swift', 'mysql',
-            'postgresql', 'redis', 'elasticsearch', 'jenkins', 'terraform',
-            'ansible', 'linux', 'unix', 'bash', 'powershell', 'api', 'rest',
-            'graphql', 'microservices', 'devops', 'ci/cd', 'agile', 'scrum',
-            'springboot', 'spring', 'hibernate', 'jpa', 'maven', 'gradle',
-            'junit', 'mockito', 'selenium', 'postman', 'swagger', 'json',
-            'xml', 'yaml', 'nosql', 'firebase', 'heroku', 'netlify', 'vercel',
-            'bootstrap', 'tailwind', 'sass', 'webpack', 'npm', 'yarn', 'vite',
-            'rest api', 'restful', 'oauth', 'jwt', 'authentication', 'authorization'
-        ]
-        
-        # Add job-title specific skills if provided
-        if job_title:
-            job_title_lower = job_title.lower()
-            if 'ai' in job_title_lower or 'artificial intelligence' in job_title_lower:
-                skill_keywords.extend(['ai', 'artificial intelligence', 'nlp', 'computer vision', 'deep learning'])
-            elif 'data' in job_title_lower:
-                skill_keywords.extend(['pandas', 'numpy', 'matplotlib', 'seaborn', 'jupyter', 'r'])
-            elif 'devops' in job_title_lower:
-                skill_keywords.extend(['ci/cd', 'monitoring', 'logging', 'infrastructure'])
-        
-        extracted_skills = []
-        job_text_lower = job_description.lower()
-        
-        for skill in skill_keywords:
-            # Use word boundary regex for better matching
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, job_text_lower):
-                extracted_skills.append(skill)
-        
-        return list(set(extracted_skills))  # Remove duplicates
+        taxonomy = get_taxonomy()
+        
+        with metrics.timer('skill_matching'):
+            # Title-only skills (e.g. 'nlp' for AI roles) are enabled by the job title
+            extracted_skills = taxonomy.find_skills(job_description, taxonomy.title_skills(job_title))
+        
+        return extracted_skills
 
     def calculate_project_depth(self, project_text: str, job_skills: List[str]) -> float:
         """Calculate project depth score based on implementation evidence"""
@@ -74,33 +69,33 @@ class JobMatcher:
         
         return min(score, 10)  # Cap at 10
     
+    def project_scorer(self, job_skills: List[str]) -> ProjectDepthScorer:
+        """Project depth scorer compiled for these job skills (reused while they stay the same)"""
+        # Read once so concurrent sessions sharing a matcher never get another job's scorer
+        scorer = self._project_scorer
+        if scorer is None or scorer.job_skills != list(job_skills):
+            scorer = ProjectDepthScorer(job_skills)
+            self._project_scorer = scorer
+        return scorer
+    
     def calculate_project_relevance(self, projects: List[str], job_skills: List[str]) -> float:
         """Calculate how relevant candidate's projects are to job requirements"""
         if not projects or not job_skills:
             return 0.0
         
-        total_score = 0
-        for project in projects:
-            total_score += self.calculate_project_depth(project, job_skills)
-        
-        # Normalize and weight recent projects higher
-        return min(total_score / len(projects) * 2, 10)  # Scale to 10
+        # Same as averaging calculate_project_depth over the projects, scaled to 10
+        return self.project_scorer(job_skills).score_pool([projects])[0]
     
     def calculate_overall_score(self, candidate: Dict[str, Any]) -> float:
         """Calculate weighted overall score prioritizing project relevance"""
-        # New weights prioritizing project implementation
-        PROJECT_WEIGHT = 0.6  # 60% weight to projects
-        SKILL_WEIGHT = 0.3    # 30% to skills
-        EXP_WEIGHT = 0.1      # 10% to experience
-        
         skill_score = candidate.get('skill_match', 0)
         project_score = candidate.get('project_relevance', 0)
         experience_score = min(candidate.get('experience_years', 0), 10)  # Cap at 10
         
         overall_score = (
-            (skill_score * SKILL_WEIGHT) +
-            (project_score * PROJECT_WEIGHT) +
-            (experience_score * EXP_WEIGHT)
+            (skill_score * self.SKILL_WEIGHT) +
+            (project_score * self.PROJECT_WEIGHT) +
+            (experience_score * self.EXP_WEIGHT)
         )
         
         return round(overall_score, 1)
@@ -112,17 +107,27 @@ class JobMatcher:
             candidate['overall_score'] = self.calculate_overall_score(candidate)
         
         # Multi-level sorting
-        sorted_candidates = sorted(candidates, key=lambda x: (
-            -x['overall_score'],           # Primary: Overall score (descending)
-            -x.get('project_relevance', 0), # Secondary: Project relevance (descending)
-            -x['skill_match'],             # Tertiary: Skill match (descending)
-            -x['experience_years']         # Quaternary: Experience (descending)
-        ))
+        with metrics.timer('ranking'):
+            sorted_candidates = sorted(candidates, key=self.rank_key)
         
         return sorted_candidates
     
+    @staticmethod
+    def rank_key(candidate: Dict[str, Any]) -> tuple:
+        """Sort key of a scored candidate; ascending order is best first"""
+        return (
+            -candidate['overall_score'],             # Primary: Overall score (descending)
+            -candidate.get('project_relevance', 0),  # Secondary: Project relevance (descending)
+            -candidate['skill_match'],               # Tertiary: Skill match (descending)
+            -candidate['experience_years']           # Quaternary: Experience (descending)
+        )
+    
     def match_resumes_to_job(self, resume_files: List[str], job_description: str, job_title: str = None) -> Dict[str, Any]:
         """Main function to match resumes to job description"""
+        with metrics.run('match_resumes_to_job'):
+            return self._match_resumes_to_job(resume_files, job_description, job_title)
+
+    def _match_resumes_to_job(self, resume_files: List[str], job_description: str, job_title: str = None) -> Dict[str, Any]:
         try:
             # Validate inputs
             if not job_description or not job_description.strip():
@@ -145,52 +150,346 @@ class JobMatcher:
             job_skills = self.extract_skills_from_job_description(job_description, job_title)
             
             if not job_skills:
-                print("Warning: No technical skills detected in job description")
+                log_event(logger, 'no_job_skills_detected', logging.WARNING, job_title=job_title)
             
-            # Parse all resumes with job-specific skills
-            candidates = self.resume_parser.parse_multiple_resumes(resume_files, job_skills)
+            # Parse all resumes with job-specific skills, reusing features of duplicates
+            duplicate_index = self.duplicate_index
+            if duplicate_index is None and DEDUP_ENABLED:
+                duplicate_index = DuplicateIndex()
+            candidates = self.resume_parser.parse_multiple_resumes(resume_files, job_skills, duplicate_index)
+            if duplicate_index is not None and duplicate_index.path:
+                duplicate_index.save()
             
-            # Filter out candidates that could not be parsed
-            valid_candidates = [c for c in candidates if c.get('raw_text') != 'Failed to parse resume']
+            return self.build_match_results(candidates, job_skills, job_description, job_title)
             
-            if not valid_candidates:
-                return {
-                    'error': 'No resumes could be parsed successfully',
-                    'extracted_skills': job_skills,
-                    'candidates': [],
-                    'shortlist': []
-                }
-            
-            # Calculate project relevance for each candidate
-            for candidate in valid_candidates:
-                projects = candidate.get('projects', [])
-                candidate['project_relevance'] = self.calculate_project_relevance(projects, job_skills)
+        except Exception as e:
+            log_event(logger, 'job_matching_failed', logging.ERROR, error=str(e))
+            return {
+                'error': f'Error processing job matching: {str(e)}',
+                'extracted_skills': [],
+                'candidates': [],
+                'shortlist': []
+            }
+    
+    def score_candidates(self, candidates: List[Dict[str, Any]], job_skills: List[str]) -> List[Dict[str, Any]]:
+        """Drop unparseable candidates, score the rest against the job skills and rank them"""
+        valid_candidates = self._score_pool(candidates, job_skills)
+        return self.rank_candidates(valid_candidates)
+    
+    def _score_pool(self, candidates: List[Dict[str, Any]], job_skills: List[str]) -> List[Dict[str, Any]]:
+        """Drop unparseable candidates and set project relevance and overall score on the rest"""
+        # Filter out candidates that could not be parsed
+        valid_candidates = [c for c in candidates if c.get('raw_text') != 'Failed to parse resume']
+        
+        # Project relevance for the whole pool in one pass over all project lines
+        with metrics.timer('scoring'):
+            relevances = self.project_scorer(job_skills).score_pool(
+                [candidate.get('projects', []) for candidate in valid_candidates]
+            )
+            for candidate, relevance in zip(valid_candidates, relevances):
+                candidate['project_relevance'] = relevance
                 candidate['overall_score'] = self.calculate_overall_score(candidate)
+        
+        return valid_candidates
+    
+    def append_resumes_to_analysis(self, results: Dict[str, Any], resume_files: List[str]) -> Dict[str, Any]:
+        """Add new resumes to an existing match_resumes_to_job result
+        
+        Only the new files are parsed and scored, against the skills already
+        extracted for the job; each one is inserted into the ranking by
+        binary search. Candidates already in the analysis are left untouched,
+        and files whose name is already analysed are skipped.
+        """
+        with metrics.run('append_resumes_to_analysis'):
+            job_skills = results.get('extracted_skills', [])
+            new_files, skipped = self.select_new_files(results, resume_files)
             
-            # Rank candidates
-            ranked_candidates = self.rank_candidates(valid_candidates)
+            duplicate_index = self.duplicate_index
+            if duplicate_index is None and DEDUP_ENABLED:
+                duplicate_index = DuplicateIndex()
+            candidates = self.resume_parser.parse_multiple_resumes(new_files, job_skills, duplicate_index)
+            if duplicate_index is not None and duplicate_index.path and new_files:
+                duplicate_index.save()
+            return self.add_candidates_to_analysis(results, candidates, skipped)
+    
+    @staticmethod
+    def select_new_files(results: Dict[str, Any], resume_files: List[str]):
+        """Split files into those not yet in an analysis and the names of those that are (or repeat)"""
+        seen = {candidate['file_name'] for candidate in results.get('candidates', [])}
+        new_files, skipped = [], []
+        for file_path in resume_files:
+            name = Path(file_path).name
+            if name in seen:
+                skipped.append(name)
+            else:
+                seen.add(name)
+                new_files.append(file_path)
+        return new_files, skipped
+    
+    def add_candidates_to_analysis(self, results: Dict[str, Any], candidates: List[Dict[str, Any]],
+                                   skipped: List[str] = ()) -> Dict[str, Any]:
+        """Score parsed candidates and insert them into an existing analysis's ranking"""
+        job_skills = results.get('extracted_skills', [])
+        ranked = list(results.get('candidates', []))
+        added = self._score_pool(candidates, job_skills)
+        
+        with metrics.timer('ranking'):
+            keys = [self.rank_key(candidate) for candidate in ranked]
+            for candidate in added:
+                key = self.rank_key(candidate)
+                # bisect_right keeps earlier candidates ahead on ties, like a stable re-sort
+                position = bisect_right(keys, key)
+                keys.insert(position, key)
+                ranked.insert(position, candidate)
+        
+        return dict(
+            results,
+            candidates=ranked,
+            shortlist=ranked[:3],
+            total_candidates=len(ranked),
+            added_files=[candidate['file_name'] for candidate in added],
+            skipped_files=list(skipped),
+            failed_files=len(candidates) - len(added),
+        )
+    
+    def match_resumes_to_job_budgeted(self, resume_files: List[str], job_description: str, job_title: str = None,
+                                      memory_budget: int = SPILL_MEMORY_BUDGET, top_k: int = SPILL_RESULT_TOP_K,
+                                      ranking_path: str = None) -> Dict[str, Any]:
+        """match_resumes_to_job for batches too large to hold in memory
+        
+        Resumes are parsed one at a time and scored in small batches into a
+        SpillStore, which spills sorted runs to disk whenever ``memory_budget``
+        bytes of candidates are buffered; the ranking is a k-way merge of the
+        runs. The results hold the top ``top_k`` candidates, and with
+        ``ranking_path`` the full ranking is streamed there as JSON lines.
+        Nothing else grows with the batch: duplicate detection is skipped (the
+        index, even a persistent one, keeps every candidate in memory) and
+        extracted texts bypass the process-wide text cache.
+        """
+        with metrics.run('match_resumes_to_job_budgeted'):
+            if not job_description or not job_description.strip():
+                return {'error': 'Job description is required', 'extracted_skills': [], 'candidates': [], 'shortlist': []}
+            if not resume_files:
+                return {'error': 'At least one resume file is required', 'extracted_skills': [], 'candidates': [], 'shortlist': []}
             
-            # Create shortlist (top 3 candidates)
-            shortlist = ranked_candidates[:3]
+            job_skills = self.extract_skills_from_job_description(job_description, job_title)
+            if not job_skills:
+                log_event(logger, 'no_job_skills_detected', logging.WARNING, job_title=job_title)
             
+            with SpillStore(self.rank_key, memory_budget) as store:
+                batch = []
+                for candidate in self.resume_parser.iter_parse_resumes(resume_files, job_skills, use_cache=False):
+                    batch.append(candidate)
+                    if len(batch) >= SPILL_SCORE_BATCH:
+                        self._store_scored(batch, job_skills, store)
+                        batch = []
+                self._store_scored(batch, job_skills, store)
+                
+                if not len(store):
+                    return {
+                        'error': 'No resumes could be parsed successfully',
+                        'extracted_skills': job_skills,
+                        'candidates': [],
+                        'shortlist': []
+                    }
+                
+                with metrics.timer('ranking'):
+                    ranked = iter(store)
+                    top_candidates = list(islice(ranked, top_k))
+                    if ranking_path:
+                        with open(ranking_path, 'w', encoding='utf-8') as f:
+                            for candidate in top_candidates:
+                                f.write(json.dumps(candidate, default=str) + '\n')
+                            for candidate in ranked:
+                                f.write(json.dumps(candidate, default=str) + '\n')
+                
+                return {
+                    'extracted_skills': job_skills,
+                    'candidates': top_candidates,
+                    'shortlist': top_candidates[:3],
+                    'total_candidates': len(store),
+                    'skills_found': len(job_skills),
+                    'job_description_length': len(job_description.split()),
+                    'job_title': job_title or 'Not specified',
+                    'spilled_runs': len(store.runs),
+                    'ranking_path': str(ranking_path) if ranking_path else None
+                }
+    
+    def _store_scored(self, candidates: List[Dict[str, Any]], job_skills: List[str], store: SpillStore):
+        """Score a batch of parsed candidates and hand them to the spill store"""
+        for candidate in self._score_pool(candidates, job_skills):
+            store.add(candidate)
+    
+    def build_match_results(self, candidates: List[Dict[str, Any]], job_skills: List[str],
+                            job_description: str, job_title: str = None) -> Dict[str, Any]:
+        """Score already-parsed candidates and package them like match_resumes_to_job"""
+        ranked_candidates = self.score_candidates(candidates, job_skills)
+        
+        if not ranked_candidates:
             return {
+                'error': 'No resumes could be parsed successfully',
                 'extracted_skills': job_skills,
-                'candidates': ranked_candidates,
-                'shortlist': shortlist,
-                'total_candidates': len(ranked_candidates),
-                'skills_found': len(job_skills),
-                'job_description_length': len(job_description.split()),
-                'job_title': job_title or 'Not specified'
-            }
-            
-        except Exception as e:
-            print(f"Error in job matching: {e}")
-            return {
-                'error': f'Error processing job matching: {str(e)}',
-                'extracted_skills': [],
                 'candidates': [],
                 'shortlist': []
             }
+        
+        # Create shortlist (top 3 candidates)
+        shortlist = ranked_candidates[:3]
+        
+        return {
+            'extracted_skills': job_skills,
+            'candidates': ranked_candidates,
+            'shortlist': shortlist,
+            'total_candidates': len(ranked_candidates),
+            'skills_found': len(job_skills),
+            'job_description_length': len(job_description.split()),
+            'job_title': job_title or 'Not specified'
+        }
+    
+    def match_resumes_to_jobs(self, resume_files: List[str], requisitions: List[Dict[str, Any]],
+                              top_k: int = 5, best_fit_k: int = 3) -> Dict[str, Any]:
+        """Score every resume against every requisition in one pass
+        
+        Each requisition is a dict with 'job_description' and optional 'job_title'
+        and 'id'. Skills are extracted once per requisition and every resume is
+        parsed once against the union of all requisition skills; the
+        requisition x candidate score matrix is then computed with NumPy using
+        the same formulas as match_resumes_to_job.
+        """
+        with metrics.run('match_resumes_to_jobs'):
+            if not requisitions:
+                return {'error': 'At least one requisition is required', 'requisitions': [], 'candidates': []}
+            if not resume_files:
+                return {'error': 'At least one resume file is required', 'requisitions': [], 'candidates': []}
+            
+            requisition_ids = [str(req.get('id', index + 1)) for index, req in enumerate(requisitions)]
+            requisition_skills = [
+                self.extract_skills_from_job_description(req.get('job_description', ''), req.get('job_title'))
+                for req in requisitions
+            ]
+            all_skills = sorted(set().union(*requisition_skills))
+            
+            duplicate_index = self.duplicate_index
+            if duplicate_index is None and DEDUP_ENABLED:
+                duplicate_index = DuplicateIndex()
+            candidates = self.resume_parser.parse_multiple_resumes(resume_files, all_skills, duplicate_index)
+            if duplicate_index is not None and duplicate_index.path:
+                duplicate_index.save()
+            candidates = [c for c in candidates if c.get('raw_text') != 'Failed to parse resume']
+            if not candidates:
+                return {'error': 'No resumes could be parsed successfully', 'requisitions': [], 'candidates': []}
+            
+            with metrics.timer('scoring'):
+                scores = self._score_matrix(candidates, requisition_skills, all_skills)
+            
+            with metrics.timer('ranking'):
+                return self._matrix_results(
+                    candidates, requisitions, requisition_ids, requisition_skills, scores, top_k, best_fit_k
+                )
+    
+    def _score_matrix(self, candidates: List[Dict[str, Any]], requisition_skills: List[List[str]],
+                      all_skills: List[str]) -> Dict[str, np.ndarray]:
+        """Requisition x candidate matrices for skill match, project relevance and overall score"""
+        skill_index = {skill: i for i, skill in enumerate(all_skills)}
+        n_skills = len(all_skills)
+        
+        # Which union skills each requisition asks for
+        job_matrix = np.zeros((len(requisition_skills), n_skills), dtype=np.int32)
+        for row, skills in enumerate(requisition_skills):
+            job_matrix[row, [skill_index[skill] for skill in skills]] = 1
+        
+        # Which union skills each candidate has, fuzzy matches with their reduced credit
+        candidate_matrix = np.zeros((len(candidates), n_skills))
+        for row, candidate in enumerate(candidates):
+            candidate_matrix[row, [skill_index[skill] for skill in candidate['skills'] if skill in skill_index]] = 1
+            fuzzy = [skill_index[skill] for skill in candidate.get('fuzzy_skills', ()) if skill in skill_index]
+            candidate_matrix[row, fuzzy] = FUZZY_SKILL_WEIGHT
+        skill_match = np.round(job_matrix @ candidate_matrix.T, 2)
+        
+        # Project lines: requisition-independent base score plus skill mentions
+        owners, lines = [], []
+        for owner, candidate in enumerate(candidates):
+            projects = candidate.get('projects', [])
+            owners.extend([owner] * len(projects))
+            lines.extend(projects)
+        
+        project_relevance = np.zeros((len(requisition_skills), len(candidates)))
+        if owners:
+            scorer = ProjectDepthScorer(all_skills)
+            base_scores, mentioned_lines = scorer.line_features(lines)
+            hits = dict(zip(scorer.skills, mentioned_lines))
+            owners = np.array(owners)
+            mention_matrix = np.zeros((len(owners), n_skills), dtype=np.int32)
+            for column, skill in enumerate(all_skills):
+                mention_matrix[hits[skill.lower()], column] = 1
+            depth = np.minimum(np.array(base_scores)[:, None] + 2 * (mention_matrix @ job_matrix.T), 10)
+            totals = np.zeros((len(candidates), len(requisition_skills)))
+            np.add.at(totals, owners, depth)
+            counts = np.bincount(owners, minlength=len(candidates))
+            has_projects = counts > 0
+            totals[has_projects] /= counts[has_projects][:, None]
+            project_relevance = np.minimum(totals * 2, 10).T
+        # A requisition without skills gives no project relevance, as in calculate_project_relevance
+        project_relevance[job_matrix.sum(axis=1) == 0] = 0
+        
+        experience = np.minimum([c.get('experience_years', 0) for c in candidates], 10)
+        overall = np.round(
+            self.SKILL_WEIGHT * skill_match + self.PROJECT_WEIGHT * project_relevance + self.EXP_WEIGHT * experience, 1
+        )
+        return {
+            'skill_match': skill_match,
+            'project_relevance': project_relevance,
+            'experience': np.broadcast_to(experience, overall.shape),
+            'overall': overall,
+        }
+    
+    def _matrix_results(self, candidates, requisitions, requisition_ids, requisition_skills,
+                        scores, top_k, best_fit_k) -> Dict[str, Any]:
+        overall = scores['overall']
+        requisition_results = []
+        for row, req in enumerate(requisitions):
+            # Same multi-level ordering as rank_candidates (lexsort: last key is primary)
+            order = np.lexsort((
+                -scores['experience'][row], -scores['skill_match'][row],
+                -scores['project_relevance'][row], -overall[row],
+            ))[:top_k]
+            requisition_results.append({
+                'id': requisition_ids[row],
+                'job_title': req.get('job_title') or 'Not specified',
+                'extracted_skills': requisition_skills[row],
+                'top_candidates': [
+                    {
+                        'name': candidates[col]['name'],
+                        'file_name': candidates[col]['file_name'],
+                        'overall_score': float(overall[row, col]),
+                        'skill_match': float(scores['skill_match'][row, col]),
+                        'project_relevance': float(scores['project_relevance'][row, col]),
+                        'experience_years': candidates[col].get('experience_years', 0),
+                    }
+                    for col in order
+                ],
+            })
+        
+        candidate_results = []
+        best_fit = np.argsort(-overall, axis=0, kind='stable')[:best_fit_k]
+        for col, candidate in enumerate(candidates):
+            candidate_results.append({
+                'name': candidate['name'],
+                'file_name': candidate['file_name'],
+                'best_fit': [
+                    {'requisition': requisition_ids[row], 'overall_score': float(overall[row, col])}
+                    for row in best_fit[:, col]
+                ],
+            })
+        
+        return {
+            'requisition_ids': requisition_ids,
+            'candidate_files': [c['file_name'] for c in candidates],
+            'score_matrix': overall.tolist(),
+            'requisitions': requisition_results,
+            'candidates': candidate_results,
+            'total_candidates': len(candidates),
+        }
     
     def get_candidate_analysis(self, candidate: Dict[str, Any], job_skills: List[str]) -> Dict[str, Any]:
         """Get detailed analysis for a specific candidate"""
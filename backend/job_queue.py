@@ -0,0 +1,377 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from backend.job_matcher import JobMatcher
+from backend.metrics import get_logger, log_event
+from backend.search_index import SearchIndex, SearchStore
+from config.settings import (
+    JOB_QUEUE_DB, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS, RESUME_EXTENSIONS, SEARCH_ENABLED, SEARCH_SEGMENT_DOCS
+)
+
+logger = get_logger('job_queue')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_title TEXT,
+    job_description TEXT NOT NULL,
+    job_skills TEXT NOT NULL,
+    total_items INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS work_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL REFERENCES jobs(id),
+    file_path TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_expires REAL,
+    overall_score REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_work_items_claim ON work_items(status, lease_expires);
+CREATE INDEX IF NOT EXISTS idx_work_items_job ON work_items(job_id, status);
+"""
+
+# Work item states
+PENDING, LEASED, DONE, FAILED = 'pending', 'leased', 'done', 'failed'
+
+
+class JobQueue:
+    """Durable batch queue of resume-scoring work items stored in SQLite
+
+    Each submitted batch becomes one row in ``jobs`` and one ``work_items`` row
+    per resume. Workers lease items, and every finished file is committed on
+    its own, so a crashed worker only loses the files it had leased; those are
+    picked up again once the lease expires (or immediately when a worker
+    restarted under the same explicit id calls ``recover``).
+    """
+
+    def __init__(self, db_path: str = JOB_QUEUE_DB, lease_seconds: int = JOB_LEASE_SECONDS,
+                 max_attempts: int = JOB_MAX_ATTEMPTS):
+        self.db_path = str(db_path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def submit_batch(self, job_description: str, resume_paths: List[str], job_title: str = None,
+                     job_matcher: JobMatcher = None) -> int:
+        """Queue one work item per resume and return the new job id"""
+        if not job_description or not job_description.strip():
+            raise ValueError('Job description is required')
+        if not resume_paths:
+            raise ValueError('At least one resume file is required')
+
+        # Skills are extracted once here instead of once per worker item
+        job_matcher = job_matcher or JobMatcher()
+        job_skills = job_matcher.extract_skills_from_job_description(job_description, job_title)
+
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.execute(
+                'INSERT INTO jobs (job_title, job_description, job_skills, total_items, created_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (job_title, job_description, json.dumps(job_skills), len(resume_paths), now)
+            )
+            job_id = cursor.lastrowid
+            conn.executemany(
+                'INSERT INTO work_items (job_id, file_path, updated_at) VALUES (?, ?, ?)',
+                [(job_id, str(path), now) for path in resume_paths]
+            )
+            conn.execute('COMMIT')
+
+        log_event(logger, 'batch_submitted', job_id=job_id, items=len(resume_paths))
+        return job_id
+
+    def claim(self, worker_id: str, limit: int = 1) -> List[Dict[str, Any]]:
+        """Lease up to ``limit`` runnable items for a worker
+
+        Runnable items are pending ones and ones whose lease has expired. Items
+        that already used up their attempts are marked failed instead.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            runnable = '(status = ? OR (status = ? AND lease_expires < ?))'
+            # Fail exhausted items first, so they never take the place of runnable ones under LIMIT
+            conn.execute(
+                f'UPDATE work_items SET status = ?, error = ?, updated_at = ? WHERE {runnable} AND attempts >= ?',
+                (FAILED, 'Exceeded maximum attempts', now, PENDING, LEASED, now, self.max_attempts)
+            )
+            rows = conn.execute(
+                'SELECT w.id, w.job_id, w.file_path, j.job_skills FROM work_items w '
+                'JOIN jobs j ON j.id = w.job_id '
+                'WHERE (w.status = ? OR (w.status = ? AND w.lease_expires < ?)) AND w.attempts < ? '
+                'ORDER BY w.id LIMIT ?',
+                (PENDING, LEASED, now, self.max_attempts, limit)
+            ).fetchall()
+
+            claimed = []
+            for row in rows:
+                conn.execute(
+                    'UPDATE work_items SET status = ?, worker_id = ?, lease_expires = ?, '
+                    'attempts = attempts + 1, updated_at = ? WHERE id = ?',
+                    (LEASED, worker_id, now + self.lease_seconds, now, row['id'])
+                )
+                claimed.append({
+                    'id': row['id'],
+                    'job_id': row['job_id'],
+                    'file_path': row['file_path'],
+                    'job_skills': json.loads(row['job_skills']),
+                })
+            conn.execute('COMMIT')
+        return claimed
+
+    def recover(self, worker_id: str) -> int:
+        """Return the leases held by ``worker_id`` to the queue; call only when no process runs under that id
+
+        For a worker restarted under the same explicit id, so the items it held
+        when it died do not wait for their leases to expire.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'UPDATE work_items SET status = ?, worker_id = NULL, lease_expires = NULL, updated_at = ? '
+                'WHERE worker_id = ? AND status = ?',
+                (PENDING, time.time(), worker_id, LEASED)
+            )
+            return cursor.rowcount
+
+    def complete(self, item_id: int, worker_id: str, candidate: Dict[str, Any]) -> bool:
+        """Checkpoint a scored candidate; returns False if the lease was lost"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'UPDATE work_items SET status = ?, result = ?, overall_score = ?, error = NULL, '
+                'lease_expires = NULL, updated_at = ? WHERE id = ? AND worker_id = ? AND status = ?',
+                (DONE, json.dumps(candidate), candidate.get('overall_score'), time.time(),
+                 item_id, worker_id, LEASED)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, item_id: int, worker_id: str, error: str) -> bool:
+        """Mark an item as permanently failed (e.g. the resume could not be parsed)"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'UPDATE work_items SET status = ?, error = ?, lease_expires = NULL, updated_at = ? '
+                'WHERE id = ? AND worker_id = ? AND status = ?',
+                (FAILED, error, time.time(), item_id, worker_id, LEASED)
+            )
+            return cursor.rowcount == 1
+
+    def status(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Progress counters for a job"""
+        with self._connect() as conn:
+            job = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if job is None:
+                return None
+            counts = dict(conn.execute(
+                'SELECT status, COUNT(*) FROM work_items WHERE job_id = ? GROUP BY status', (job_id,)
+            ).fetchall())
+
+        finished = counts.get(DONE, 0) + counts.get(FAILED, 0)
+        return {
+            'job_id': job_id,
+            'job_title': job['job_title'] or 'Not specified',
+            'created_at': job['created_at'],
+            'total': job['total_items'],
+            'pending': counts.get(PENDING, 0),
+            'leased': counts.get(LEASED, 0),
+            'done': counts.get(DONE, 0),
+            'failed': counts.get(FAILED, 0),
+            'progress': round(finished / job['total_items'] * 100, 1) if job['total_items'] else 100.0,
+            'finished': finished == job['total_items'],
+        }
+
+    def list_jobs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Status of the most recently submitted jobs"""
+        with self._connect() as conn:
+            job_ids = [row[0] for row in conn.execute(
+                'SELECT id FROM jobs ORDER BY id DESC LIMIT ?', (limit,)
+            )]
+        return [self.status(job_id) for job_id in job_ids]
+
+    def ranking(self, job_id: int, limit: int = None, job_matcher: JobMatcher = None) -> Dict[str, Any]:
+        """Rank the candidates finished so far, in the match_resumes_to_job result format"""
+        with self._connect() as conn:
+            job = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if job is None:
+                return {'error': f'Unknown job {job_id}', 'extracted_skills': [], 'candidates': [], 'shortlist': []}
+            candidates = [json.loads(row[0]) for row in conn.execute(
+                'SELECT result FROM work_items WHERE job_id = ? AND status = ?', (job_id, DONE)
+            )]
+
+        ranked = (job_matcher or JobMatcher()).rank_candidates(candidates)
+        if limit:
+            ranked = ranked[:limit]
+        return {
+            'extracted_skills': json.loads(job['job_skills']),
+            'candidates': ranked,
+            'shortlist': ranked[:3],
+            'total_candidates': len(candidates),
+            'skills_found': len(json.loads(job['job_skills'])),
+            'job_title': job['job_title'] or 'Not specified',
+        }
+
+
+def process_item(item: Dict[str, Any], job_matcher: JobMatcher) -> Dict[str, Any]:
+    """Parse and score a single claimed resume"""
+    candidate = job_matcher.resume_parser.parse_resume(item['file_path'], item['job_skills'])
+    if candidate.get('raw_text') == 'Failed to parse resume':
+        raise ValueError(f"Could not parse {item['file_path']}")
+    candidate['project_relevance'] = job_matcher.calculate_project_relevance(
+        candidate.get('projects', []), item['job_skills']
+    )
+    candidate['overall_score'] = job_matcher.calculate_overall_score(candidate)
+    return candidate
+
+
+def run_worker(db_path: str = JOB_QUEUE_DB, worker_id: str = None, batch_size: int = 4,
+               poll_interval: float = 1.0, stop_when_idle: bool = True):
+    """Claim and process work items until the queue is drained (or forever)
+
+    An explicit ``worker_id`` identifies a restartable worker: the leases a
+    previous process held under it are recovered at startup, so the id must
+    not be shared by two running workers.
+    """
+    queue = JobQueue(db_path)
+    if worker_id is None:
+        worker_id = f'{socket.gethostname()}-{os.getpid()}'
+    elif queue.recover(worker_id):
+        log_event(logger, 'leases_recovered', worker_id=worker_id)
+    search_store = SearchStore() if SEARCH_ENABLED else None
+    job_matcher = JobMatcher(search_index=SearchIndex() if SEARCH_ENABLED else None)
+    processed = 0
+    # Scored items are only checkpointed once their text is in a written segment,
+    # so a crash re-queues them instead of losing them from search
+    scored, held_since = [], None
+
+    while True:
+        items = queue.claim(worker_id, batch_size)
+        if items and held_since is None:
+            held_since = time.monotonic()
+        for item in items:
+            try:
+                candidate = process_item(item, job_matcher)
+            except Exception as e:
+                queue.fail(item['id'], worker_id, str(e))
+                log_event(logger, 'work_item_failed', logging.WARNING, item=item['id'], error=str(e))
+                continue
+            scored.append((item['id'], candidate))
+
+        search_index = job_matcher.resume_parser.search_index
+        # Segments hold up to SEARCH_SEGMENT_DOCS resumes, but are cut early before the held leases run out
+        if search_index is None or not items or len(search_index) >= SEARCH_SEGMENT_DOCS or (
+                held_since is not None and time.monotonic() - held_since >= queue.lease_seconds / 2):
+            if search_index is not None:
+                search_store.write(search_index)
+                job_matcher.resume_parser.search_index = SearchIndex()
+            for item_id, candidate in scored:
+                if queue.complete(item_id, worker_id, candidate):
+                    processed += 1
+            scored, held_since = [], None
+        if not items:
+            if stop_when_idle:
+                break
+            time.sleep(poll_interval)
+
+    log_event(logger, 'worker_stopped', worker_id=worker_id, processed=processed)
+    return processed
+
+
+def start_workers(count: int, db_path: str = JOB_QUEUE_DB, stop_when_idle: bool = True) -> List[multiprocessing.Process]:
+    """Spawn ``count`` worker processes against the queue"""
+    processes = []
+    for _ in range(count):
+        process = multiprocessing.Process(
+            target=run_worker,
+            # Each process picks a host- and pid-unique id, so separate 'work' commands never share leases
+            kwargs={'db_path': str(db_path), 'stop_when_idle': stop_when_idle},
+        )
+        process.start()
+        processes.append(process)
+    return processes
+
+
+def expand_resume_paths(paths: List[str]) -> List[str]:
+    """Expand directories into the resume files they contain"""
+    expanded = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            expanded.extend(
+                str(p) for p in sorted(path.rglob('*')) if p.suffix.lower().lstrip('.') in RESUME_EXTENSIONS
+            )
+        else:
+            expanded.append(str(path))
+    return expanded
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch resume scoring queue')
+    parser.add_argument('--db', default=str(JOB_QUEUE_DB))
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    submit = commands.add_parser('submit', help='Queue a job description and resumes')
+    submit.add_argument('--jd', required=True, help='Path to the job description (.txt)')
+    submit.add_argument('--title', default=None)
+    submit.add_argument('resumes', nargs='+', help='Resume files or directories')
+
+    work = commands.add_parser('work', help='Run worker processes')
+    work.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    work.add_argument('--forever', action='store_true', help='Keep polling for new jobs')
+
+    status = commands.add_parser('status', help='Show job progress')
+    status.add_argument('job_id', type=int, nargs='?')
+
+    ranking = commands.add_parser('ranking', help='Show the current ranking of a job')
+    ranking.add_argument('job_id', type=int)
+    ranking.add_argument('--top', type=int, default=10)
+
+    args = parser.parse_args()
+    queue = JobQueue(args.db)
+
+    if args.command == 'submit':
+        job_description = Path(args.jd).read_text(encoding='utf-8')
+        job_id = queue.submit_batch(job_description, expand_resume_paths(args.resumes), args.title)
+        print(json.dumps({'job_id': job_id}))
+    elif args.command == 'work':
+        for process in start_workers(args.workers, args.db, stop_when_idle=not args.forever):
+            process.join()
+        # Workers only add segments; merge them once they are done
+        if SEARCH_ENABLED and SearchStore().needs_compaction():
+            SearchStore().compact()
+    elif args.command == 'status':
+        result = queue.status(args.job_id) if args.job_id else queue.list_jobs()
+        print(json.dumps(result, indent=2))
+    elif args.command == 'ranking':
+        results = queue.ranking(args.job_id, args.top)
+        for rank, candidate in enumerate(results['candidates'], 1):
+            print(f"{rank:>3}. {candidate['overall_score']:>4}  {candidate['name']}  ({candidate['file_name']})")
+
+
+if __name__ == '__main__':
+    main()
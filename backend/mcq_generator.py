@@ -4,11 +4,32 @@ import json
 import random
 from typing import List, Dict, Any
 
+from backend.snapshot import load_snapshot
+
 class MCQGenerator:
-    def __init__(self):
-        self.question_bank = self._initialize_question_bank()
+    def __init__(self, question_bank: Dict[str, List[Dict[str, Any]]] = None):
+        # The indexed bank is precompiled into the startup snapshot unless one is given
+        indexed = self.index_question_bank(question_bank) if question_bank else load_snapshot().section('question_bank')
+        self.question_bank = indexed['bank']
+        self.difficulty_index = indexed['difficulty_index']
+
+    @staticmethod
+    def index_question_bank(question_bank: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Bank plus, per skill, the positions of its questions for each difficulty"""
+        difficulty_index = {}
+        for skill, questions in question_bank.items():
+            by_difficulty = difficulty_index.setdefault(skill, {})
+            for position, question in enumerate(questions):
+                by_difficulty.setdefault(question.get('difficulty', 'medium').lower(), []).append(position)
+        return {'bank': question_bank, 'difficulty_index': difficulty_index}
+
+    def _questions_at(self, skill: str, difficulty: str) -> List[Dict[str, Any]]:
+        """A skill's questions of one difficulty, via the index"""
+        positions = self.difficulty_index.get(skill, {}).get(difficulty.lower(), [])
+        return [self.question_bank[skill][position] for position in positions]
 
-    def _initialize_question_bank(self) -> Dict[str, List[Dict[str, Any]]]:
+    @staticmethod
+    def build_question_bank() -> Dict[str, List[Dict[str, Any]]]:
         return {
             'python': [
                 {
@@ -272,21 +293,25 @@ class MCQGenerator:
                 break
                 
             # Check for exact matches and partial matches
-            skill_questions = []
+            matched_skills = []
             
             # Direct match
             if skill in self.question_bank:
-                skill_questions = self.question_bank[skill].copy()
+                matched_skills = [skill]
             else:
                 # Partial matching for compound skills
-                for bank_skill in self.question_bank.keys():
-                    if bank_skill in skill or skill in bank_skill:
-                        skill_questions.extend(self.question_bank[bank_skill].copy())
+                matched_skills = [
+                    bank_skill for bank_skill in self.question_bank.keys()
+                    if bank_skill in skill or skill in bank_skill
+                ]
+            skill_questions = [q for bank_skill in matched_skills for q in self.question_bank[bank_skill]]
             
             if skill_questions:
                 # Filter by difficulty if specified
                 if difficulty.lower() != "medium":
-                    skill_questions = [q for q in skill_questions if q.get('difficulty', 'medium').lower() == difficulty.lower()]
+                    skill_questions = [
+                        q for bank_skill in matched_skills for q in self._questions_at(bank_skill, difficulty)
+                    ]
                 
                 # If no questions match difficulty, fall back to all questions
                 if not skill_questions:
@@ -328,7 +353,7 @@ class MCQGenerator:
         
         # Filter by difficulty if specified
         if difficulty.lower() != "medium":
-            filtered = [q for q in general_questions if q.get('difficulty', 'medium').lower() == difficulty.lower()]
+            filtered = self._questions_at('general', difficulty)
             if filtered:
                 general_questions = filtered
         
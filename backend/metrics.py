@@ -0,0 +1,216 @@
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+from config.settings import LOG_LEVEL
+
+# Pipeline stages timed by the backend, in execution order
+STAGES = ['text_extraction', 'feature_extraction', 'skill_matching', 'scoring', 'ranking']
+
+# Counters exported even when they have never been incremented
+COUNTERS = ['files', 'pages', 'bytes', 'cache_hits', 'duplicates', 'parse_failures']
+
+_LOGGER_ROOT = 'hr_assistant'
+_logging_lock = threading.Lock()
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Format log records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'ts': round(record.created, 3),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'event': record.getMessage(),
+        }
+        payload.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            payload['exc'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Get a backend logger that emits structured JSON lines"""
+    root = logging.getLogger(_LOGGER_ROOT)
+    with _logging_lock:
+        if not root.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(JsonLogFormatter())
+            root.addHandler(handler)
+            root.setLevel(LOG_LEVEL)
+            root.propagate = False
+    return root.getChild(name)
+
+
+def log_event(logger: logging.Logger, event: str, level: int = logging.INFO, **fields):
+    """Log an event name together with structured fields"""
+    logger.log(level, event, extra={'fields': fields})
+
+
+class RunStats:
+    """Per-stage breakdown of a single pipeline run"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.started_at = time.time()
+        self.duration = 0.0
+        self.stage_seconds = defaultdict(float)
+        self.stage_calls = defaultdict(int)
+        self.counters = defaultdict(int)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'label': self.label,
+            'started_at': self.started_at,
+            'duration': round(self.duration, 4),
+            'stages': [
+                {
+                    'stage': stage,
+                    'seconds': round(self.stage_seconds[stage], 4),
+                    'calls': self.stage_calls[stage],
+                }
+                for stage in self._ordered_stages()
+            ],
+            'counters': {name: self.counters[name] for name in _ordered(self.counters, COUNTERS)},
+        }
+
+    def _ordered_stages(self):
+        return _ordered(self.stage_seconds, STAGES)
+
+
+def _ordered(observed, known):
+    """Known names first (in their canonical order), then any extras"""
+    return list(known) + sorted(name for name in observed if name not in known)
+
+
+class PipelineMetrics:
+    """Thread-safe stage timers and counters for the parsing/matching pipeline"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stage_seconds = defaultdict(float)
+        self.stage_calls = defaultdict(int)
+        self.counters = defaultdict(int)
+        self.last_run: Optional[RunStats] = None
+
+    @contextmanager
+    def timer(self, stage: str):
+        """Time the enclosed block and attribute it to a pipeline stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stage_seconds[stage] += elapsed
+                self.stage_calls[stage] += 1
+            current = self._current_run()
+            if current is not None:
+                current.stage_seconds[stage] += elapsed
+                current.stage_calls[stage] += 1
+
+    def increment(self, counter: str, value: int = 1):
+        """Increase a named counter"""
+        with self._lock:
+            self.counters[counter] += value
+        current = self._current_run()
+        if current is not None:
+            current.counters[counter] += value
+
+    @contextmanager
+    def run(self, label: str):
+        """Collect a per-stage breakdown for the enclosed pipeline run
+
+        Runs are tracked per thread, so concurrent Streamlit sessions do not
+        mix their numbers. Nested runs are folded into the outermost one.
+        """
+        if self._current_run() is not None:
+            yield self._current_run()
+            return
+
+        stats = RunStats(label)
+        self._local.run = stats
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.duration = time.perf_counter() - start
+            self._local.run = None
+            with self._lock:
+                self.last_run = stats
+
+    def _current_run(self) -> Optional[RunStats]:
+        return getattr(self._local, 'run', None)
+
+    def get_last_run(self) -> Optional[Dict[str, Any]]:
+        """Breakdown of the most recently finished run"""
+        with self._lock:
+            return self.last_run.to_dict() if self.last_run else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cumulative totals since process start (or the last reset)"""
+        with self._lock:
+            return {
+                'stages': {
+                    stage: {
+                        'seconds': round(self.stage_seconds[stage], 4),
+                        'calls': self.stage_calls[stage],
+                    }
+                    for stage in _ordered(self.stage_seconds, STAGES)
+                },
+                'counters': {name: self.counters[name] for name in _ordered(self.counters, COUNTERS)},
+            }
+
+    def to_prometheus(self, prefix: str = 'hr_assistant') -> str:
+        """Render cumulative metrics in the Prometheus text exposition format"""
+        snap = self.snapshot()
+        lines = [
+            f'# HELP {prefix}_stage_seconds_total Wall time spent per pipeline stage.',
+            f'# TYPE {prefix}_stage_seconds_total counter',
+        ]
+        for stage, values in snap['stages'].items():
+            lines.append(f'{prefix}_stage_seconds_total{{stage="{stage}"}} {values["seconds"]}')
+        lines += [
+            f'# HELP {prefix}_stage_calls_total Number of timed executions per pipeline stage.',
+            f'# TYPE {prefix}_stage_calls_total counter',
+        ]
+        for stage, values in snap['stages'].items():
+            lines.append(f'{prefix}_stage_calls_total{{stage="{stage}"}} {values["calls"]}')
+        for name, value in snap['counters'].items():
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            lines.append(f'{prefix}_{name}_total {value}')
+        return "\n".join(lines) + "\n"
+
+    def merge_run(self, run: Dict[str, Any]):
+        """Fold a RunStats dict recorded in another process into these metrics"""
+        current = self._current_run()
+        with self._lock:
+            for stage in run['stages']:
+                self.stage_seconds[stage['stage']] += stage['seconds']
+                self.stage_calls[stage['stage']] += stage['calls']
+            for name, value in run['counters'].items():
+                self.counters[name] += value
+        if current is not None:
+            for stage in run['stages']:
+                current.stage_seconds[stage['stage']] += stage['seconds']
+                current.stage_calls[stage['stage']] += stage['calls']
+            for name, value in run['counters'].items():
+                current.counters[name] += value
+
+    def reset(self):
+        """Clear all totals (mainly for tests)"""
+        with self._lock:
+            self.stage_seconds.clear()
+            self.stage_calls.clear()
+            self.counters.clear()
+            self.last_run = None
+
+
+# Process-wide instance shared by the backend classes and the UI
+metrics = PipelineMetrics()
@@ -0,0 +1,120 @@
+import re
+from bisect import bisect_right
+from collections import Counter
+from typing import List, Tuple
+
+# Implementation complexity (technical verbs), +1 each
+TECH_VERBS = ["developed", "built", "engineered", "implemented", "optimized", "designed", "architected"]
+# Technical specificity (mentions of frameworks/libraries), +2 once
+CONNECTOR_WORDS = ["using", "with", "utilizing", "via"]
+# Quantifiable results, +3 once (matched on the original-case text)
+QUANTITY_PATTERN = re.compile(r'\d+%|\$\d+|\d+x')
+
+VERB_POINTS = 1
+CONNECTOR_POINTS = 2
+QUANTITY_POINTS = 3
+SKILL_POINTS = 2
+MAX_DEPTH = 10
+
+
+class ProjectDepthScorer:
+    """JobMatcher.calculate_project_depth compiled once for one job's skills
+
+    Instead of running every check on every project line, all project lines
+    of a candidate pool are joined into one buffer and each needle (verb,
+    connector word, job skill) is searched across the whole buffer once;
+    hits are mapped back to lines by offset. Scores are identical to the
+    per-line implementation.
+
+    This is one str.find pass per needle rather than a single combined
+    matcher. A trie-factored lookahead regex over the buffer (which finds
+    overlapping needles) measured about 1.9x slower with a typical ~30
+    needles: re pays per match in Python, where str.find runs in C and skips
+    the rest of a line after its first hit. A pure-Python Aho-Corasick loop
+    is slower still.
+    """
+
+    def __init__(self, job_skills: List[str]):
+        self.job_skills = list(job_skills)
+        # A skill listed twice in job_skills scores twice, as before
+        self.skill_weights = Counter(skill.lower() for skill in self.job_skills)
+        self.skills = list(self.skill_weights)
+
+    @staticmethod
+    def _line_hits(buffer: str, starts: List[int], needle: str) -> List[int]:
+        """Indices of lines containing ``needle`` (each line reported once)"""
+        if not needle:
+            return list(range(len(starts)))
+        lines = []
+        position = buffer.find(needle)
+        while position != -1:
+            line = bisect_right(starts, position) - 1
+            lines.append(line)
+            next_start = starts[line + 1] if line + 1 < len(starts) else len(buffer)
+            position = buffer.find(needle, next_start)
+        return lines
+
+    def line_features(self, lines: List[str]) -> Tuple[List[int], List[List[int]]]:
+        """Job-independent base score per line, and the lines mentioning each skill
+
+        The second element is parallel to ``self.skills``.
+        """
+        if not lines:
+            return [], [[] for _ in self.skills]
+
+        lowered = [line.lower() for line in lines]
+        starts, offset = [], 0
+        for line in lowered:
+            starts.append(offset)
+            offset += len(line) + 1
+        buffer = '\n'.join(lowered)
+
+        base = [0] * len(lines)
+        for verb in TECH_VERBS:
+            for line in self._line_hits(buffer, starts, verb):
+                base[line] += VERB_POINTS
+
+        connected = set()
+        for word in CONNECTOR_WORDS:
+            connected.update(self._line_hits(buffer, starts, word))
+        for line in connected:
+            base[line] += CONNECTOR_POINTS
+
+        original_starts, offset = [], 0
+        for line in lines:
+            original_starts.append(offset)
+            offset += len(line) + 1
+        quantified = {
+            bisect_right(original_starts, match.start()) - 1
+            for match in QUANTITY_PATTERN.finditer('\n'.join(lines))
+        }
+        for line in quantified:
+            base[line] += QUANTITY_POINTS
+
+        mentions = [self._line_hits(buffer, starts, skill) for skill in self.skills]
+        return base, mentions
+
+    def score_lines(self, lines: List[str]) -> List[int]:
+        """calculate_project_depth for every line"""
+        scores, mentions = self.line_features(lines)
+        for skill, hit_lines in zip(self.skills, mentions):
+            points = SKILL_POINTS * self.skill_weights[skill]
+            for line in hit_lines:
+                scores[line] += points
+        return [min(score, MAX_DEPTH) for score in scores]
+
+    def score_pool(self, project_lists: List[List[str]]) -> List[float]:
+        """calculate_project_relevance for every candidate in one batched pass"""
+        flat = [project for projects in project_lists for project in projects]
+        depths = self.score_lines(flat)
+
+        relevances, offset = [], 0
+        for projects in project_lists:
+            count = len(projects)
+            if not projects or not self.job_skills:
+                relevances.append(0.0)
+            else:
+                total_score = sum(depths[offset:offset + count])
+                relevances.append(min(total_score / count * 2, 10))
+            offset += count
+        return relevances
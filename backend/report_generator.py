@@ -0,0 +1,207 @@
+import io
+import logging
+import re
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Tuple, Union, BinaryIO
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.platypus import ListFlowable, ListItem, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from backend.analysis_executor import AnalysisExecutor
+from backend.metrics import get_logger, log_event
+from config.settings import REPORT_WORKERS, REPORT_MAX_IN_FLIGHT, REPORT_MAX_PROJECTS, EXPORT_MAX_AGE_SECONDS
+
+logger = get_logger('report_generator')
+
+_UNSAFE_NAME = re.compile(r'[^A-Za-z0-9._-]+')
+
+# Styles and table templates are built once per worker process and reused for every dossier
+_templates = None
+
+
+def _get_templates() -> Dict[str, Any]:
+    global _templates
+    if _templates is None:
+        base = getSampleStyleSheet()
+        _templates = {
+            'title': ParagraphStyle('DossierTitle', parent=base['Title'], fontSize=18, spaceAfter=4),
+            'subtitle': ParagraphStyle('DossierSubtitle', parent=base['Normal'], textColor=colors.grey),
+            'heading': ParagraphStyle('DossierHeading', parent=base['Heading3'], spaceBefore=10, spaceAfter=4),
+            'body': ParagraphStyle('DossierBody', parent=base['BodyText'], fontSize=9.5, leading=12),
+            'warning': ParagraphStyle('DossierWarning', parent=base['BodyText'], textColor=colors.darkred),
+            'table': TableStyle([
+                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 9.5),
+                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f2f6')),
+                ('GRID', (0, 0), (-1, -1), 0.25, colors.HexColor('#e1e5e9')),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ]),
+        }
+    return _templates
+
+
+def _footer(canvas, doc):
+    canvas.saveState()
+    canvas.setFont('Helvetica', 8)
+    canvas.setFillColor(colors.grey)
+    canvas.drawString(doc.leftMargin, 10 * mm, 'AI HR Recruitment Assistant - candidate dossier')
+    canvas.drawRightString(A4[0] - doc.rightMargin, 10 * mm, f'Page {doc.page}')
+    canvas.restoreState()
+
+
+def _bullets(items: List[str], style) -> ListFlowable:
+    return ListFlowable(
+        [ListItem(Paragraph(escape(str(item)), style), leftIndent=10) for item in items],
+        bulletType='bullet', start='•', leftIndent=10
+    )
+
+
+def report_file_name(rank: int, candidate: Dict[str, Any]) -> str:
+    """Zip entry name of a dossier, ordered by rank"""
+    name = _UNSAFE_NAME.sub('_', candidate.get('name') or 'candidate').strip('_') or 'candidate'
+    return f'{rank:03d}_{name}.pdf'
+
+
+def render_candidate_report(analysis: Dict[str, Any], rank: int, job_title: str = None) -> Tuple[str, bytes]:
+    """Render one JobMatcher.get_candidate_analysis result as a PDF dossier"""
+    templates = _get_templates()
+    body = templates['body']
+    candidate = analysis['candidate']
+
+    story = [
+        Paragraph(escape(f"#{rank} {candidate.get('name', 'Candidate')}"), templates['title']),
+        Paragraph(escape(
+            f"{job_title or 'Position not specified'} · generated {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        ), templates['subtitle']),
+        Spacer(1, 6 * mm),
+    ]
+
+    summary = [
+        ['Recommendation', analysis['recommendation']],
+        ['Overall score', f"{candidate.get('overall_score', 0):.1f}/10"],
+        ['Project relevance', f"{candidate.get('project_relevance', 0):.1f}/10"],
+        ['Skill match', f"{analysis['skill_match_percentage']}% ({len(analysis['matched_skills'])} skills)"],
+        ['Experience', f"{candidate.get('experience_years', 0)} years ({candidate.get('experience_level', 'N/A')})"],
+        ['Email', candidate.get('email') or 'Not found'],
+        ['Phone', candidate.get('phone') or 'Not found'],
+        ['Resume file', candidate.get('file_name', '')],
+    ]
+    story.append(Table(summary, colWidths=[40 * mm, 120 * mm], style=templates['table'], hAlign='LEFT'))
+
+    if candidate.get('is_duplicate'):
+        story.append(Spacer(1, 3 * mm))
+        story.append(Paragraph(escape(
+            f"Possible duplicate of {candidate.get('duplicate_of')} "
+            f"({candidate.get('duplicate_type')}, similarity {candidate.get('duplicate_similarity')})"
+        ), templates['warning']))
+
+    story.append(Paragraph('Strengths', templates['heading']))
+    story.append(_bullets(analysis['strengths'], body))
+
+    story.append(Paragraph('Matched skills', templates['heading']))
+    story.append(Paragraph(escape(', '.join(analysis['matched_skills']) or 'None'), body))
+
+    story.append(Paragraph('Areas for improvement', templates['heading']))
+    if analysis['areas_for_improvement']:
+        story.append(_bullets(analysis['areas_for_improvement'], body))
+    else:
+        story.append(Paragraph('Covers every required skill', body))
+
+    project_summary = analysis['project_summary']
+    story.append(Paragraph('Projects', templates['heading']))
+    story.append(Paragraph(escape(
+        f"{project_summary['total_projects']} projects, {project_summary['detailed_projects']} described in detail"
+    ), body))
+    projects = candidate.get('projects', [])[:REPORT_MAX_PROJECTS]
+    if projects:
+        story.append(_bullets(projects, body))
+
+    buffer = io.BytesIO()
+    document = SimpleDocTemplate(
+        buffer, pagesize=A4, title=f"Candidate dossier - {candidate.get('name', '')}",
+        leftMargin=20 * mm, rightMargin=20 * mm, topMargin=18 * mm, bottomMargin=18 * mm
+    )
+    document.build(story, onFirstPage=_footer, onLaterPages=_footer)
+    return report_file_name(rank, candidate), buffer.getvalue()
+
+
+def prune_exports(directory: Path, pattern: str, max_age_seconds: float = EXPORT_MAX_AGE_SECONDS) -> int:
+    """Delete export files matching ``pattern`` older than ``max_age_seconds``; returns how many"""
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for path in Path(directory).glob(pattern):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+class ReportGenerator:
+    """Render candidate dossiers in worker processes and stream them into one zip
+
+    At most ``max_in_flight`` rendered PDFs exist at any time: new work is
+    only submitted as finished PDFs are written to the archive, so memory
+    stays flat however many candidates there are. Runs on the shared
+    analysis executor when one is given (queued fairly with analyses),
+    otherwise on a private process pool.
+    """
+
+    def __init__(self, executor: AnalysisExecutor = None, session_id: str = 'reports',
+                 workers: int = REPORT_WORKERS, max_in_flight: int = REPORT_MAX_IN_FLIGHT):
+        self.executor = executor
+        self.session_id = session_id
+        self.max_in_flight = max(1, max_in_flight)
+        self._pool = None if executor else ProcessPoolExecutor(max_workers=workers)
+
+    def _submit(self, fn, *args):
+        if self.executor is not None:
+            return self.executor.submit(self.session_id, fn, *args)
+        return self._pool.submit(fn, *args)
+
+    def write_zip(self, analyses: List[Dict[str, Any]], output: Union[str, BinaryIO],
+                  job_title: str = None) -> List[str]:
+        """Write one dossier per analysis to a zip, named by rank; returns the entry names"""
+        names = []
+        pending = set()
+        analyses = iter(enumerate(analyses, 1))
+        try:
+            with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                while True:
+                    for rank, analysis in analyses:
+                        pending.add(self._submit(render_candidate_report, analysis, rank, job_title))
+                        if len(pending) >= self.max_in_flight:
+                            break
+                    if not pending:
+                        break
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name, data = future.result()
+                        archive.writestr(name, data)
+                        names.append(name)
+        finally:
+            # After a failed render the archive is abandoned: queued renders need not run
+            for future in pending:
+                future.cancel()
+        log_event(logger, 'reports_written', logging.INFO, reports=len(names))
+        return sorted(names)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,26 +1,37 @@
+import os
 import re
 import json
-from typing import List, Dict, Any
+import logging
+from typing import List, Dict, Any, Iterable, Iterator
 import PyPDF2
-import docx
 from pathlib import Path
+from backend.dedup import DuplicateIndex, content_hash
+from backend.docx_stream import extract_docx_text
+from backend.experience_timeline import parse_timeline, experience_summary
+from backend.fuzzy_skills import EXACT, FUZZY, get_fuzzy_matcher, weighted_skill_count
+from backend.metrics import metrics, get_logger, log_event
+from backend.search_index import SearchIndex
+from backend.section_segmenter import segment_sections, section_text
+from backend.skill_taxonomy import get_taxonomy
+from backend.text_cache import text_cache, file_digest
+from config.settings import FUZZY_SKILLS_ENABLED
+
+logger = get_logger('resume_parser')
+
+# Sections each extractor reads; resumes without them fall back to the whole text
+PROJECT_SECTIONS = ('projects', 'experience')
+EXPERIENCE_SECTIONS = ('header', 'summary', 'experience')
+NON_SKILL_SECTIONS = ('education', 'interests')
 
 class ResumeParser:
-    def __init__(self):
-        self.skill_keywords = [
-            'python', 'java', 'javascript', 'react', 'node.js', 'sql', 'mongodb', 
-            'html', 'css', 'git', 'docker', 'kubernetes', 'aws', 'azure', 'gcp',
-            'machine learning', 'data science', 'tensorflow', 'pytorch', 'flask',
-            'django', 'express', 'angular', 'vue', 'typescript', 'c++', 'c#',
-            'php', 'ruby', 'go', 'rust', 'scala', 'kotlin', 'swift', 'mysql',
-            'postgresql', 'redis', 'elasticsearch', 'jenkins', 'terraform',
-            'ansible', 'linux', 'unix', 'bash', 'powershell', 'api', 'rest',
-            'graphql', 'microservices', 'devops', 'ci/cd', 'agile', 'scrum',
-            'springboot', 'spring', 'hibernate', 'jpa', 'maven', 'gradle',
-            'junit', 'mockito', 'selenium', 'postman', 'swagger', 'json',
-            'xml', 'yaml', 'nosql', 'firebase', 'heroku', 'netlify', 'vercel',
-            'bootstrap', 'tailwind', 'sass', 'webpack', 'npm', 'yarn', 'vite'
-        ]
+    def __init__(self, search_index: SearchIndex = None):
+        # Full-text index fed with the text of every resume parsed (see backend.search_index)
+        self.search_index = search_index
+    
+    @property
+    def skill_keywords(self) -> List[str]:
+        """Default skills to look for when no job skills are given"""
+        return get_taxonomy().default_skills
     
     def extract_text_from_pdf(self, file_path: str) -> str:
         """Extract text from PDF file"""
@@ -30,32 +41,64 @@ class ResumeParser:
                 text = ""
                 for page in pdf_reader.pages:
                     text += page.extract_text()
+                metrics.increment('pages', len(pdf_reader.pages))
                 return text
         except Exception as e:
-            print(f"Error reading PDF: {e}")
+            log_event(logger, 'pdf_read_failed', logging.WARNING, file=file_path, error=str(e))
             return ""
     
     def extract_text_from_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file"""
+        """Extract text from DOCX file (body, tables, text boxes, headers and footers)"""
         try:
-            doc = docx.Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            return extract_docx_text(file_path)
         except Exception as e:
-            print(f"Error reading DOCX: {e}")
+            log_event(logger, 'docx_read_failed', logging.WARNING, file=file_path, error=str(e))
             return ""
     
     def extract_text(self, file_path: str) -> str:
         """Extract text based on file extension"""
+        return self.load_document(file_path)['text']
+    
+    def load_document(self, file_path: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Extracted text and section offsets of a resume, cached by file content unless ``use_cache`` is False"""
         file_ext = Path(file_path).suffix.lower()
-        if file_ext == '.pdf':
-            return self.extract_text_from_pdf(file_path)
-        elif file_ext == '.docx':
-            return self.extract_text_from_docx(file_path)
-        else:
-            return ""
+        metrics.increment('files')
+        
+        with metrics.timer('text_extraction'):
+            try:
+                metrics.increment('bytes', os.path.getsize(file_path))
+                cache_key = file_digest(file_path) if use_cache else None
+            except OSError:
+                cache_key = None
+            
+            cached = text_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                metrics.increment('cache_hits')
+                return cached
+            
+            if file_ext == '.pdf':
+                text = self.extract_text_from_pdf(file_path)
+            elif file_ext == '.docx':
+                text = self.extract_text_from_docx(file_path)
+            else:
+                text = ""
+        
+        with metrics.timer('feature_extraction'):
+            sections = segment_sections(text)
+            # Date ranges do not depend on the job, so they are cached with the text
+            timeline = parse_timeline(self._relevant_text(text, sections, EXPERIENCE_SECTIONS))
+            document = {'text': text, 'sections': sections, 'timeline': timeline}
+        if cache_key and text:
+            text_cache.put(cache_key, document)
+        return document
+    
+    def _relevant_text(self, text: str, sections, labels) -> str:
+        """Text of the given sections, else everything outside education, else all of it"""
+        if sections is None:
+            return text
+        return (section_text(text, sections, labels)
+                or section_text(text, sections, exclude=NON_SKILL_SECTIONS)
+                or text)
     
     def extract_email(self, text: str) -> str:
         """Extract email from text"""
@@ -79,37 +122,56 @@ class ResumeParser:
     
     def extract_skills_from_text(self, text: str, job_skills: List[str] = None) -> List[str]:
         """Extract skills from text with improved matching"""
-        extracted_skills = []
-        text_lower = text.lower()
+        return list(self.match_skills(text, job_skills))
+    
+    def match_skills(self, text: str, job_skills: List[str] = None) -> Dict[str, str]:
+        """Skills found in the text, each mapped to how it matched: 'exact' or 'fuzzy'
+        
+        Fuzzy matches are misspellings and re-spaced names ('Pyhton',
+        'Postgre SQL') of taxonomy skills that are not mentioned exactly.
+        """
+        taxonomy = get_taxonomy()
+        kinds = dict.fromkeys(taxonomy.match_ids(text), EXACT)
+        if FUZZY_SKILLS_ENABLED:
+            kinds.update(dict.fromkeys(get_fuzzy_matcher(taxonomy).find(text, exclude=kinds), FUZZY))
         
         # Use job skills if provided, otherwise use default skill keywords
-        skills_to_check = job_skills if job_skills else self.skill_keywords
+        if not job_skills:
+            return {skill: kinds[taxonomy.ids[skill]] for skill in taxonomy.skill_names(kinds)}
         
-        for skill in skills_to_check:
-            # Use word boundary regex for better matching
+        matched = {}
+        text_lower = None
+        for skill in job_skills:
+            canonical = taxonomy.canonicalize(skill)
+            if canonical is not None:
+                if taxonomy.ids[canonical] in kinds:
+                    matched.setdefault(canonical, kinds[taxonomy.ids[canonical]])
+                continue
+            # Skills outside the taxonomy fall back to a word boundary regex
+            if text_lower is None:
+                text_lower = text.lower()
             pattern = r'\b' + re.escape(skill.lower()) + r'\b'
             if re.search(pattern, text_lower):
-                extracted_skills.append(skill)
+                matched.setdefault(skill, EXACT)
         
-        return list(set(extracted_skills))  # Remove duplicates
+        return matched
     
-    def extract_experience_years(self, text: str) -> int:
+    def extract_experience_years(self, text: str, sections=None) -> int:
         """Extract years of experience from text"""
-        experience_patterns = [
-            r'(\d+)\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)',
-            r'(\d+)\+?\s*(?:years?|yrs?)',
-            r'experience\s*:?\s*(\d+)\s*(?:years?|yrs?)',
-        ]
-        
-        years = []
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, text.lower())
-            years.extend([int(match) for match in matches])
+        return self.extract_experience(text, sections)['experience_years']
+    
+    def extract_experience(self, text: str, sections=None, timeline: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Experience computed from employment date ranges, alongside the years the resume declares
         
-        return max(years) if years else 0
+        See backend.experience_timeline; ``timeline`` is the document's cached parse, if any.
+        """
+        if timeline is None:
+            timeline = parse_timeline(self._relevant_text(text, sections, EXPERIENCE_SECTIONS))
+        return experience_summary(timeline)
     
-    def extract_projects(self, text: str) -> List[str]:
+    def extract_projects(self, text: str, sections=None) -> List[str]:
         """Extract project information from resume"""
+        text = self._relevant_text(text, sections, PROJECT_SECTIONS)
         projects = []
         project_keywords = ['project', 'built', 'developed', 'created', 'implemented', 'designed']
         
@@ -122,8 +184,9 @@ class ResumeParser:
         
         return projects[:5]  # Return top 5 projects
     
-    def count_projects(self, text: str) -> int:
+    def count_projects(self, text: str, sections=None) -> int:
         """Count project mentions in resume"""
+        text = self._relevant_text(text, sections, PROJECT_SECTIONS)
         project_keywords = [
             'project', 'developed', 'built', 'created', 'implemented', 
             'designed', 'developed', 'programmed', 'coded', 'engineered'
@@ -140,67 +203,108 @@ class ResumeParser:
         # Cap at reasonable number to avoid inflated scores
         return min(project_count, 15)
     
-    def parse_resume(self, file_path: str, job_skills: List[str] = None) -> Dict[str, Any]:
+    def parse_resume(self, file_path: str, job_skills: List[str] = None, use_cache: bool = True) -> Dict[str, Any]:
         """Parse resume and extract all relevant information"""
         try:
             # Extract text from file
-            text = self.extract_text(file_path)
-            if not text:
+            document = self.load_document(file_path, use_cache)
+            if not document['text']:
                 return self._create_empty_candidate(file_path)
             
-            # Extract candidate information
-            filename = Path(file_path).stem
-            candidate_name = filename.replace('_', ' ').replace('-', ' ').title()
-            
-            # Extract skills (with job-specific skills if provided)
-            skills = self.extract_skills_from_text(text, job_skills)
+            self.index_text(document['text'], file_path)
+            return self.parse_text(document['text'], file_path, job_skills, document['sections'],
+                                   document.get('timeline'))
             
+        except Exception as e:
+            log_event(logger, 'resume_parse_failed', logging.ERROR, file=str(file_path), error=str(e))
+            return self._create_empty_candidate(file_path)
+    
+    def parse_text(self, text: str, file_path: str, job_skills: List[str] = None,
+                   sections=None, timeline: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Extract all candidate information from already-extracted resume text"""
+        if sections is None:
+            sections = segment_sections(text)
+        
+        # Extract candidate information
+        filename = Path(file_path).stem
+        candidate_name = filename.replace('_', ' ').replace('-', ' ').title()
+        
+        # Extract skills (with job-specific skills if provided), ignoring education/interests
+        with metrics.timer('skill_matching'):
+            skill_text = section_text(text, sections, exclude=NON_SKILL_SECTIONS) or text
+            skill_matches = self.match_skills(skill_text, job_skills)
+            skills = list(skill_matches)
+            fuzzy_skills = [skill for skill, kind in skill_matches.items() if kind == FUZZY]
+        
+        with metrics.timer('feature_extraction'):
             # Extract projects
-            projects = self.extract_projects(text)
+            projects = self.extract_projects(text, sections)
             
             # Calculate metrics
-            experience_years = self.extract_experience_years(text)
-            project_count = self.count_projects(text)
-            
-            # Determine experience level
-            if experience_years == 0:
-                experience_level = 'Fresher'
-            elif experience_years <= 2:
-                experience_level = 'Beginner'
-            elif experience_years <= 5:
-                experience_level = 'Intermediate'
-            else:
-                experience_level = 'Expert'
-            
-            return {
-                'name': candidate_name,
-                'email': self.extract_email(text),
-                'phone': self.extract_phone(text),
-                'skills': skills,
-                'projects': projects,  # Added projects list
-                'experience_years': experience_years,
-                'projects_count': min(project_count, 10),
-                'file_name': Path(file_path).name,
-                'skill_match': len(skills),
-                'project_depth': min(project_count * 2, 10),
-                'experience_level': experience_level,
-                'raw_text': text[:500] + "..." if len(text) > 500 else text  # Store snippet for debugging
-            }
-            
-        except Exception as e:
-            print(f"Error parsing resume {file_path}: {e}")
-            return self._create_empty_candidate(file_path)
+            experience = self.extract_experience(text, sections, timeline)
+            experience_years = experience['experience_years']
+            project_count = self.count_projects(text, sections)
+            email = self.extract_email(text)
+            phone = self.extract_phone(text)
+        
+        # Determine experience level
+        if experience_years == 0:
+            experience_level = 'Fresher'
+        elif experience_years <= 2:
+            experience_level = 'Beginner'
+        elif experience_years <= 5:
+            experience_level = 'Intermediate'
+        else:
+            experience_level = 'Expert'
+        
+        return {
+            'name': candidate_name,
+            'email': email,
+            'phone': phone,
+            'skills': skills,
+            'fuzzy_skills': fuzzy_skills,  # Subset of skills matched through a misspelling or variant
+            'projects': projects,  # Added projects list
+            'experience_years': experience_years,
+            'experience_months': experience['experience_months'],  # From merged employment date ranges
+            'declared_experience_years': experience['declared_experience_years'],  # As stated, or None
+            'experience_periods': experience['experience_periods'],
+            'projects_count': min(project_count, 10),
+            'file_name': Path(file_path).name,
+            'skill_match': weighted_skill_count(skills, fuzzy_skills),
+            'project_depth': min(project_count * 2, 10),
+            'experience_level': experience_level,
+            'content_hash': content_hash(text),
+            'raw_text': text[:500] + "..." if len(text) > 500 else text  # Store snippet for debugging
+        }
+    
+    def index_text(self, text: str, file_path: str, digest: str = None):
+        """Add a resume's full text to the search index, if this parser has one"""
+        if self.search_index is None:
+            return
+        with metrics.timer('search_indexing'):
+            filename = Path(file_path).stem
+            self.search_index.add(
+                text,
+                file_name=Path(file_path).name,
+                name=filename.replace('_', ' ').replace('-', ' ').title(),
+                content_hash=digest or content_hash(text),
+            )
     
     def _create_empty_candidate(self, file_path: str) -> Dict[str, Any]:
         """Create empty candidate data structure for failed parsing"""
+        metrics.increment('parse_failures')
         filename = Path(file_path).stem
         return {
             'name': filename.replace('_', ' ').replace('-', ' ').title(),
             'email': 'Not provided',
             'phone': 'Not provided',
             'skills': [],
+            'fuzzy_skills': [],
             'projects': [],  # Added empty projects list
             'experience_years': 0,
+            'experience_months': 0,
+            'declared_experience_years': None,
+            'experience_periods': [],
             'projects_count': 0,
             'file_name': Path(file_path).name,
             'skill_match': 0,
@@ -209,10 +313,92 @@ class ResumeParser:
             'raw_text': 'Failed to parse resume'
         }
     
-    def parse_multiple_resumes(self, file_paths: List[str], job_skills: List[str] = None) -> List[Dict[str, Any]]:
-        """Parse multiple resumes"""
-        candidates = []
+    def parse_multiple_resumes(self, file_paths: List[str], job_skills: List[str] = None,
+                               duplicate_index: DuplicateIndex = None) -> List[Dict[str, Any]]:
+        """Parse multiple resumes, reusing features of duplicates when an index is given"""
+        return list(self.iter_parse_resumes(file_paths, job_skills, duplicate_index))
+    
+    def iter_parse_resumes(self, file_paths: Iterable[str], job_skills: List[str] = None,
+                           duplicate_index: DuplicateIndex = None, use_cache: bool = True) -> Iterator[Dict[str, Any]]:
+        """Parse resumes one at a time, so callers need not hold the whole batch in memory
+
+        With ``use_cache=False`` extracted texts are not kept in the process-wide text cache.
+        """
+        if duplicate_index is None:
+            for file_path in file_paths:
+                yield self.parse_resume(file_path, job_skills, use_cache)
+            return
+        
+        skills_key = tuple(sorted(job_skills)) if job_skills else ()
+        batch_entries = set()
         for file_path in file_paths:
-            candidate = self.parse_resume(file_path, job_skills)
-            candidates.append(candidate)
-        return candidates
\ No newline at end of file
+            yield self._parse_with_dedup(file_path, job_skills, skills_key, duplicate_index, batch_entries,
+                                         use_cache)
+    
+    def _parse_with_dedup(self, file_path: str, job_skills: List[str], skills_key: tuple,
+                          duplicate_index: DuplicateIndex, batch_entries: set,
+                          use_cache: bool = True) -> Dict[str, Any]:
+        """Parse one resume, or copy the features of an earlier exact/near duplicate"""
+        try:
+            document = self.load_document(file_path, use_cache)
+            text = document['text']
+            if not text:
+                return self._create_empty_candidate(file_path)
+            
+            file_name = Path(file_path).name
+            fingerprint = duplicate_index.fingerprint(text)
+            match = duplicate_index.find(fingerprint=fingerprint)
+            
+            # Exact duplicates are already searchable under the earlier file
+            if match is None or match['match_type'] != 'exact':
+                self.index_text(text, file_path, fingerprint[0])
+            
+            if match is None:
+                candidate = self.parse_text(text, file_path, job_skills, document['sections'],
+                                            document.get('timeline'))
+                entry_id = duplicate_index.add(file_name, dict(candidate), skills_key, fingerprint=fingerprint)
+                batch_entries.add(entry_id)
+                return candidate
+            
+            candidate = self._reuse_candidate_features(match, document, file_path, job_skills, skills_key)
+            candidate['content_hash'] = fingerprint[0]
+            metrics.increment('cache_hits')
+            
+            # The very same file seen in an earlier run is a cache hit, not a duplicate application
+            if match['match_type'] == 'exact' and match['file_name'] == file_name \
+                    and match['entry_id'] not in batch_entries:
+                batch_entries.add(match['entry_id'])
+                return candidate
+            
+            metrics.increment('duplicates')
+            candidate['is_duplicate'] = True
+            candidate['duplicate_of'] = match['file_name']
+            candidate['duplicate_type'] = match['match_type']
+            candidate['duplicate_similarity'] = match['similarity']
+            return candidate
+            
+        except Exception as e:
+            log_event(logger, 'resume_parse_failed', logging.ERROR, file=str(file_path), error=str(e))
+            return self._create_empty_candidate(file_path)
+    
+    def _reuse_candidate_features(self, match: Dict[str, Any], document: Dict[str, Any], file_path: str,
+                                  job_skills: List[str], skills_key: tuple) -> Dict[str, Any]:
+        """Copy an indexed candidate's features onto a new file"""
+        candidate = {
+            key: value for key, value in match['candidate'].items()
+            if key not in ('project_relevance', 'overall_score', 'source_path')
+        }
+        filename = Path(file_path).stem
+        candidate['name'] = filename.replace('_', ' ').replace('-', ' ').title()
+        candidate['file_name'] = Path(file_path).name
+        
+        # Skills depend on the job, so only they are recomputed for a different job
+        if match['skills_key'] != skills_key:
+            with metrics.timer('skill_matching'):
+                text = document['text']
+                skill_text = section_text(text, document['sections'], exclude=NON_SKILL_SECTIONS) or text
+                skill_matches = self.match_skills(skill_text, job_skills)
+            candidate['skills'] = list(skill_matches)
+            candidate['fuzzy_skills'] = [skill for skill, kind in skill_matches.items() if kind == FUZZY]
+            candidate['skill_match'] = weighted_skill_count(candidate['skills'], candidate['fuzzy_skills'])
+        return candidate
@@ -0,0 +1,702 @@
+import argparse
+import fcntl
+import heapq
+import logging
+import math
+import os
+import pickle
+import re
+import threading
+import time
+import uuid
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from itertools import accumulate
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+
+import numpy as np
+
+from backend.metrics import get_logger, log_event
+from config.settings import (
+    SEARCH_INDEX_DIR, SEARCH_BLOCK_SIZE, SEARCH_BM25_K1, SEARCH_BM25_B, SEARCH_TOP_K, SEARCH_MAX_SEGMENTS,
+    SEARCH_DENSE_POSTINGS, SEARCH_DECODED_TERMS
+)
+
+logger = get_logger('search_index')
+
+_TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+_PHRASE = re.compile(r'"([^"]*)"')
+MAX_TOKEN_LENGTH = 32
+EXHAUSTED = 1 << 62
+POSITION_BITS = 20  # phrase keys pack (doc, position) into one int64
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens; keeps '+' and '#' so c++ and c# survive"""
+    return _TOKEN.findall(text.lower())
+
+
+def _indexable(token: str) -> bool:
+    # Phone numbers, ids and other long digit runs only bloat the vocabulary
+    return len(token) <= MAX_TOKEN_LENGTH and not (token.isdigit() and len(token) > 4)
+
+
+def parse_query(query: str) -> Tuple[List[str], List[List[str]]]:
+    """Ranked terms and required "quoted phrases" of a query"""
+    phrases = [tokenize(phrase) for phrase in _PHRASE.findall(query)]
+    terms = tokenize(_PHRASE.sub(' ', query)) + [term for phrase in phrases for term in phrase]
+    return list(dict.fromkeys(term for term in terms if _indexable(term))), [p for p in phrases if p]
+
+
+def encode_varints(values: Iterable[int], out: bytearray = None) -> bytearray:
+    """LEB128: 7 bits per byte, high bit set on every byte but the last"""
+    out = bytearray() if out is None else out
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    return out
+
+
+def decode_varints(data, start: int = 0, end: int = None) -> List[int]:
+    values, value, shift = [], 0, 0
+    for byte in data[start:end]:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value, shift = 0, 0
+    return values
+
+
+def decode_varint_array(data) -> np.ndarray:
+    """Vectorised decode_varints for a whole buffer"""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(raw < 0x80)
+    if len(ends) == len(raw):
+        return raw.astype(np.int64)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    shifts = 7 * (np.arange(len(raw)) - np.repeat(starts, ends - starts + 1))
+    return np.add.reduceat((raw & 0x7F).astype(np.int64) << shifts, starts)
+
+
+def _restart_cumsum(gaps: np.ndarray, run_lengths: np.ndarray) -> np.ndarray:
+    """Cumulative sums of gaps that restart at every run"""
+    totals = np.cumsum(gaps)
+    run_starts = np.concatenate(([0], np.cumsum(run_lengths)[:-1]))
+    before = totals[run_starts] - gaps[run_starts]
+    return totals - np.repeat(before, run_lengths)
+
+
+class _Postings:
+    """Positional postings of one term: compressed blocks plus an open tail
+
+    Each sealed block stores doc-id gaps and term frequencies in ``docs`` and
+    the position gaps of every doc in ``positions``, both as varints. Block
+    metadata keeps the first doc, and the max term frequency and min doc
+    length needed for BM25 upper bounds, so blocks can be skipped undecoded.
+    """
+
+    __slots__ = ('docs', 'positions', 'blocks', 'last_docs', 'tail_docs', 'tail_tfs', 'tail_positions', 'df')
+
+    def __init__(self):
+        self.docs = None
+        self.positions = None
+        # (first_doc, max_tf, min_length, docs_start, docs_end, positions_start, positions_end)
+        self.blocks: List[tuple] = []
+        self.last_docs = array('Q')
+        self.tail_docs: List[int] = []
+        self.tail_tfs: List[int] = []
+        self.tail_positions: List[List[int]] = []
+        self.df = 0
+
+    def append(self, doc: int, positions: List[int]):
+        self.tail_docs.append(doc)
+        self.tail_tfs.append(len(positions))
+        self.tail_positions.append(positions)
+        self.df += 1
+
+    def seal(self, lengths: array):
+        """Compress the tail into a block"""
+        if not self.tail_docs:
+            return
+        if self.docs is None:
+            self.docs, self.positions = bytearray(), bytearray()
+        docs_start, positions_start = len(self.docs), len(self.positions)
+
+        values, previous = [], self.tail_docs[0]
+        for doc, tf in zip(self.tail_docs, self.tail_tfs):
+            values += (doc - previous, tf)
+            previous = doc
+        encode_varints(values, self.docs)
+        gaps = []
+        for positions in self.tail_positions:
+            previous = 0
+            for position in positions:
+                gaps.append(position - previous)
+                previous = position
+        encode_varints(gaps, self.positions)
+
+        self.blocks.append((
+            self.tail_docs[0], max(self.tail_tfs), min(lengths[doc] for doc in self.tail_docs),
+            docs_start, len(self.docs), positions_start, len(self.positions),
+        ))
+        self.last_docs.append(self.tail_docs[-1])
+        self.tail_docs, self.tail_tfs, self.tail_positions = [], [], []
+
+    def extend(self, other: '_Postings', offset: int):
+        """Append another (sealed) index's postings, shifting its doc ids by ``offset``"""
+        if self.docs is None:
+            self.docs, self.positions = bytearray(), bytearray()
+        docs_base, positions_base = len(self.docs), len(self.positions)
+        self.docs += other.docs
+        self.positions += other.positions
+        for first, max_tf, min_length, ds, de, ps, pe in other.blocks:
+            self.blocks.append((first + offset, max_tf, min_length, ds + docs_base, de + docs_base,
+                                ps + positions_base, pe + positions_base))
+        self.last_docs.extend(doc + offset for doc in other.last_docs)
+        self.df += other.df
+
+
+class _Cursor:
+    """Forward iterator over one term's postings that decodes a block only when it must"""
+
+    def __init__(self, postings: _Postings, lengths: array, idf: float = 0.0, weight=None):
+        self.postings = postings
+        self.idf = idf
+        self.meta = [block[:3] for block in postings.blocks]
+        self.last_docs = list(postings.last_docs)
+        if postings.tail_docs:
+            tail = postings.tail_docs
+            self.meta.append((tail[0], max(postings.tail_tfs), min(lengths[doc] for doc in tail)))
+            self.last_docs.append(tail[-1])
+        if weight is not None:
+            self.bounds = [idf * weight(max_tf, min_length) for _, max_tf, min_length in self.meta]
+            self.upper_bound = max(self.bounds)
+        self._enter(0)
+
+    def _enter(self, block: int):
+        self.block = block
+        self.index = 0
+        self._docs = self._tfs = None
+        self.doc = self.meta[block][0] if block < len(self.meta) else EXHAUSTED
+
+    def _decode(self):
+        if self._docs is not None:
+            return
+        postings = self.postings
+        if self.block == len(postings.blocks):
+            self._docs, self._tfs = postings.tail_docs, postings.tail_tfs
+            return
+        first, _, _, start, end, _, _ = postings.blocks[self.block]
+        values = decode_varints(postings.docs, start, end)
+        self._docs = list(accumulate(values[0::2], initial=first))[1:]
+        self._tfs = values[1::2]
+
+    def next(self):
+        self._decode()
+        self.index += 1
+        if self.index == len(self._docs):
+            self._enter(self.block + 1)
+        else:
+            self.doc = self._docs[self.index]
+
+    def advance(self, target: int):
+        """Move to the first doc >= target"""
+        if self.doc >= target:
+            return
+        if self.last_docs[self.block] < target:
+            self._enter(bisect_left(self.last_docs, target, self.block + 1))
+            if self.doc >= target:
+                return
+        self._decode()
+        self.index = bisect_left(self._docs, target, self.index)
+        self.doc = self._docs[self.index]
+
+    def tf(self) -> int:
+        self._decode()
+        return self._tfs[self.index]
+
+
+class SearchIndex:
+    """In-memory full-text index over resume text, ranked with BM25
+
+    Documents are appended incrementally; postings are doc-ordered, so each
+    term's list only grows at its tail, which is compressed into a block
+    every ``block_size`` docs. Selective queries run document-at-a-time
+    MaxScore with block-max skipping: once the top-k is full, terms and
+    blocks whose BM25 upper bound cannot lift a document over the k-th score
+    are not decoded. Queries over very common terms (more than
+    SEARCH_DENSE_POSTINGS postings) are scored with NumPy over whole decoded
+    lists instead, where pruning would save little. "Quoted phrases" are
+    required and checked against token positions. Texts already indexed
+    (same content hash) are not added again; copies brought in by a merge are
+    tombstoned, left out of the corpus statistics and dropped by ``purged``.
+    """
+
+    def __init__(self, block_size: int = SEARCH_BLOCK_SIZE, k1: float = SEARCH_BM25_K1, b: float = SEARCH_BM25_B):
+        self.block_size = block_size
+        self.k1 = k1
+        self.b = b
+        self.terms: Dict[str, _Postings] = {}
+        self.documents: List[Dict[str, Any]] = []
+        self.lengths = array('I')
+        self.total_length = 0
+        self.hashes: Set[str] = set()
+        self.deleted: Set[int] = set()
+        self.deleted_length = 0
+        self._init_runtime()
+
+    def _init_runtime(self):
+        self._lock = threading.RLock()
+        self._decoded: OrderedDict = OrderedDict()
+        self._length_array = None
+
+    def __len__(self):
+        return len(self.documents) - len(self.deleted)
+
+    def __getstate__(self):
+        return {k: v for k, v in self.__dict__.items() if k not in ('_lock', '_decoded', '_length_array')}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if 'deleted_length' not in state:
+            # Segments written before tombstones were left out of avgdl
+            self.deleted_length = sum(self.lengths[doc] for doc in self.deleted)
+        self._init_runtime()
+
+    def add(self, text: str, **fields) -> Optional[int]:
+        """Index a document's text with the fields returned on a hit; None if already indexed"""
+        tokens = tokenize(text)
+        term_positions: Dict[str, List[int]] = {}
+        for position, token in enumerate(tokens):
+            term_positions.setdefault(token, []).append(position)
+
+        with self._lock:
+            content_hash = fields.get('content_hash')
+            if content_hash:
+                if content_hash in self.hashes:
+                    return None
+                self.hashes.add(content_hash)
+            doc = len(self.documents)
+            self.documents.append(fields)
+            self.lengths.append(len(tokens))
+            self.total_length += len(tokens)
+            for term, positions in term_positions.items():
+                if not _indexable(term):
+                    continue
+                postings = self.terms.get(term)
+                if postings is None:
+                    postings = self.terms[term] = _Postings()
+                postings.append(doc, positions)
+                if len(postings.tail_docs) >= self.block_size:
+                    postings.seal(self.lengths)
+        return doc
+
+    def seal(self):
+        """Compress every open tail (before saving or merging)"""
+        with self._lock:
+            for postings in self.terms.values():
+                postings.seal(self.lengths)
+
+    def merge(self, other: 'SearchIndex'):
+        """Append another index's documents; texts indexed in both are tombstoned in the copy"""
+        with self._lock, other._lock:
+            self.seal()
+            other.seal()
+            offset = len(self.documents)
+            for term, postings in other.terms.items():
+                mine = self.terms.get(term)
+                if mine is None:
+                    mine = self.terms[term] = _Postings()
+                mine.extend(postings, offset)
+            for doc, fields in enumerate(other.documents):
+                content_hash = fields.get('content_hash')
+                if doc in other.deleted or (content_hash and content_hash in self.hashes):
+                    self.deleted.add(doc + offset)
+                    self.deleted_length += other.lengths[doc]
+                elif content_hash:
+                    self.hashes.add(content_hash)
+            self.documents.extend(other.documents)
+            self.lengths.extend(other.lengths)
+            self.total_length += other.total_length
+
+    def purged(self) -> 'SearchIndex':
+        """A copy without tombstoned documents: their fields, lengths and postings are dropped"""
+        with self._lock:
+            self.seal()
+            clean = SearchIndex(self.block_size, self.k1, self.b)
+            live = [doc for doc in range(len(self.documents)) if doc not in self.deleted]
+            new_ids = np.full(len(self.documents), -1, dtype=np.int64)
+            new_ids[live] = np.arange(len(live))
+            for doc in live:
+                clean.documents.append(self.documents[doc])
+                clean.lengths.append(self.lengths[doc])
+            clean.total_length = sum(clean.lengths)
+            clean.hashes = {fields['content_hash'] for fields in clean.documents if fields.get('content_hash')}
+            for term in self.terms:
+                docs, tfs, positions = self._term_arrays(term, with_positions=True)
+                ends = np.cumsum(tfs)
+                postings = None
+                for doc, start, end in zip(new_ids[docs].tolist(), (ends - tfs).tolist(), ends.tolist()):
+                    if doc < 0:
+                        continue
+                    if postings is None:
+                        postings = clean.terms[term] = _Postings()
+                    postings.append(doc, positions[start:end].tolist())
+                    if len(postings.tail_docs) >= clean.block_size:
+                        postings.seal(clean.lengths)
+            clean.seal()
+        return clean
+
+    def search(self, query: str, top_k: int = SEARCH_TOP_K) -> List[Dict[str, Any]]:
+        """Best ``top_k`` documents for a free-text query, with their BM25 score and matched terms"""
+        terms, phrases = parse_query(query)
+        with self._lock:
+            if not terms or not len(self):
+                return []
+            if any(term not in self.terms for phrase in phrases for term in phrase):
+                return []
+            terms = [term for term in terms if term in self.terms]
+
+            # Tombstoned copies are not part of the corpus
+            count = len(self)
+            average_length = (self.total_length - self.deleted_length) / count or 1.0
+            k1, b = self.k1, self.b
+
+            def weight(tf, length):
+                return tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / average_length))
+
+            idfs = {}
+            for term in terms:
+                # Postings of tombstones still count in df until compaction purges them
+                df = min(self.terms[term].df, count)
+                idfs[term] = math.log(1 + (count - df + 0.5) / (df + 0.5))
+
+            if phrases or sum(self.terms[term].df for term in terms) > SEARCH_DENSE_POSTINGS:
+                hits = self._dense_top_k(terms, phrases, idfs, weight, top_k)
+            else:
+                cursors = [_Cursor(self.terms[term], self.lengths, idfs[term], weight) for term in terms]
+                hits = self._max_score(cursors, weight, top_k)
+
+            return [
+                dict(self.documents[doc], doc_id=doc, score=round(score, 4),
+                     matched_terms=self._matched_terms(doc, terms))
+                for score, doc in hits
+            ]
+
+    def _max_score(self, cursors: List[_Cursor], weight, top_k: int) -> List[Tuple[float, int]]:
+        lengths, deleted = self.lengths, self.deleted
+        # Ascending upper bounds: a prefix of terms that cannot reach the threshold on their own is
+        # "non-essential" and only probed for documents found through the other terms
+        cursors.sort(key=lambda c: c.upper_bound)
+        prefix = list(accumulate(c.upper_bound for c in cursors))
+        heap: List[Tuple[float, int]] = []
+        threshold = 0.0
+        first_essential = 0
+
+        while first_essential < len(cursors):
+            essential = cursors[first_essential:]
+            doc = min(c.doc for c in essential)
+            if doc == EXHAUSTED:
+                break
+            on_doc = [c for c in essential if c.doc == doc]
+            non_essential_bound = prefix[first_essential - 1] if first_essential else 0.0
+
+            # Block-max skip: up to the end of these blocks no document can beat the threshold
+            if len(heap) == top_k and non_essential_bound + sum(c.bounds[c.block] for c in on_doc) <= threshold:
+                skip_to = min([c.last_docs[c.block] + 1 for c in on_doc]
+                              + [c.doc for c in essential if c.doc > doc])
+                for c in on_doc:
+                    c.advance(skip_to)
+                continue
+
+            if doc not in deleted:
+                length = lengths[doc]
+                score = sum(c.idf * weight(c.tf(), length) for c in on_doc)
+                for i in range(first_essential - 1, -1, -1):
+                    if len(heap) == top_k and score + prefix[i] <= threshold:
+                        break
+                    c = cursors[i]
+                    c.advance(doc)
+                    if c.doc == doc:
+                        score += c.idf * weight(c.tf(), length)
+
+                if len(heap) < top_k:
+                    heapq.heappush(heap, (score, -doc))
+                elif score > threshold:
+                    heapq.heapreplace(heap, (score, -doc))
+                if len(heap) == top_k:
+                    threshold = heap[0][0]
+                    while first_essential < len(cursors) and prefix[first_essential] <= threshold:
+                        first_essential += 1
+
+            for c in on_doc:
+                c.next()
+
+        return sorted(((score, -neg_doc) for score, neg_doc in heap), key=lambda hit: (-hit[0], hit[1]))
+
+    def _dense_top_k(self, terms: List[str], phrases: List[List[str]], idfs: Dict[str, float],
+                     weight, top_k: int) -> List[Tuple[float, int]]:
+        """BM25 accumulated over whole decoded postings lists, then an argpartition for the top-k"""
+        if self._length_array is None or len(self._length_array) != len(self.lengths):
+            self._length_array = np.array(self.lengths, dtype=np.float64)
+        scores = np.zeros(len(self.documents))
+        for term in terms:
+            docs, tfs = self._term_arrays(term)
+            scores[docs] += idfs[term] * weight(tfs, self._length_array[docs])
+
+        if phrases:
+            allowed = np.zeros(len(scores), dtype=bool)
+            allowed[self._phrase_docs(phrases[0])] = True
+            for phrase in phrases[1:]:
+                matches = np.zeros(len(scores), dtype=bool)
+                matches[self._phrase_docs(phrase)] = True
+                allowed &= matches
+            scores[~allowed] = 0.0
+        if self.deleted:
+            scores[list(self.deleted)] = 0.0
+
+        matching = np.flatnonzero(scores > 0)
+        if len(matching) > top_k:
+            matching = matching[np.argpartition(-scores[matching], top_k - 1)[:top_k]]
+            # Documents tied with the k-th score are kept by doc id, like the MaxScore path
+            kth = scores[matching].min()
+            tied = np.flatnonzero(scores == kth)
+            matching = np.union1d(matching[scores[matching] > kth], tied)
+        order = np.lexsort((matching, -scores[matching]))[:top_k]
+        return [(float(scores[doc]), int(doc)) for doc in matching[order]]
+
+    def _term_arrays(self, term: str, with_positions: bool = False) -> Tuple[np.ndarray, ...]:
+        """Doc ids and term frequencies (and flat positions) of a whole postings list
+
+        Decoded with NumPy in a few vectorised passes; the most recently used
+        terms are cached until their postings grow.
+        """
+        postings = self.terms[term]
+        version = (len(postings.blocks), len(postings.tail_docs))
+        cached = self._decoded.get(term)
+        if cached is not None and cached[0] == version and (len(cached[1]) == 3 or not with_positions):
+            self._decoded.move_to_end(term)
+            return cached[1] if with_positions else cached[1][:2]
+
+        firsts = np.array([block[0] for block in postings.blocks], dtype=np.int64)
+        if len(firsts):
+            values = decode_varint_array(postings.docs)
+            gaps, tfs = values[0::2], values[1::2]
+            # Pairs per block, from each block's byte range
+            ends = np.flatnonzero(np.frombuffer(postings.docs, dtype=np.uint8) < 0x80)
+            block_starts = np.searchsorted(ends, [block[3] for block in postings.blocks]) // 2
+            counts = np.diff(np.append(block_starts, len(gaps)))
+            docs = np.repeat(firsts, counts) + _restart_cumsum(gaps, counts)
+        else:
+            docs = tfs = np.zeros(0, dtype=np.int64)
+        docs = np.concatenate((docs, np.array(postings.tail_docs, dtype=np.int64)))
+        tfs = np.concatenate((tfs, np.array(postings.tail_tfs, dtype=np.int64)))
+        arrays = (docs, tfs)
+
+        if with_positions:
+            sealed = int(tfs[:len(tfs) - len(postings.tail_tfs)].sum())
+            if sealed:
+                position_gaps = decode_varint_array(postings.positions)
+                positions = _restart_cumsum(position_gaps, tfs[:len(tfs) - len(postings.tail_tfs)])
+            else:
+                positions = np.zeros(0, dtype=np.int64)
+            tail_positions = [position for doc_positions in postings.tail_positions for position in doc_positions]
+            arrays += (np.concatenate((positions, np.array(tail_positions, dtype=np.int64))),)
+
+        self._decoded[term] = (version, arrays)
+        self._decoded.move_to_end(term)
+        while len(self._decoded) > SEARCH_DECODED_TERMS:
+            self._decoded.popitem(last=False)
+        return arrays
+
+    def _phrase_docs(self, phrase: List[str]) -> np.ndarray:
+        """Docs where the phrase's terms occur at consecutive positions"""
+        starts = None
+        for offset, term in enumerate(phrase):
+            docs, tfs, positions = self._term_arrays(term, with_positions=True)
+            # One key per occurrence, shifted back to where the phrase would start; already sorted
+            keys = ((np.repeat(docs, tfs) << POSITION_BITS) | positions) - offset
+            if starts is None:
+                starts = keys
+            elif len(keys):
+                found = np.searchsorted(keys, starts).clip(max=len(keys) - 1)
+                starts = starts[keys[found] == starts]
+            else:
+                return keys
+        return np.unique(starts >> POSITION_BITS)
+
+    def _matched_terms(self, doc: int, terms: List[str]) -> List[str]:
+        matched = []
+        for term in terms:
+            cursor = _Cursor(self.terms[term], self.lengths)
+            cursor.advance(doc)
+            if cursor.doc == doc:
+                matched.append(term)
+        return matched
+
+    def save(self, path: Path):
+        self.seal()
+        tmp_path = Path(path).with_suffix('.tmp')
+        with self._lock, open(tmp_path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> 'SearchIndex':
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+class SearchStore:
+    """The persistent search index: immutable segment files in one directory
+
+    Writers (worker processes, batch jobs) each add a new segment, so they
+    never rewrite or lock what others wrote. Readers merge segments they
+    have not seen yet into one in-memory index. Past SEARCH_MAX_SEGMENTS
+    the segments are compacted into one, off the write path: in a background
+    thread of a long-running writer, or by the 'compact' command. Readers
+    notice and reload.
+    """
+
+    def __init__(self, directory: Path = SEARCH_INDEX_DIR, max_segments: int = SEARCH_MAX_SEGMENTS):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_segments = max_segments
+        self.index = SearchIndex()
+        self.loaded: Set[str] = set()
+        self._lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+
+    def segment_names(self) -> List[str]:
+        return sorted(path.name for path in self.directory.glob('*.seg'))
+
+    def write(self, index: SearchIndex) -> Optional[Path]:
+        """Persist an index as a new segment (nothing is written for an empty one)"""
+        if not len(index):
+            return None
+        path = self.directory / f'{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.seg'
+        index.save(path)
+        log_event(logger, 'search_segment_written', logging.INFO, segment=path.name, documents=len(index))
+        return path
+
+    def needs_compaction(self) -> bool:
+        return len(self.segment_names()) > self.max_segments
+
+    def compact_in_background(self) -> Optional[threading.Thread]:
+        """Start compacting in a daemon thread if there are too many segments and none is running"""
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return None
+            if not self.needs_compaction():
+                return None
+            self._compactor = threading.Thread(target=self.compact, name='search-compactor', daemon=True)
+            self._compactor.start()
+            return self._compactor
+
+    def refresh(self) -> SearchIndex:
+        """The merged index, after loading any segments written since the last call"""
+        with self._lock:
+            while True:
+                names = self.segment_names()
+                if not self.loaded.issubset(names):
+                    # Segments were compacted away: start over from the current set
+                    self.index, self.loaded = SearchIndex(), set()
+                try:
+                    for name in names:
+                        if name not in self.loaded:
+                            self.index.merge(SearchIndex.load(self.directory / name))
+                            self.loaded.add(name)
+                    return self.index
+                except FileNotFoundError:
+                    continue
+
+    def compact(self) -> bool:
+        """Merge every segment into one; False if another process is already compacting"""
+        with open(self.directory / '.compact.lock', 'w') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            names = self.segment_names()
+            if len(names) < 2:
+                return True
+            merged = SearchIndex()
+            for name in names:
+                merged.merge(SearchIndex.load(self.directory / name))
+            if merged.deleted:
+                merged = merged.purged()
+            merged.save(self.directory / f'{names[-1][:-4]}-compacted.seg')
+            for name in names:
+                (self.directory / name).unlink(missing_ok=True)
+        log_event(logger, 'search_segments_compacted', logging.INFO, segments=len(names), documents=len(merged))
+        return True
+
+
+def index_files(file_paths: List[str], store: SearchStore = None) -> int:
+    """Extract and index resume files as one new segment; returns the number of new documents"""
+    from backend.resume_parser import ResumeParser
+
+    index = SearchIndex()
+    parser = ResumeParser(search_index=index)
+    for file_path in file_paths:
+        text = parser.load_document(file_path)['text']
+        if text:
+            parser.index_text(text, file_path)
+    (store or SearchStore()).write(index)
+    return len(index)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_search_store() -> SearchStore:
+    """The server process's shared store, created on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SearchStore()
+    return _store
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Full-text resume search')
+    parser.add_argument('--dir', default=str(SEARCH_INDEX_DIR))
+    commands = parser.add_subparsers(dest='command', required=True)
+    index = commands.add_parser('index', help='Index resume files or directories')
+    index.add_argument('paths', nargs='+')
+    search = commands.add_parser('search', help='Run a query')
+    search.add_argument('query')
+    search.add_argument('--top', type=int, default=SEARCH_TOP_K)
+    commands.add_parser('compact', help='Merge all segments into one')
+    commands.add_parser('info', help='Show segment and document counts')
+    args = parser.parse_args()
+
+    store = SearchStore(Path(args.dir))
+    if args.command == 'index':
+        from backend.job_queue import expand_resume_paths
+        print(f'Indexed {index_files(expand_resume_paths(args.paths), store)} resumes')
+    elif args.command == 'search':
+        index = store.refresh()
+        start = time.perf_counter()
+        hits = index.search(args.query, args.top)
+        print(f'{len(hits)} results in {(time.perf_counter() - start) * 1000:.1f} ms')
+        for rank, hit in enumerate(hits, 1):
+            print(f"{rank:>3}. {hit['score']:>7.3f}  {hit.get('name', '')}  ({hit.get('file_name', '')})")
+    elif args.command == 'compact':
+        store.compact()
+        print(f'{len(store.segment_names())} segment(s)')
+    else:
+        index = store.refresh()
+        print(f'{len(store.segment_names())} segment(s), {len(index)} documents, {len(index.terms)} terms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import re
+from typing import List, Iterable, Optional
+
+from backend.data_models import ResumeSection
+
+# Canonical section label -> headings that introduce it
+SECTION_HEADINGS = {
+    'summary': ['summary', 'profile', 'professional summary', 'career summary', 'objective',
+                'career objective', 'about me', 'about'],
+    'experience': ['experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history', 'internships',
+                   'internship', 'internship experience', 'relevant experience'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects',
+                 'project experience', 'side projects', 'selected projects', 'project work'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core skills', 'core competencies',
+               'technologies', 'tech stack', 'tools', 'skills and tools', 'technical expertise',
+               # On a resume a bare 'Languages' heading usually lists programming languages
+               'languages', 'programming languages', 'languages and frameworks'],
+    'education': ['education', 'academic background', 'academics', 'qualifications',
+                  'educational qualifications', 'education and training'],
+    'certifications': ['certifications', 'certificates', 'licenses and certifications', 'courses'],
+    'achievements': ['achievements', 'awards', 'honors', 'honours', 'accomplishments'],
+    'interests': ['interests', 'hobbies', 'hobbies and interests', 'spoken languages', 'foreign languages',
+                  'language skills', 'references'],
+}
+
+# Text before the first recognised heading (name, contact line, ...)
+HEADER_LABEL = 'header'
+
+_HEADING_STRIP = re.compile(r'^[\W_]+|[\W_]+$')
+_HEADING_SEPARATORS = re.compile(r'(?:\s|&|/|,|\band\b)+')
+MAX_HEADING_LENGTH = 40
+
+
+def _normalize_heading(line: str) -> str:
+    """'Skills & Tools:' and 'skills and tools' both become 'skills tools'"""
+    return _HEADING_SEPARATORS.sub(' ', _HEADING_STRIP.sub('', line.lower())).strip()
+
+
+_HEADING_LOOKUP = {
+    _normalize_heading(heading): label for label, headings in SECTION_HEADINGS.items() for heading in headings
+}
+
+
+def heading_label(line: str) -> Optional[str]:
+    """Section label if the line is a section heading, else None"""
+    if not line or len(line) > MAX_HEADING_LENGTH:
+        return None
+    return _HEADING_LOOKUP.get(_normalize_heading(line))
+
+
+def segment_sections(text: str) -> List[ResumeSection]:
+    """Split resume text into labelled sections in one pass over its lines"""
+    sections = []
+    label, heading, start_line, start = HEADER_LABEL, '', 0, 0
+    offset = 0
+    for line_number, line in enumerate(text.split('\n')):
+        new_label = heading_label(line.strip())
+        if new_label is not None:
+            if offset > start:
+                sections.append(ResumeSection(label, heading, start_line, line_number, start, offset))
+            label, heading, start_line, start = new_label, line.strip(), line_number, offset
+        offset += len(line) + 1
+    end = len(text)
+    if end > start:
+        sections.append(ResumeSection(label, heading, start_line, text.count('\n') + 1, start, end))
+    return sections
+
+
+def section_text(text: str, sections: List[ResumeSection], labels: Iterable[str] = None,
+                 exclude: Iterable[str] = ()) -> Optional[str]:
+    """Concatenated text of the sections with the given labels
+
+    Returns None when none of the requested labels is present, so callers can
+    fall back to the whole document.
+    """
+    labels = set(labels) if labels is not None else None
+    exclude = set(exclude)
+    spans = [
+        text[section.start:section.end] for section in sections
+        if (labels is None or section.label in labels) and section.label not in exclude
+    ]
+    if not spans:
+        return None
+    return '\n'.join(spans)
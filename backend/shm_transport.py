@@ -0,0 +1,229 @@
+"""Hand extracted text and feature arrays from worker processes to the parent without pickling them
+
+A worker packs a record's fields into one ``multiprocessing.shared_memory``
+segment and returns only a small ``SharedPayload`` handle (segment name plus
+each field's offset, length and dtype). The parent opens it with
+``read_payload`` and reads the fields in place: text is decoded straight
+from a ``memoryview`` and arrays are NumPy views over the segment.
+
+Lifetime: the worker gives up ownership as soon as the segment is written
+(it is unregistered from the worker's resource tracker, so a recycled
+worker cannot unlink it under the parent). The parent unlinks it when the
+``read_payload`` block exits, or with ``discard`` if the result is dropped.
+Segments still open when the parent exits are unlinked by an atexit hook.
+Names carry the owning parent's pid, so ``sweep_orphans`` can remove
+segments whose owner crashed.
+
+Payloads smaller than SHM_MIN_BYTES are carried inline in the handle,
+because for them a segment costs more than pickling.
+"""
+
+import atexit
+import os
+import secrets
+import threading
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional, Tuple, Iterator
+
+import numpy as np
+
+from backend.metrics import get_logger, log_event
+from config.settings import SHM_TRANSPORT_ENABLED, SHM_MIN_BYTES
+
+logger = get_logger('shm_transport')
+
+SEGMENT_PREFIX = 'hrshm'
+SHM_DIR = '/dev/shm'
+_ALIGNMENT = 8  # arrays start on 8-byte boundaries so NumPy views are aligned
+
+
+class SharedPayload:
+    """Picklable handle to a record's fields: a segment name, or the bytes themselves when inline
+
+    ``fields`` maps a field name to (kind, offset, length, dtype), where kind
+    is 'text', 'bytes' or 'array' and length counts bytes, or array items.
+    """
+
+    __slots__ = ('name', 'size', 'fields', 'data')
+
+    def __init__(self, name: Optional[str], size: int, fields: Dict[str, Tuple[str, int, int, Optional[str]]],
+                 data: bytes = None):
+        self.name = name
+        self.size = size
+        self.fields = fields
+        self.data = data
+
+    def __getstate__(self):
+        return self.name, self.size, self.fields, self.data
+
+    def __setstate__(self, state):
+        self.name, self.size, self.fields, self.data = state
+
+    @property
+    def shared(self) -> bool:
+        return self.name is not None
+
+
+def write_payload(**fields) -> SharedPayload:
+    """Pack str, bytes and NumPy array fields into one payload (worker side)"""
+    encoded, layout, size = [], {}, 0
+    for field, value in fields.items():
+        if isinstance(value, str):
+            kind, raw, dtype, length = 'text', value.encode('utf-8'), None, None
+        elif isinstance(value, np.ndarray):
+            raw = np.ascontiguousarray(value)
+            kind, dtype, length = 'array', raw.dtype.str, raw.size
+            raw = raw.view(np.uint8).reshape(-1).data
+        else:
+            kind, raw, dtype, length = 'bytes', bytes(value), None, None
+        size += -size % _ALIGNMENT
+        layout[field] = (kind, size, length if length is not None else len(raw), dtype)
+        encoded.append((size, raw))
+        size += len(raw)
+
+    if not SHM_TRANSPORT_ENABLED or size < SHM_MIN_BYTES:
+        buffer = bytearray(size)
+        for offset, raw in encoded:
+            buffer[offset:offset + len(raw)] = raw
+        return SharedPayload(None, size, layout, bytes(buffer))
+
+    name = f'{SEGMENT_PREFIX}_{os.getppid()}_{secrets.token_hex(6)}'
+    segment = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+    try:
+        for offset, raw in encoded:
+            segment.buf[offset:offset + len(raw)] = raw
+    except BaseException:
+        segment.close()
+        segment.unlink()
+        raise
+    segment.close()
+    # The parent owns the segment from here on
+    resource_tracker.unregister(segment._name, 'shared_memory')
+    return SharedPayload(name, size, layout)
+
+
+class PayloadReader:
+    """Fields of an open payload, valid until its read_payload block exits"""
+
+    def __init__(self, payload: SharedPayload, buffer: memoryview):
+        self.payload = payload
+        self.buffer = buffer
+
+    def view(self, field: str) -> memoryview:
+        """The field's raw bytes, in place"""
+        _, offset, length, _ = self.payload.fields[field]
+        return self.buffer[offset:offset + length]
+
+    def text(self, field: str) -> str:
+        """A text field, decoded directly from the shared buffer"""
+        return str(self.view(field), 'utf-8')
+
+    def array(self, field: str) -> np.ndarray:
+        """An array field as a read-only NumPy view over the shared buffer; copy it to keep it"""
+        _, offset, length, dtype = self.payload.fields[field]
+        array = np.frombuffer(self.buffer, dtype=np.dtype(dtype), count=length, offset=offset)
+        array.flags.writeable = False
+        return array
+
+
+class _OpenSegments:
+    """Segments the parent has received but not yet unlinked"""
+
+    def __init__(self):
+        self.names = set()
+        self._lock = threading.Lock()
+
+    def add(self, name: str):
+        with self._lock:
+            self.names.add(name)
+
+    def unlink(self, name: str):
+        with self._lock:
+            self.names.discard(name)
+        _unlink(name)
+
+    def unlink_all(self):
+        with self._lock:
+            names, self.names = self.names, set()
+        for name in names:
+            _unlink(name)
+
+
+_open_segments = _OpenSegments()
+atexit.register(_open_segments.unlink_all)
+
+
+@contextmanager
+def read_payload(payload: SharedPayload) -> Iterator[PayloadReader]:
+    """Open a payload for reading (parent side); a shared segment is unlinked on exit
+
+    Views and arrays taken from the reader must not outlive the block.
+    """
+    if not payload.shared:
+        yield PayloadReader(payload, memoryview(payload.data))
+        return
+
+    _open_segments.add(payload.name)
+    try:
+        segment = shared_memory.SharedMemory(name=payload.name)
+    except FileNotFoundError:
+        _open_segments.unlink(payload.name)
+        raise
+    buffer = segment.buf[:payload.size]
+    try:
+        yield PayloadReader(payload, buffer)
+    finally:
+        buffer.release()
+        try:
+            segment.close()
+        except BufferError:
+            # A NumPy view escaped the block; the mapping goes away with it
+            log_event(logger, 'shm_view_outlived_payload', name=payload.name)
+        segment.unlink()
+        _open_segments.unlink(payload.name)
+
+
+def discard(payload: SharedPayload):
+    """Free a payload that will not be read (e.g. its task's result was dropped)"""
+    if payload is not None and payload.shared:
+        _open_segments.unlink(payload.name)
+
+
+def _unlink(name: str):
+    try:
+        segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    segment.close()
+    segment.unlink()
+
+
+def sweep_orphans() -> int:
+    """Unlink segments left behind by parent processes that no longer exist"""
+    try:
+        names = os.listdir(SHM_DIR)
+    except OSError:
+        return 0
+    removed = 0
+    for name in names:
+        parts = name.split('_')
+        if len(parts) != 3 or parts[0] != SEGMENT_PREFIX or not parts[1].isdigit():
+            continue
+        if _process_alive(int(parts[1])):
+            continue
+        _unlink(name)
+        removed += 1
+    if removed:
+        log_event(logger, 'shm_orphans_removed', count=removed)
+    return removed
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,248 @@
+import json
+import os
+import re
+import threading
+import time
+from typing import List, Dict, Any, Optional, Set, Iterable
+
+from backend.snapshot import load_snapshot
+from config.settings import SKILL_TAXONOMY_PATH, TAXONOMY_RELOAD_INTERVAL
+
+
+def build_trie_pattern(words: List[str]) -> str:
+    """Compile words into a prefix-factored regex alternation
+
+    ``['rest', 'rest api', 'restful']`` becomes ``rest(?:\\ api|ful)?``. The
+    regex engine then walks the shared prefixes once per text position, so
+    matching cost hardly grows with the number of words, and greedy optional
+    groups make the longest surface form win.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def emit(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            return '(?:' + body + ')?'
+        return body
+
+    return emit(trie)
+
+
+def _bounded_spans(surface: str):
+    """Substrings of a surface form that would match on their own with (?<!\\w)/(?!\\w)"""
+    starts = [i for i in range(len(surface)) if i == 0 or not _is_word(surface[i - 1])]
+    ends = [i for i in range(1, len(surface) + 1) if i == len(surface) or not _is_word(surface[i])]
+    for start in starts:
+        for end in ends:
+            if end > start:
+                yield surface[start:end]
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class SkillTaxonomy:
+    """Canonical skills, aliases and parents compiled into one matching automaton
+
+    Loaded from a JSON file with ``skills`` entries (``skill``, ``category``,
+    optional ``aliases``, ``parent`` and ``title_only``), ``title_skills``
+    groups that enable title-only skills for matching job titles, and
+    ``fuzzy_ignore`` words that must never be read as misspelled skills.
+    """
+
+    def __init__(self, data: Dict[str, Any], source_mtime: float = 0.0):
+        self.version = data.get('version', 1)
+        self.source_mtime = source_mtime
+        self.skills: List[str] = []             # canonical id -> canonical name
+        self.ids: Dict[str, int] = {}            # canonical name -> id
+        self.categories: List[str] = []
+        self.parents: List[Optional[str]] = []
+        self.title_only: Set[str] = set()
+        self.surface_ids: Dict[str, int] = {}    # lowercased surface form -> canonical id
+
+        for entry in data['skills']:
+            name = entry['skill'].lower()
+            skill_id = len(self.skills)
+            self.skills.append(name)
+            self.ids[name] = skill_id
+            self.categories.append(entry.get('category', 'other'))
+            self.parents.append(entry.get('parent'))
+            if entry.get('title_only'):
+                self.title_only.add(name)
+            for surface in [name] + [alias.lower() for alias in entry.get('aliases', [])]:
+                self.surface_ids.setdefault(surface, skill_id)
+
+        self.title_groups = [
+            ([keyword.lower() for keyword in group['title_keywords']], [s.lower() for s in group['skills']])
+            for group in data.get('title_skills', [])
+        ]
+        self.default_skills = [name for name in self.skills if name not in self.title_only]
+        self.fuzzy_ignore: Set[str] = {word.lower() for word in data.get('fuzzy_ignore', [])}
+
+        surfaces = sorted(self.surface_ids)
+        self.pattern = re.compile(r'(?<!\w)(' + build_trie_pattern(surfaces) + r')(?!\w)')
+
+        # Shorter skills contained in a longer surface form ('rest api' -> 'rest', 'api').
+        # The automaton reports the longest match only, so these are credited too.
+        self.contained: Dict[str, List[int]] = {}
+        for surface in surfaces:
+            inner = {
+                self.surface_ids[span] for span in _bounded_spans(surface)
+                if span != surface and span in self.surface_ids
+            }
+            if inner:
+                self.contained[surface] = sorted(inner)
+
+    @classmethod
+    def from_file(cls, path: str = SKILL_TAXONOMY_PATH) -> 'SkillTaxonomy':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data, os.path.getmtime(path))
+    
+    def to_tables(self) -> Dict[str, Any]:
+        """Compiled tables as plain (marshal-able) data, for the startup snapshot"""
+        return {
+            'version': self.version,
+            'skills': self.skills,
+            'categories': self.categories,
+            'parents': self.parents,
+            'title_only': sorted(self.title_only),
+            'surface_ids': self.surface_ids,
+            'title_groups': [[keywords, skills] for keywords, skills in self.title_groups],
+            'default_skills': self.default_skills,
+            'pattern': self.pattern.pattern,
+            'contained': self.contained,
+            'fuzzy_ignore': sorted(self.fuzzy_ignore),
+        }
+    
+    @classmethod
+    def from_tables(cls, tables: Dict[str, Any], source_mtime: float = 0.0) -> 'SkillTaxonomy':
+        """Rebuild from to_tables() output without recompiling the trie"""
+        taxonomy = cls.__new__(cls)
+        taxonomy.version = tables['version']
+        taxonomy.source_mtime = source_mtime
+        taxonomy.skills = tables['skills']
+        taxonomy.ids = {name: skill_id for skill_id, name in enumerate(taxonomy.skills)}
+        taxonomy.categories = tables['categories']
+        taxonomy.parents = tables['parents']
+        taxonomy.title_only = set(tables['title_only'])
+        taxonomy.surface_ids = tables['surface_ids']
+        taxonomy.title_groups = [(keywords, skills) for keywords, skills in tables['title_groups']]
+        taxonomy.default_skills = tables['default_skills']
+        taxonomy.pattern = re.compile(tables['pattern'])
+        taxonomy.contained = tables['contained']
+        taxonomy.fuzzy_ignore = set(tables['fuzzy_ignore'])
+        return taxonomy
+
+    def __len__(self):
+        return len(self.skills)
+
+    def match_ids(self, text: str) -> Set[int]:
+        """Canonical ids of every skill mentioned in the text"""
+        found = set()
+        for match in self.pattern.finditer(text.lower()):
+            surface = match.group(1)
+            found.add(self.surface_ids[surface])
+            found.update(self.contained.get(surface, ()))
+        return found
+
+    def find_skills(self, text: str, enabled_title_only: Set[str] = frozenset(),
+                    include_title_only: bool = False) -> List[str]:
+        """Canonical skill names found in the text, in taxonomy order
+
+        Title-only skills are dropped unless enabled explicitly (or all of
+        them are included).
+        """
+        return self.skill_names(self.match_ids(text), enabled_title_only, include_title_only)
+
+    def skill_names(self, skill_ids: Iterable[int], enabled_title_only: Set[str] = frozenset(),
+                    include_title_only: bool = False) -> List[str]:
+        """Canonical names of skill ids in taxonomy order, filtered as in find_skills"""
+        return [
+            self.skills[skill_id] for skill_id in sorted(skill_ids)
+            if include_title_only or self.skills[skill_id] not in self.title_only
+            or self.skills[skill_id] in enabled_title_only
+        ]
+
+    def title_skills(self, job_title: str = None) -> Set[str]:
+        """Title-only skills enabled by a job title (first matching group wins)"""
+        if not job_title:
+            return set()
+        title_lower = job_title.lower()
+        for keywords, skills in self.title_groups:
+            if any(keyword in title_lower for keyword in keywords):
+                return set(skills)
+        return set()
+
+    def canonicalize(self, skill: str) -> Optional[str]:
+        """Canonical name for a skill or alias, or None if unknown"""
+        skill_id = self.surface_ids.get(skill.lower().strip())
+        return self.skills[skill_id] if skill_id is not None else None
+
+    def category(self, skill: str) -> Optional[str]:
+        canonical = self.canonicalize(skill)
+        return self.categories[self.ids[canonical]] if canonical else None
+
+    def ancestors(self, skill: str) -> List[str]:
+        """Parent skills from nearest to farthest, followed by the category"""
+        canonical = self.canonicalize(skill)
+        if canonical is None:
+            return []
+        chain, seen = [], {canonical}
+        parent = self.parents[self.ids[canonical]]
+        while parent and parent not in seen and parent in self.ids:
+            chain.append(parent)
+            seen.add(parent)
+            parent = self.parents[self.ids[parent]]
+        return chain + [self.categories[self.ids[canonical]]]
+
+
+_taxonomies: Dict[str, SkillTaxonomy] = {}
+_checked_at: Dict[str, float] = {}
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy(path: str = SKILL_TAXONOMY_PATH) -> SkillTaxonomy:
+    """Shared compiled taxonomy, recompiled when the data file changes
+
+    The file's mtime is checked at most every TAXONOMY_RELOAD_INTERVAL
+    seconds, so edits are picked up by running Streamlit sessions without a
+    restart while the hot path stays a dictionary lookup.
+    """
+    key = str(path)
+    now = time.monotonic()
+    taxonomy = _taxonomies.get(key)
+    if taxonomy is not None and now - _checked_at.get(key, 0.0) < TAXONOMY_RELOAD_INTERVAL:
+        return taxonomy
+
+    with _taxonomy_lock:
+        taxonomy = _taxonomies.get(key)
+        if taxonomy is not None and now - _checked_at.get(key, 0.0) < TAXONOMY_RELOAD_INTERVAL:
+            return taxonomy
+        _checked_at[key] = now
+        try:
+            mtime = os.path.getmtime(key)
+        except OSError:
+            mtime = None
+        if taxonomy is None or (mtime is not None and mtime != taxonomy.source_mtime):
+            taxonomy = _load_taxonomy(key, mtime)
+            _taxonomies[key] = taxonomy
+        return taxonomy
+
+
+def _load_taxonomy(path: str, mtime: Optional[float]) -> SkillTaxonomy:
+    """The default taxonomy comes precompiled from the startup snapshot, others from their file"""
+    if mtime is not None and os.path.abspath(path) == os.path.abspath(SKILL_TAXONOMY_PATH):
+        # Rebuilds the snapshot first if the taxonomy file changed
+        tables = load_snapshot().section('taxonomy')
+        return SkillTaxonomy.from_tables(tables, mtime)
+    return SkillTaxonomy.from_file(path)
@@ -0,0 +1,202 @@
+"""Startup snapshot: precompiled taxonomy tables and the indexed MCQ bank in one file
+
+    python -m backend.snapshot build     # e.g. as a Docker build step
+    python -m backend.snapshot info
+
+Layout: an 8-byte magic, a 4-byte header length, a JSON header (format,
+source digest, section offsets) and marshal-encoded sections. The file is
+memory-mapped and a section is only decoded when asked for, so opening it
+costs a few hundred microseconds. The header records a digest of the source
+files; when they change, the snapshot is rebuilt transparently.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import marshal
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+from backend.metrics import get_logger, log_event
+from config.settings import SNAPSHOT_PATH, SKILL_TAXONOMY_PATH
+
+logger = get_logger('snapshot')
+
+SNAPSHOT_FORMAT = 1
+MAGIC = b'HRSNAP\x00\x01'
+_HEADER_LENGTH = struct.Struct('<I')
+_PREAMBLE = len(MAGIC) + _HEADER_LENGTH.size
+
+# Everything a snapshot is derived from; editing any of these invalidates it
+SOURCE_FILES = [
+    Path(SKILL_TAXONOMY_PATH),
+    Path(__file__).resolve().parent / 'skill_taxonomy.py',
+    Path(__file__).resolve().parent / 'mcq_generator.py',
+]
+
+
+# Sources modified this recently are re-hashed on every call: a rewrite within
+# the filesystem's timestamp granularity can leave size and mtime unchanged
+RACY_SECONDS = 2
+
+_digest_cache: Optional[Tuple[tuple, str]] = None
+
+
+def _hash_sources() -> str:
+    digest = hashlib.sha256(f'format-{SNAPSHOT_FORMAT}'.encode())
+    for path in SOURCE_FILES:
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def source_digest() -> str:
+    """Digest of the sources, re-hashed only when one's size, mtime or inode changes"""
+    global _digest_cache
+    stats = []
+    for path in SOURCE_FILES:
+        stat = path.stat()
+        stats.append((str(path), stat.st_size, stat.st_mtime_ns, stat.st_ino))
+    stats = tuple(stats)
+    cached = _digest_cache
+    if cached is not None and cached[0] == stats:
+        return cached[1]
+    digest = _hash_sources()
+    if time.time_ns() - max(stat[2] for stat in stats) > RACY_SECONDS * 1_000_000_000:
+        _digest_cache = (stats, digest)
+    return digest
+
+
+class Snapshot:
+    """A memory-mapped snapshot file; sections are decoded on first access"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f'{self.path} is not a snapshot file')
+        (header_length,) = _HEADER_LENGTH.unpack_from(self._map, len(MAGIC))
+        self.header = json.loads(self._map[_PREAMBLE:_PREAMBLE + header_length])
+        self._data_start = _PREAMBLE + header_length
+        self._sections: Dict[str, Any] = {}
+
+    @property
+    def source_digest(self) -> str:
+        return self.header['source_digest']
+
+    def section(self, name: str) -> Any:
+        if name not in self._sections:
+            offset, length = self.header['sections'][name]
+            start = self._data_start + offset
+            with memoryview(self._map)[start:start + length] as view:
+                self._sections[name] = marshal.loads(view)
+        return self._sections[name]
+
+    def close(self):
+        self._map.close()
+
+
+def write_snapshot(path: Path, sections: Dict[str, Any], digest: str):
+    """Write sections atomically (temp file + rename, so readers never see a partial file)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    blobs, offsets, offset = [], {}, 0
+    for name, value in sections.items():
+        blob = marshal.dumps(value)
+        offsets[name] = [offset, len(blob)]
+        offset += len(blob)
+        blobs.append(blob)
+    header = json.dumps({
+        'format': SNAPSHOT_FORMAT,
+        'source_digest': digest,
+        'created_at': time.time(),
+        'sections': offsets,
+    }).encode('utf-8')
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LENGTH.pack(len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+
+
+def build_snapshot(path: Path = SNAPSHOT_PATH) -> Snapshot:
+    """Compile every section from the sources and write the snapshot"""
+    # Imported here: both modules load their data through this one
+    from backend.skill_taxonomy import SkillTaxonomy
+    from backend.mcq_generator import MCQGenerator
+
+    start = time.perf_counter()
+    digest = source_digest()
+    taxonomy = SkillTaxonomy.from_file(SKILL_TAXONOMY_PATH)
+    write_snapshot(path, {
+        'taxonomy': taxonomy.to_tables(),
+        'question_bank': MCQGenerator.index_question_bank(MCQGenerator.build_question_bank()),
+    }, digest)
+    log_event(logger, 'snapshot_built', logging.INFO, path=str(path),
+              seconds=round(time.perf_counter() - start, 4))
+    return Snapshot(path)
+
+
+_snapshots: Dict[str, Snapshot] = {}
+_snapshot_lock = threading.Lock()
+
+
+def load_snapshot(path: Path = SNAPSHOT_PATH) -> Snapshot:
+    """The current snapshot, rebuilt first if it is missing, stale or unreadable"""
+    key = str(path)
+    digest = source_digest()
+    snapshot = _snapshots.get(key)
+    if snapshot is not None and snapshot.source_digest == digest:
+        return snapshot
+
+    with _snapshot_lock:
+        snapshot = _snapshots.get(key)
+        if snapshot is not None and snapshot.source_digest == digest:
+            return snapshot
+        fresh = _open(path)
+        if fresh is None or fresh.source_digest != digest or fresh.header.get('format') != SNAPSHOT_FORMAT:
+            if fresh is not None:
+                fresh.close()
+            fresh = build_snapshot(path)
+        # Sections already decoded from the old map stay valid after closing it
+        if snapshot is not None:
+            snapshot.close()
+        _snapshots[key] = fresh
+        return fresh
+
+
+def _open(path: Path) -> Optional[Snapshot]:
+    try:
+        return Snapshot(path)
+    except (OSError, ValueError) as e:
+        if Path(path).exists():
+            log_event(logger, 'snapshot_unreadable', logging.WARNING, path=str(path), error=str(e))
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or inspect the startup snapshot')
+    parser.add_argument('command', choices=['build', 'info'])
+    parser.add_argument('--path', default=str(SNAPSHOT_PATH))
+    args = parser.parse_args()
+
+    snapshot = build_snapshot(Path(args.path)) if args.command == 'build' else load_snapshot(Path(args.path))
+    print(json.dumps(dict(snapshot.header, path=str(snapshot.path),
+                          up_to_date=snapshot.source_digest == source_digest()), indent=2))
+
+
+if __name__ == '__main__':
+    main()
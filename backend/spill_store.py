@@ -0,0 +1,93 @@
+import heapq
+import logging
+import pickle
+import shutil
+import tempfile
+from itertools import count
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Iterator, Tuple
+
+from backend.metrics import get_logger, log_event
+from config.settings import SPILL_MEMORY_BUDGET, SPILL_DIR
+
+logger = get_logger('spill_store')
+
+
+class SpillStore:
+    """Scored candidates kept within a memory budget, spilling sorted runs to disk
+
+    Candidates are held pickled, so the budget counts their real serialized
+    size. When the buffer exceeds ``memory_budget`` bytes it is sorted by
+    ``key`` and written out as a run file. Iterating yields every candidate
+    in key order through a k-way merge of the runs and the in-memory buffer,
+    reading one record per run at a time. Ties keep insertion order, like a
+    stable sort of the whole batch.
+    """
+
+    def __init__(self, key: Callable[[Dict[str, Any]], tuple], memory_budget: int = SPILL_MEMORY_BUDGET,
+                 directory: str = None):
+        self.key = key
+        self.memory_budget = memory_budget
+        self.directory = Path(directory or SPILL_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._run_dir = Path(tempfile.mkdtemp(prefix='run-', dir=self.directory))
+        self._buffer: List[Tuple[tuple, int, bytes]] = []
+        self._buffer_bytes = 0
+        self._sequence = count()
+        self.runs: List[Path] = []
+        self.count = 0
+        self.peak_buffer_bytes = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, candidate: Dict[str, Any]):
+        payload = pickle.dumps(candidate, protocol=pickle.HIGHEST_PROTOCOL)
+        self._buffer.append((self.key(candidate), next(self._sequence), payload))
+        self._buffer_bytes += len(payload)
+        self.count += 1
+        self.peak_buffer_bytes = max(self.peak_buffer_bytes, self._buffer_bytes)
+        if self._buffer_bytes >= self.memory_budget:
+            self.spill()
+
+    def spill(self):
+        """Write the buffer out as one sorted run"""
+        if not self._buffer:
+            return
+        self._buffer.sort(key=lambda record: record[:2])
+        path = self._run_dir / f'{len(self.runs):05d}.run'
+        with open(path, 'wb') as f:
+            for record in self._buffer:
+                pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+        log_event(logger, 'run_spilled', logging.DEBUG, run=len(self.runs),
+                  candidates=len(self._buffer), bytes=self._buffer_bytes)
+        self.runs.append(path)
+        self._buffer = []
+        self._buffer_bytes = 0
+
+    @staticmethod
+    def _read_run(path: Path) -> Iterator[Tuple[tuple, int, bytes]]:
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        buffered = sorted(self._buffer, key=lambda record: record[:2])
+        sources = [self._read_run(path) for path in self.runs] + [iter(buffered)]
+        for _, _, payload in heapq.merge(*sources, key=lambda record: record[:2]):
+            yield pickle.loads(payload)
+
+    def close(self):
+        """Delete the spilled runs"""
+        self._buffer = []
+        self.runs = []
+        shutil.rmtree(self._run_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
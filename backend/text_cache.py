@@ -0,0 +1,64 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from config.settings import TEXT_CACHE_MAX_CHARS
+
+
+def file_digest(file_path: str) -> str:
+    """SHA-256 of a file's bytes, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParsedTextCache:
+    """LRU cache of extracted resume text and derived per-document data
+
+    Entries are keyed by the SHA-256 of the file bytes, so the same resume
+    uploaded twice (or re-analysed against another job) skips text
+    extraction and section segmentation. The cache is bounded by the total
+    number of cached characters.
+    """
+
+    def __init__(self, max_chars: int = TEXT_CACHE_MAX_CHARS):
+        self.max_chars = max_chars
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: Dict[str, Any]):
+        size = len(entry.get('text', ''))
+        if size > self.max_chars:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._chars -= len(previous.get('text', ''))
+            self._entries[key] = entry
+            self._chars += size
+            while self._chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self._chars -= len(evicted.get('text', ''))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+
+
+# Process-wide cache shared by every ResumeParser
+text_cache = ParsedTextCache()
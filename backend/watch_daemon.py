@@ -0,0 +1,547 @@
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import hashlib
+import json
+import logging
+import os
+import select
+import signal
+import sqlite3
+import struct
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Any, Deque, Optional, Tuple
+
+from backend.dedup import DuplicateIndex, MinHasher, normalize_text
+from backend.metrics import get_logger, log_event
+from backend.resume_parser import ResumeParser
+from backend.search_index import SearchIndex, SearchStore
+from backend.shm_transport import write_payload, read_payload, discard, sweep_orphans
+from backend.text_cache import file_digest
+from backend.workers import init_worker, get_parser
+from config.settings import (
+    RESUME_EXTENSIONS, DEDUP_INDEX_PATH, DEDUP_NUM_PERM, DEDUP_SHINGLE_SIZE, SEARCH_ENABLED, WATCH_FOLDERS,
+    WATCH_STATE_DB, WATCH_DEBOUNCE_SECONDS, WATCH_POLL_INTERVAL, WATCH_WORKERS, WATCH_FLUSH_FILES
+)
+
+logger = get_logger('watch_daemon')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT,
+    status TEXT NOT NULL,
+    duplicate_of TEXT,
+    error TEXT,
+    candidate TEXT,
+    processed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_digest ON files(digest);
+CREATE INDEX IF NOT EXISTS idx_files_processed ON files(processed_at);
+"""
+
+# File states
+DONE, DUPLICATE, FAILED = 'done', 'duplicate', 'failed'
+
+# Editors and downloaders write through these before renaming into place
+TEMPORARY_SUFFIXES = ('.tmp', '.part', '.crdownload', '.partial', '.swp')
+
+
+def is_resume_file(path: str) -> bool:
+    """A finished resume file (not hidden, not an in-progress download or lock file)"""
+    name = os.path.basename(path)
+    if name.startswith(('.', '~$')) or name.lower().endswith(TEMPORARY_SUFFIXES):
+        return False
+    return os.path.splitext(name)[1].lower().lstrip('.') in RESUME_EXTENSIONS
+
+
+def scan_folders(folders: List[str]) -> Dict[str, Tuple[int, int]]:
+    """(size, mtime_ns) of every resume file under the folders, from directory entries only"""
+    found = {}
+    stack = [str(folder) for folder in folders]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file() and is_resume_file(entry.path):
+                    stat = entry.stat()
+                    found[entry.path] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                continue
+    return found
+
+
+class WatchState:
+    """Which watched files have been ingested, keyed by path, size and mtime, in SQLite
+
+    A file whose size and mtime match its row is skipped without being read,
+    so a restarted daemon picks up only files that are new or changed. Rows
+    are written once the file's candidate and index entries have been saved.
+    """
+
+    def __init__(self, db_path: str = WATCH_STATE_DB):
+        self.db_path = str(db_path)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def signatures(self) -> Dict[str, Tuple[int, int]]:
+        """(size, mtime_ns) of every recorded file"""
+        with self._connect() as conn:
+            return {row['path']: (row['size'], row['mtime_ns'])
+                    for row in conn.execute('SELECT path, size, mtime_ns FROM files')}
+
+    def path_for_digest(self, digest: str) -> Optional[str]:
+        """An ingested file with exactly this content, if any"""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT path FROM files WHERE digest = ? AND status = ? LIMIT 1', (digest, DONE)
+            ).fetchone()
+        return row['path'] if row else None
+
+    def record(self, rows: List[Dict[str, Any]]):
+        """Store the outcome of a batch of files in one transaction"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany(
+                'INSERT OR REPLACE INTO files (path, size, mtime_ns, digest, status, duplicate_of, error, candidate, '
+                'processed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(row['path'], row['size'], row['mtime_ns'], row.get('digest'), row['status'],
+                  row.get('duplicate_of'), row.get('error'),
+                  json.dumps(row['candidate']) if row.get('candidate') else None, now) for row in rows]
+            )
+            conn.execute('COMMIT')
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            counts = dict(conn.execute('SELECT status, COUNT(*) FROM files GROUP BY status').fetchall())
+        return {status: counts.get(status, 0) for status in (DONE, DUPLICATE, FAILED)}
+
+    def candidates(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """The most recently ingested candidates"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT candidate FROM files WHERE status = ? ORDER BY processed_at DESC LIMIT ?', (DONE, limit)
+            ).fetchall()
+        return [json.loads(row['candidate']) for row in rows]
+
+
+class PollingWatcher:
+    """Detects new and changed files by comparing directory scans"""
+
+    mode = 'polling'
+
+    def __init__(self, folders: List[str], interval: float = WATCH_POLL_INTERVAL):
+        self.folders = folders
+        self.interval = interval
+        self.snapshot: Dict[str, Tuple[int, int]] = {}
+        self._next_scan = 0.0
+
+    def poll(self, timeout: float) -> List[str]:
+        """Paths created or modified since the last scan, waiting at most ``timeout`` seconds"""
+        delay = self._next_scan - time.monotonic()
+        if delay > timeout:
+            time.sleep(timeout)
+            return []
+        if delay > 0:
+            time.sleep(delay)
+        current = scan_folders(self.folders)
+        changed = [path for path, signature in current.items() if self.snapshot.get(path) != signature]
+        self.snapshot = current
+        self._next_scan = time.monotonic() + self.interval
+        return changed
+
+    def close(self):
+        pass
+
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT = struct.Struct('iIII')  # wd, mask, cookie, len (followed by the NUL-padded name)
+
+
+class InotifyWatcher:
+    """Kernel change notifications for the folders and their subdirectories (Linux only)
+
+    Raises OSError when inotify is unavailable or the watch limit is hit, in
+    which case the daemon falls back to polling.
+    """
+
+    mode = 'inotify'
+
+    def __init__(self, folders: List[str]):
+        self.folders = folders
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(self._libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.directories: Dict[int, str] = {}
+        try:
+            for folder in folders:
+                self._watch_tree(str(folder))
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, root: str):
+        for directory, _, _ in os.walk(root):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {directory}')
+            self.directories[wd] = directory
+
+    def poll(self, timeout: float) -> List[str]:
+        """Paths with write, close or move-in events, waiting at most ``timeout`` seconds"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        changed = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+                offset += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped: fall back to a full scan
+                    changed.extend(scan_folders(self.folders))
+                    continue
+                if mask & IN_IGNORED:
+                    self.directories.pop(wd, None)
+                    continue
+                directory = self.directories.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name))
+                if mask & IN_ISDIR:
+                    # A new or moved-in folder may already hold files
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self._watch_tree(path)
+                        changed.extend(scan_folders([path]))
+                    continue
+                changed.append(path)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(folders: List[str], use_inotify: bool = True, poll_interval: float = WATCH_POLL_INTERVAL):
+    """An inotify watcher where the platform supports it, else a polling one"""
+    if use_inotify:
+        try:
+            return InotifyWatcher(folders)
+        except (OSError, AttributeError) as e:
+            log_event(logger, 'inotify_unavailable', logging.WARNING, error=str(e))
+    return PollingWatcher(folders, poll_interval)
+
+
+class Debouncer:
+    """Holds changed paths until they have been quiet for ``quiet_seconds`` with an unchanged size and mtime
+
+    Catches files that are still being copied in, whether or not the writer
+    produces further events while doing so.
+    """
+
+    def __init__(self, quiet_seconds: float = WATCH_DEBOUNCE_SECONDS):
+        self.quiet_seconds = quiet_seconds
+        self.pending: Dict[str, Tuple[float, Optional[Tuple[int, int]]]] = {}
+
+    def __len__(self):
+        return len(self.pending)
+
+    def touch(self, path: str, now: float = None):
+        """Record activity on a path, restarting its quiet period"""
+        now = time.monotonic() if now is None else now
+        self.pending[path] = (now, _signature(path))
+
+    def ready(self, now: float = None) -> List[Tuple[str, Tuple[int, int]]]:
+        """Paths (with their size and mtime) whose quiet period has passed; removed from the pending set"""
+        now = time.monotonic() if now is None else now
+        ready = []
+        for path, (changed_at, signature) in list(self.pending.items()):
+            if now - changed_at < self.quiet_seconds:
+                continue
+            current = _signature(path)
+            if current is None:
+                del self.pending[path]
+            elif current != signature:
+                # Still growing without telling us: wait another quiet period
+                self.pending[path] = (now, current)
+            else:
+                del self.pending[path]
+                ready.append((path, current))
+        return ready
+
+    def next_due(self, now: float = None) -> Optional[float]:
+        """Seconds until the earliest pending path is due, or None if nothing is pending"""
+        if not self.pending:
+            return None
+        now = time.monotonic() if now is None else now
+        return max(0.0, min(changed_at for changed_at, _ in self.pending.values()) + self.quiet_seconds - now)
+
+
+def _signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+# One MinHasher per worker process and signature shape
+_hashers: Dict[Tuple[int, int], MinHasher] = {}
+
+
+def ingest_file(path: str, hasher_params: Tuple[int, int] = None) -> Dict[str, Any]:
+    """Hash, parse and fingerprint one watched file inside a pool worker
+
+    The extracted text and its MinHash signature come back as a shared
+    memory payload, which the parent must read or discard.
+    """
+    parser = get_parser()
+    digest = file_digest(path)
+    document = parser.load_document(path)
+    if not document['text']:
+        return {'digest': digest, 'candidate': None, 'payload': None}
+    candidate = parser.parse_text(document['text'], path, None, document['sections'], document.get('timeline'))
+
+    hasher_params = hasher_params or (DEDUP_NUM_PERM, DEDUP_SHINGLE_SIZE)
+    hasher = _hashers.get(hasher_params)
+    if hasher is None:
+        hasher = _hashers[hasher_params] = MinHasher(*hasher_params)
+    normalized = normalize_text(document['text'])
+    return {
+        'digest': digest,
+        'candidate': candidate,
+        'content_hash': hashlib.sha1(normalized.encode('utf-8')).hexdigest(),
+        'payload': write_payload(text=document['text'], signature=hasher.signature(normalized)),
+    }
+
+
+class WatchDaemon:
+    """Watches folders for new resumes and ingests them into the candidate pool and search index
+
+    Settled files are hashed, parsed and fingerprinted in a process pool,
+    which hands the extracted text back through shared memory. Parsed candidates
+    go into the persistent duplicate index (the candidate pool that later
+    analyses reuse) and their texts into a search segment. Both are saved
+    every ``flush_files`` files and whenever the daemon goes idle, and only
+    then are the files marked as ingested, so after a crash or restart just
+    the unsaved files are parsed again. Saves append to the shared pool
+    and pick up what other writers saved, so neither side overwrites the
+    other's entries.
+    """
+
+    def __init__(self, folders: List[str], state_db: str = WATCH_STATE_DB, workers: int = WATCH_WORKERS,
+                 debounce_seconds: float = WATCH_DEBOUNCE_SECONDS, poll_interval: float = WATCH_POLL_INTERVAL,
+                 use_inotify: bool = True, flush_files: int = WATCH_FLUSH_FILES,
+                 duplicate_index_path: str = DEDUP_INDEX_PATH, search_store: SearchStore = None):
+        self.folders = [str(Path(folder).resolve()) for folder in folders]
+        for folder in self.folders:
+            Path(folder).mkdir(parents=True, exist_ok=True)
+        self.state = WatchState(state_db)
+        self.workers = workers
+        self.debouncer = Debouncer(debounce_seconds)
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.flush_files = flush_files
+        self.duplicate_index = DuplicateIndex.load_or_create(duplicate_index_path)
+        self.search_store = search_store if search_store is not None else (SearchStore() if SEARCH_ENABLED else None)
+        self.parser = ResumeParser(search_index=SearchIndex() if self.search_store is not None else None)
+        hasher = self.duplicate_index.hasher
+        self.hasher_params = (hasher.num_perm, hasher.shingle_size)
+
+        self.known = self.state.signatures()
+        self.queue: Deque[Tuple[str, Tuple[int, int]]] = deque()
+        self.in_flight: Dict[Any, Tuple[str, Tuple[int, int]]] = {}
+        self.unsaved: List[Dict[str, Any]] = []
+        self.unsaved_digests: Dict[str, str] = {}
+        self.parsed = 0
+
+    def run(self, stop: threading.Event = None):
+        """Watch and ingest until ``stop`` is set; in-flight files are finished and saved first"""
+        stop = stop or threading.Event()
+        watcher = create_watcher(self.folders, self.use_inotify, self.poll_interval)
+        log_event(logger, 'watch_started', folders=self.folders, mode=watcher.mode, known_files=len(self.known))
+        # Segments from a daemon that crashed with results in flight
+        sweep_orphans()
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker) as pool:
+                # Watches are in place before the scan, so nothing written in between is missed
+                for path in scan_folders(self.folders):
+                    self._changed(path)
+                while not stop.is_set():
+                    self._step(watcher, pool)
+                self._drain()
+        finally:
+            watcher.close()
+            self._flush()
+        log_event(logger, 'watch_stopped', parsed=self.parsed, **self.state.stats())
+
+    def _step(self, watcher, pool: ProcessPoolExecutor):
+        due = self.debouncer.next_due()
+        timeout = 0.05 if self.in_flight else min(due if due is not None else 1.0, 1.0)
+        for path in watcher.poll(timeout):
+            if is_resume_file(path):
+                self._changed(path)
+        for path, signature in self.debouncer.ready():
+            if self.known.get(path) != signature:
+                self.queue.append((path, signature))
+
+        # Bound the work handed to the pool, so a flood of files is not all pickled at once
+        while self.queue and len(self.in_flight) < self.workers * 2:
+            path, signature = self.queue.popleft()
+            self.in_flight[pool.submit(ingest_file, path, self.hasher_params)] = (path, signature)
+        if self.in_flight:
+            done, _ = wait(list(self.in_flight), timeout=0, return_when=FIRST_COMPLETED)
+            if done:
+                # Other writers (the UI, another daemon) share the pool: check against what they saved too
+                self.duplicate_index.refresh()
+            for future in done:
+                self._ingested(future, *self.in_flight.pop(future))
+
+        idle = not self.queue and not self.in_flight
+        if len(self.unsaved) >= self.flush_files or (self.unsaved and idle):
+            self._flush()
+
+    def _changed(self, path: str):
+        # Files already ingested with this size and mtime are skipped without a quiet period
+        if self.known.get(path) != _signature(path):
+            self.debouncer.touch(path)
+
+    def _drain(self):
+        self.queue.clear()
+        self.duplicate_index.refresh()
+        for future in list(self.in_flight):
+            self._ingested(future, *self.in_flight.pop(future))
+
+    def _ingested(self, future, path: str, signature: Tuple[int, int]):
+        row = {'path': path, 'size': signature[0], 'mtime_ns': signature[1]}
+        try:
+            result = future.result()
+        except Exception as e:
+            log_event(logger, 'watch_file_failed', logging.WARNING, file=path, error=str(e))
+            self.unsaved.append(dict(row, status=FAILED, error=str(e)))
+            return
+        self.parsed += 1
+        row['digest'] = result['digest']
+        if result['candidate'] is None:
+            self.unsaved.append(dict(row, status=FAILED, error='no text extracted'))
+            return
+
+        # Byte-identical to a file ingested before (a copy, or the same file renamed)
+        earlier = self.unsaved_digests.get(result['digest']) or self.state.path_for_digest(result['digest'])
+        if earlier is not None and earlier != path:
+            discard(result['payload'])
+            self.unsaved.append(dict(row, status=DUPLICATE, duplicate_of=earlier))
+            return
+        self.unsaved_digests[result['digest']] = path
+
+        candidate = result['candidate']
+        try:
+            with read_payload(result['payload']) as fields:
+                text = fields.text('text')
+                fingerprint = (result['content_hash'], fields.array('signature').copy())
+        except FileNotFoundError as e:
+            log_event(logger, 'watch_file_failed', logging.WARNING, file=path, error=str(e))
+            self.unsaved.append(dict(row, status=FAILED, error='worker result was lost'))
+            return
+        match = self.duplicate_index.find(fingerprint=fingerprint)
+        if match is None or match['match_type'] != 'exact':
+            self.parser.index_text(text, path, fingerprint[0])
+        # A new version of a file ingested before is not a duplicate of it; same-named files elsewhere are
+        if match is not None and match['candidate'].get('source_path') != path:
+            self.unsaved.append(dict(row, status=DUPLICATE, duplicate_of=match['file_name'], candidate=candidate))
+            return
+        if match is None:
+            self.duplicate_index.add(candidate['file_name'], dict(candidate, source_path=path), (),
+                                     fingerprint=fingerprint)
+        self.unsaved.append(dict(row, status=DONE, candidate=candidate))
+
+    def _flush(self):
+        """Save the candidate pool and search segment, then mark their files as ingested"""
+        if not self.unsaved:
+            return
+        self.duplicate_index.save()
+        if self.search_store is not None and len(self.parser.search_index):
+            self.search_store.write(self.parser.search_index)
+            self.search_store.compact_in_background()
+            self.parser.search_index = SearchIndex()
+        self.state.record(self.unsaved)
+        for row in self.unsaved:
+            self.known[row['path']] = (row['size'], row['mtime_ns'])
+        log_event(logger, 'watch_flushed', files=len(self.unsaved),
+                  failed=sum(row['status'] == FAILED for row in self.unsaved))
+        self.unsaved = []
+        self.unsaved_digests = {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ingest resumes dropped into watched folders')
+    parser.add_argument('folders', nargs='*', default=WATCH_FOLDERS, help='Folders to watch (default: HR_WATCH_FOLDERS)')
+    parser.add_argument('--db', default=str(WATCH_STATE_DB))
+    parser.add_argument('--workers', type=int, default=WATCH_WORKERS)
+    parser.add_argument('--debounce', type=float, default=WATCH_DEBOUNCE_SECONDS, help='Quiet seconds before a file is read')
+    parser.add_argument('--poll', action='store_true', help='Scan periodically instead of using inotify')
+    parser.add_argument('--poll-interval', type=float, default=WATCH_POLL_INTERVAL)
+    parser.add_argument('--status', action='store_true', help='Print ingestion counts and exit')
+    args = parser.parse_args()
+
+    if args.status:
+        print(json.dumps(WatchState(args.db).stats(), indent=2))
+        return
+    if not args.folders:
+        parser.error('no folders given and HR_WATCH_FOLDERS is not set')
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    WatchDaemon(args.folders, args.db, args.workers, args.debounce, args.poll_interval,
+                use_inotify=not args.poll).run(stop)
+
+
+if __name__ == '__main__':
+    main()
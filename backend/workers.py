@@ -0,0 +1,83 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Dict, Any, Tuple, Optional
+
+from backend.metrics import metrics
+from backend.resume_parser import ResumeParser
+from backend.dedup import DuplicateIndex
+from backend.search_index import SearchIndex
+from config.settings import DEDUP_ENABLED, DEDUP_INDEX_PATH, SEARCH_ENABLED
+
+# One warm parser per worker process, created by the pool initializer
+_parser = None
+# The persistent duplicate index, loaded once per worker process and refreshed incrementally
+_pool_index = None
+
+def init_worker():
+    """Process pool initializer: build the parser once per worker process"""
+    global _parser
+    _parser = ResumeParser()
+
+def get_parser() -> ResumeParser:
+    """Return this process's parser, creating it on first use"""
+    global _parser
+    if _parser is None:
+        _parser = ResumeParser()
+    return _parser
+
+def parse_resume_bytes(file_name: str, data: bytes, job_skills: List[str] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Parse an uploaded resume inside a worker process
+
+    The upload is written to a private temp directory under its original
+    (sanitised) file name so the extension and candidate name are preserved.
+    Returns the candidate dict together with the worker's stage breakdown,
+    which the parent merges into its own metrics.
+    """
+    with metrics.run('parse_resume_bytes') as run:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = _write_upload(temp_dir, file_name, data)
+            candidate = get_parser().parse_resume(temp_path, job_skills)
+    return candidate, run.to_dict()
+
+def get_pool_index() -> DuplicateIndex:
+    """This process's copy of the persistent pool index, brought up to date with other writers"""
+    global _pool_index
+    if _pool_index is None:
+        _pool_index = DuplicateIndex.load_or_create(DEDUP_INDEX_PATH)
+    else:
+        _pool_index.refresh()
+    return _pool_index
+
+def parse_upload_chunk(uploads: List[Tuple[str, bytes]], job_skills: List[str]) -> Tuple[
+        List[Dict[str, Any]], Optional[SearchIndex], Dict[str, Any]]:
+    """Parse a few uploaded resumes inside a worker process, as one fairly-queued task of an analysis
+
+    Duplicates are detected against the persistent pool index, as in the UI,
+    and the new entries are saved to it before returning. Returns the
+    candidates in upload order, a search index of their texts (None when
+    search is disabled) for the caller to write as one segment per
+    analysis, and the worker's stage breakdown.
+    """
+    with metrics.run('parse_upload_chunk') as run:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_files = [_write_upload(temp_dir, file_name, data) for file_name, data in uploads]
+            search_index = SearchIndex() if SEARCH_ENABLED else None
+            duplicate_index = get_pool_index() if DEDUP_ENABLED else None
+            parser = get_parser()
+            parser.search_index = search_index
+            try:
+                candidates = parser.parse_multiple_resumes(temp_files, job_skills, duplicate_index)
+            finally:
+                parser.search_index = None
+            if duplicate_index is not None:
+                duplicate_index.save()
+    return candidates, search_index, run.to_dict()
+
+def _write_upload(temp_dir: str, file_name: str, data: bytes) -> str:
+    """Write an upload under its original (sanitised) file name"""
+    safe_name = Path(file_name).name or 'resume'
+    temp_path = os.path.join(temp_dir, safe_name)
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    return temp_path
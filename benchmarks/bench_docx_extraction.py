@@ -0,0 +1,72 @@
+"""Compare streaming DOCX extraction against the previous python-docx path
+
+    python -m benchmarks.bench_docx_extraction --files 50 --paragraphs 400
+"""
+
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import docx
+
+from backend.docx_stream import extract_docx_text
+from benchmarks.synthetic import write_docx_resume
+
+
+def extract_with_python_docx(file_path: str) -> str:
+    """The extraction code ResumeParser used before the streaming backend"""
+    doc = docx.Document(file_path)
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    return text
+
+
+def measure(extract, paths, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            extract(path)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    extract(paths[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=30)
+    parser.add_argument('--paragraphs', type=int, default=200, help='Project lines per resume')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = []
+        for index in range(args.files):
+            path = Path(temp_dir) / f'resume_{index}.docx'
+            write_docx_resume(path, rng, projects=args.paragraphs, table_rows=20)
+            paths.append(str(path))
+
+        legacy_time, legacy_peak = measure(extract_with_python_docx, paths, args.repeat)
+        stream_time, stream_peak = measure(extract_docx_text, paths, args.repeat)
+        legacy_chars = len(extract_with_python_docx(paths[0]))
+        stream_chars = len(extract_docx_text(paths[0]))
+
+    print(f"{'backend':<12}{'total s':>10}{'ms/file':>10}{'peak KiB':>10}{'chars':>9}")
+    print(f"{'python-docx':<12}{legacy_time:>10.3f}{legacy_time / args.files * 1000:>10.2f}"
+          f"{legacy_peak / 1024:>10.0f}{legacy_chars:>9}")
+    print(f"{'streaming':<12}{stream_time:>10.3f}{stream_time / args.files * 1000:>10.2f}"
+          f"{stream_peak / 1024:>10.0f}{stream_chars:>9}")
+    print(f"speedup: {legacy_time / stream_time:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""Simulate concurrent recruiter sessions and report latency, throughput, CPU and RSS
+
+    python -m benchmarks.load_test --concurrency 1 2 4 8 --sessions 16 --resumes 10
+    python -m benchmarks.load_test --mode apptest --concurrency 1 4
+
+Every session uploads a synthetic job description and a sample of synthetic
+resumes and waits for the ranking. Modes:
+
+    direct    each session runs JobMatcher.match_resumes_to_job in its own thread
+    executor  sessions share the AnalysisExecutor process pool, as the app does
+    apptest   each session is a Streamlit AppTest run of a page that analyses
+              through the executor, so script-runner overhead is included
+
+Everything runs locally; nothing is sent over the network.
+"""
+
+import argparse
+import os
+import random
+import resource
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
+
+from backend.analysis_executor import AnalysisExecutor, get_executor
+from backend.job_matcher import JobMatcher
+from backend.text_cache import text_cache
+from benchmarks.synthetic import synthetic_job_description, write_resume_corpus
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PAGE_SIZE = resource.getpagesize()
+
+
+def _process_tree(root: int) -> List[int]:
+    """The root pid and all its descendants, from /proc"""
+    parents = {}
+    for entry in os.listdir('/proc'):
+        if entry.isdigit():
+            try:
+                with open(f'/proc/{entry}/stat') as f:
+                    # The command name may contain spaces; fields restart after ')'
+                    fields = f.read().rsplit(')', 1)[1].split()
+                parents.setdefault(int(fields[1]), []).append(int(entry))
+            except (OSError, IndexError):
+                continue
+    tree, stack = [], [root]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(parents.get(pid, ()))
+    return tree
+
+
+def resource_usage() -> Tuple[float, int]:
+    """CPU seconds and resident bytes of this process and its pool workers"""
+    if not os.path.isdir('/proc'):
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return usage.ru_utime + usage.ru_stime, usage.ru_maxrss * 1024
+
+    cpu, rss = 0.0, 0
+    for pid in _process_tree(os.getpid()):
+        try:
+            with open(f'/proc/{pid}/stat') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+            # utime, stime and rss are fields 14, 15 and 24 (1-based, counting pid and comm)
+            cpu += (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+            rss += int(fields[21]) * PAGE_SIZE
+        except (OSError, IndexError):
+            continue
+    return cpu, rss
+
+
+class ResourceSampler:
+    """Background thread recording peak RSS while a concurrency level runs"""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak_rss = max(self.peak_rss, resource_usage()[1])
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, resource_usage()[1])
+
+
+def _apptest_page(session_name, job_description, resume_paths):
+    """Minimal analysis page run by AppTest (self-contained and unannotated: AppTest runs its source)"""
+    from pathlib import Path
+    import streamlit as st
+    from backend.analysis_executor import get_executor
+
+    uploads = [(Path(path).name, Path(path).read_bytes()) for path in resume_paths]
+    results = get_executor().match_uploads(session_name, uploads, job_description)
+    st.metric("Total Candidates", results.get('total_candidates', 0))
+    st.dataframe([
+        {'name': c['name'], 'overall_score': c['overall_score']} for c in results.get('candidates', [])
+    ])
+
+
+def run_session(mode: str, session_name: str, job_description: str, resume_paths: List[str],
+                executor: AnalysisExecutor) -> int:
+    """One simulated recruiter session; returns the number of ranked candidates"""
+    if mode == 'direct':
+        results = JobMatcher().match_resumes_to_job(resume_paths, job_description)
+        return results.get('total_candidates', 0)
+
+    if mode == 'executor':
+        uploads = [(Path(path).name, Path(path).read_bytes()) for path in resume_paths]
+        results = executor.match_uploads(session_name, uploads, job_description)
+        return results.get('total_candidates', 0)
+
+    from streamlit.testing.v1 import AppTest
+    app = AppTest.from_function(
+        _apptest_page, args=(session_name, job_description, resume_paths), default_timeout=600
+    )
+    app.run()
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    return int(app.metric[0].value)
+
+
+def run_level(mode: str, concurrency: int, sessions: List[Tuple[str, str, List[str]]],
+              executor: AnalysisExecutor) -> Dict[str, Any]:
+    """Run all sessions with ``concurrency`` of them active at a time"""
+    latencies = []
+
+    def timed(session):
+        start = time.perf_counter()
+        run_session(mode, *session, executor)
+        latencies.append(time.perf_counter() - start)
+
+    cpu_before, _ = resource_usage()
+    with ResourceSampler() as sampler:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(timed, sessions))
+        wall = time.perf_counter() - start
+    cpu_after, _ = resource_usage()
+
+    resumes = sum(len(paths) for _, _, paths in sessions)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        'mode': mode,
+        'concurrency': concurrency,
+        'sessions': len(sessions),
+        'p50': p50,
+        'p95': p95,
+        'p99': p99,
+        'sessions_per_s': len(sessions) / wall,
+        'resumes_per_s': resumes / wall,
+        'cpu_cores': (cpu_after - cpu_before) / wall,
+        'peak_rss_mib': sampler.peak_rss / 2 ** 20,
+    }
+
+
+def build_sessions(count: int, corpus: List[str], resumes: int, seed: int) -> List[Tuple[str, str, List[str]]]:
+    rng = random.Random(seed)
+    return [
+        (f'session-{index}', synthetic_job_description(rng), rng.sample(corpus, min(resumes, len(corpus))))
+        for index in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=['direct', 'executor', 'apptest'], default='executor')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--sessions', type=int, default=16, help='Sessions per concurrency level')
+    parser.add_argument('--resumes', type=int, default=10, help='Resumes uploaded per session')
+    parser.add_argument('--corpus', type=int, default=200, help='Distinct synthetic resumes to sample from')
+    parser.add_argument('--projects', type=int, default=6, help='Project lines per resume')
+    parser.add_argument('--workers', type=int, default=None, help='Executor pool size (default: settings)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    executor = AnalysisExecutor(workers=args.workers) if args.workers else get_executor()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        corpus = write_resume_corpus(Path(temp_dir), args.corpus, args.seed, args.projects)
+
+        rows = []
+        for level, concurrency in enumerate(args.concurrency):
+            # Every level starts cold so later levels do not profit from earlier parses
+            text_cache.clear()
+            sessions = build_sessions(args.sessions, corpus, args.resumes, args.seed + level)
+            rows.append(run_level(args.mode, concurrency, sessions, executor))
+
+    print(f"{'mode':<9}{'conc':>5}{'sess':>6}{'p50 s':>8}{'p95 s':>8}{'p99 s':>8}"
+          f"{'sess/s':>8}{'res/s':>8}{'cpu':>6}{'rss MiB':>9}")
+    for row in rows:
+        print(f"{row['mode']:<9}{row['concurrency']:>5}{row['sessions']:>6}{row['p50']:>8.3f}"
+              f"{row['p95']:>8.3f}{row['p99']:>8.3f}{row['sessions_per_s']:>8.2f}{row['resumes_per_s']:>8.1f}"
+              f"{row['cpu_cores']:>6.2f}{row['peak_rss_mib']:>9.0f}")
+    executor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
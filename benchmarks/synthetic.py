@@ -0,0 +1,60 @@
+"""Synthetic job descriptions and resumes for benchmarks and load tests"""
+
+import random
+from pathlib import Path
+from typing import List
+
+import docx
+
+SKILLS = [
+    'python', 'java', 'javascript', 'react', 'node.js', 'sql', 'mongodb', 'docker', 'kubernetes',
+    'aws', 'azure', 'flask', 'django', 'tensorflow', 'pytorch', 'machine learning', 'postgresql',
+    'redis', 'terraform', 'linux', 'graphql', 'microservices', 'typescript', 'git', 'jenkins',
+]
+VERBS = ['Developed', 'Built', 'Engineered', 'Implemented', 'Optimized', 'Designed', 'Architected']
+NOUNS = ['recommendation engine', 'payment service', 'data pipeline', 'chat platform',
+         'inventory tracker', 'fraud detector', 'search API', 'analytics dashboard']
+
+
+def synthetic_job_description(rng: random.Random, skill_count: int = 8) -> str:
+    skills = rng.sample(SKILLS, skill_count)
+    lines = ['Job Title: Software Engineer', '', 'We are looking for an engineer skilled in:']
+    lines += [f'- {skill}' for skill in skills]
+    lines += ['', f'Minimum {rng.randint(1, 6)} years of experience.']
+    return '\n'.join(lines)
+
+
+def synthetic_resume_lines(rng: random.Random, projects: int = 6) -> List[str]:
+    lines = ['Summary', f'Engineer with {rng.randint(0, 12)} years of experience.', '',
+             'Contact: candidate@example.com, +1 555 123 4567', '', 'Projects']
+    for _ in range(projects):
+        used = ', '.join(rng.sample(SKILLS, 3))
+        lines.append(f'{rng.choice(VERBS)} a {rng.choice(NOUNS)} using {used}, '
+                     f'improving throughput by {rng.randint(5, 90)}%')
+    lines += ['', 'Skills', ', '.join(rng.sample(SKILLS, 10))]
+    return lines
+
+
+def write_docx_resume(path: Path, rng: random.Random, projects: int = 6, table_rows: int = 4):
+    """Write a resume .docx with a header, body paragraphs and a skills table"""
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = f'Candidate {rng.randint(1, 10**6)}'
+    for line in synthetic_resume_lines(rng, projects):
+        document.add_paragraph(line)
+    table = document.add_table(rows=table_rows, cols=2)
+    for row in table.rows:
+        row.cells[0].text = rng.choice(SKILLS)
+        row.cells[1].text = f'{rng.randint(1, 8)} years'
+    document.save(str(path))
+
+
+def write_resume_corpus(directory: Path, count: int, seed: int = 7, projects: int = 6) -> List[str]:
+    """Write ``count`` synthetic .docx resumes and return their paths"""
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(count):
+        path = directory / f'synthetic_candidate_{index:05d}.docx'
+        write_docx_resume(path, rng, projects)
+        paths.append(str(path))
+    return paths
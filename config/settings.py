@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -9,6 +10,20 @@ SPACY_MODEL = 'en_core_web_sm'
 # File Upload
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
 ALLOWED_EXTENSIONS = ['pdf', 'docx', 'txt']
+RESUME_EXTENSIONS = ['pdf', 'docx']
+
+# Skill taxonomy (canonical skills, aliases, parents)
+SKILL_TAXONOMY_PATH = BASE_DIR / 'data' / 'skills' / 'taxonomy.json'
+TAXONOMY_RELOAD_INTERVAL = 5  # seconds between checks for an edited taxonomy file
+
+# Fuzzy skill matching (misspellings and spacing variants, e.g. 'Pyhton', 'Postgre SQL')
+FUZZY_SKILLS_ENABLED = True
+FUZZY_MAX_EDIT_DISTANCE = 2   # names up to 9 characters allow one edit, longer ones up to this many
+FUZZY_MIN_LENGTH = 6          # shorter names must be spelled exactly
+FUZZY_SKILL_WEIGHT = 0.8      # skill match credit for a fuzzy match (an exact match counts 1)
+
+# Parsed resume text cache (bounded by total cached characters)
+TEXT_CACHE_MAX_CHARS = 50_000_000
 
 # Scoring Weights
 SCORING_WEIGHTS = {
@@ -26,5 +41,90 @@ EXPERIENCE_THRESHOLDS = {
 # Output
 EXPORT_DIR = BASE_DIR / 'exports'
 EXPORT_DIR.mkdir(exist_ok=True)
+EXPORT_MAX_AGE_SECONDS = 24 * 3600  # generated dossier archives are deleted after this
+
+# Local state (queues, indexes, caches)
+STORE_DIR = Path(os.getenv('HR_STORE_DIR', BASE_DIR / 'store'))
+STORE_DIR.mkdir(parents=True, exist_ok=True)
+
+SHORTLIST_THRESHOLD = 60
+
+# Logging
+LOG_LEVEL = os.getenv('HR_LOG_LEVEL', 'INFO').upper()
+
+# HTTP matching service
+API_HOST = os.getenv('HR_API_HOST', '127.0.0.1')
+API_PORT = int(os.getenv('HR_API_PORT', '8000'))
+API_WORKERS = int(os.getenv('HR_API_WORKERS', str(os.cpu_count() or 2)))
+API_MAX_QUEUED_FILES = int(os.getenv('HR_API_MAX_QUEUED_FILES', '200'))  # beyond this requests get 429
+API_MAX_BODY_BYTES = 100 * 1024 * 1024  # 100 MB per request
+
+# Shared analysis executor (one process pool per Streamlit server process)
+ANALYSIS_WORKERS = int(os.getenv('HR_ANALYSIS_WORKERS', str(os.cpu_count() or 2)))
+ANALYSIS_MAX_IN_FLIGHT = int(os.getenv('HR_ANALYSIS_MAX_IN_FLIGHT', str(ANALYSIS_WORKERS)))  # tasks in the pool at once
+ANALYSIS_CHUNK_FILES = 4     # uploads parsed per pool task, so sessions take turns within an analysis
+
+# Startup snapshot (precompiled taxonomy tables and question bank, rebuilt when sources change)
+SNAPSHOT_PATH = Path(os.getenv('HR_SNAPSHOT_PATH', STORE_DIR / 'startup.snapshot'))
+
+# Memory-budgeted matching for very large batches (sorted runs spilled to disk)
+SPILL_MEMORY_BUDGET = int(os.getenv('HR_SPILL_MEMORY_BUDGET_MB', '256')) * 1024 * 1024
+SPILL_DIR = STORE_DIR / 'spill'
+SPILL_SCORE_BATCH = 256       # candidates scored together in one project-scorer pass
+SPILL_RESULT_TOP_K = 100      # candidates returned in the results; the full ranking is streamed
+
+# Candidate PDF dossiers
+REPORT_WORKERS = int(os.getenv('HR_REPORT_WORKERS', str(os.cpu_count() or 2)))
+REPORT_MAX_IN_FLIGHT = 16  # rendered PDFs held in memory at once while zipping
+REPORT_MAX_PROJECTS = 5
+
+# Batch job queue
+JOB_QUEUE_DB = STORE_DIR / 'jobs.sqlite3'
+JOB_LEASE_SECONDS = 300
+JOB_MAX_ATTEMPTS = 3
+
+# Analysis run history (every ranked run, queryable per requisition, candidate and skill)
+HISTORY_DB = Path(os.getenv('HR_HISTORY_DB', STORE_DIR / 'history.sqlite3'))
+
+# Multi-node sharded scoring (coordinator/worker over multiprocessing.managers)
+DIST_HOST = os.getenv('HR_DIST_HOST', '127.0.0.1')
+DIST_PORT = int(os.getenv('HR_DIST_PORT', '50051'))
+# The default key is only accepted on loopback addresses; set HR_DIST_AUTHKEY to serve on a network
+DIST_DEFAULT_AUTHKEY = b'change-me'
+DIST_AUTHKEY = os.getenv('HR_DIST_AUTHKEY', '').encode('utf-8') or DIST_DEFAULT_AUTHKEY
+DIST_SHARD_SIZE = 50          # resumes per shard
+DIST_TOP_K = 100              # candidates kept by the coordinator's merged ranking
+DIST_LEASE_SECONDS = 60       # a shard is re-dispatched if its worker stops heartbeating this long
+DIST_MAX_ATTEMPTS = 3
+
+# Full-text search (BM25 over compressed positional postings, persisted as immutable segments)
+SEARCH_ENABLED = True
+SEARCH_INDEX_DIR = Path(os.getenv('HR_SEARCH_INDEX_DIR', STORE_DIR / 'search'))
+SEARCH_BLOCK_SIZE = 128      # postings per compressed block
+SEARCH_BM25_K1 = 1.2
+SEARCH_BM25_B = 0.75
+SEARCH_TOP_K = 20
+SEARCH_DENSE_POSTINGS = 20_000  # queries over more postings are scored with NumPy instead of MaxScore
+SEARCH_DECODED_TERMS = 64       # decoded postings lists kept for repeated queries
+SEARCH_MAX_SEGMENTS = 16     # compacted into one segment beyond this
+SEARCH_SEGMENT_DOCS = 1000   # batch workers write a segment every this many resumes
+
+# Duplicate resume detection (MinHash LSH over word shingles)
+DEDUP_ENABLED = True
+DEDUP_THRESHOLD = 0.8        # estimated Jaccard similarity for a near duplicate
+DEDUP_NUM_PERM = 64
+DEDUP_BANDS = 16
+DEDUP_SHINGLE_SIZE = 3
+DEDUP_INDEX_PATH = STORE_DIR / 'dedup_index.sqlite3'
+
+# Watch-folder ingestion daemon (resumes dropped into shared folders by the ATS)
+WATCH_FOLDERS = [folder for folder in os.getenv('HR_WATCH_FOLDERS', '').split(os.pathsep) if folder]
+WATCH_STATE_DB = Path(os.getenv('HR_WATCH_STATE_DB', STORE_DIR / 'watch_state.sqlite3'))
+WATCH_DEBOUNCE_SECONDS = 2.0  # a file is read once it has been quiet, with an unchanged size, this long
+WATCH_POLL_INTERVAL = 5.0     # seconds between scans when inotify is unavailable
+WATCH_WORKERS = int(os.getenv('HR_WATCH_WORKERS', '2'))
+WATCH_FLUSH_FILES = 200       # candidate pool and search segment are saved every this many files (and when idle)
 
-SHORTLIST_THRESHOLD = 60
\ No newline at end of file
+# Worker-to-parent transfer of extracted text and feature arrays through shared memory
+SHM_TRANSPORT_ENABLED = True
+SHM_MIN_BYTES = 8192          # smaller payloads are pickled inline instead
@@ -0,0 +1,124 @@
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+from typing import List, Dict, Any, Tuple
+
+# Aggregates are binned on the server, so chart payloads stay the same size for 10 or 10,000 candidates
+SCORE_BINS = 20
+SCORE_BANDS = 5
+MAX_HEATMAP_SKILLS = 20
+EXPERIENCE_LEVELS = ['Fresher', 'Beginner', 'Intermediate', 'Expert']
+MAX_EXPERIENCE_YEARS = 20
+
+def score_histogram(candidates: List[Dict[str, Any]], metric: str, bins: int = SCORE_BINS) -> Tuple[np.ndarray, np.ndarray]:
+    """Counts and bin edges of a 0-10 score over the pool"""
+    values = np.fromiter((c.get(metric, 0) for c in candidates), dtype=float, count=len(candidates))
+    return np.histogram(np.clip(values, 0, 10), bins=bins, range=(0, 10))
+
+def skill_coverage(candidates: List[Dict[str, Any]], job_skills: List[str],
+                   bands: int = SCORE_BANDS) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Share of candidates having each job skill, per overall-score band
+
+    Returns the skills (at most MAX_HEATMAP_SKILLS), a skills x bands
+    matrix of coverage fractions (NaN for empty bands) and the band edges.
+    """
+    skills = list(dict.fromkeys(job_skills))[:MAX_HEATMAP_SKILLS]
+    edges = np.linspace(0, 10, bands + 1)
+    if not candidates or not skills:
+        return skills, np.full((len(skills), bands), np.nan), edges
+
+    scores = np.fromiter((c.get('overall_score', 0) for c in candidates), dtype=float, count=len(candidates))
+    band_of = np.clip(np.digitize(scores, edges[1:-1]), 0, bands - 1)
+    band_sizes = np.bincount(band_of, minlength=bands)
+
+    skill_index = {skill: i for i, skill in enumerate(skills)}
+    rows, cols = [], []
+    for band, candidate in zip(band_of, candidates):
+        for skill in set(candidate.get('skills', [])):
+            if skill in skill_index:
+                rows.append(skill_index[skill])
+                cols.append(band)
+    counts = np.zeros((len(skills), bands))
+    np.add.at(counts, (np.array(rows, dtype=int), np.array(cols, dtype=int)), 1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        coverage = np.where(band_sizes > 0, counts / band_sizes, np.nan)
+    return skills, coverage, edges
+
+def experience_distribution(candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Candidates per experience level and a years-of-experience histogram"""
+    level_counts = dict.fromkeys(EXPERIENCE_LEVELS, 0)
+    for candidate in candidates:
+        level = candidate.get('experience_level', 'Fresher')
+        level_counts[level] = level_counts.get(level, 0) + 1
+
+    years = np.fromiter((c.get('experience_years', 0) for c in candidates), dtype=float, count=len(candidates))
+    year_counts, year_edges = np.histogram(
+        np.clip(years, 0, MAX_EXPERIENCE_YEARS), bins=MAX_EXPERIENCE_YEARS, range=(0, MAX_EXPERIENCE_YEARS)
+    )
+    return {'levels': level_counts, 'year_counts': year_counts, 'year_edges': year_edges}
+
+def _bin_labels(edges: np.ndarray) -> List[str]:
+    return [f"{low:g}-{high:g}" for low, high in zip(edges[:-1], edges[1:])]
+
+def score_histogram_figure(candidates: List[Dict[str, Any]]) -> go.Figure:
+    """Overlaid overall-score and project-relevance histograms"""
+    figure = go.Figure()
+    for metric, label in [('overall_score', 'Overall score'), ('project_relevance', 'Project relevance')]:
+        counts, edges = score_histogram(candidates, metric)
+        figure.add_trace(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2, y=counts, width=edges[1] - edges[0],
+            name=label, opacity=0.7, customdata=_bin_labels(edges),
+            hovertemplate="%{customdata}: %{y} candidates<extra>" + label + "</extra>"
+        ))
+    figure.update_layout(barmode='overlay', xaxis_title="Score (0-10)", yaxis_title="Candidates",
+                         height=320, margin=dict(t=30, b=40))
+    return figure
+
+def skill_coverage_figure(candidates: List[Dict[str, Any]], job_skills: List[str]) -> go.Figure:
+    """Heatmap of job-skill coverage across overall-score bands"""
+    skills, coverage, edges = skill_coverage(candidates, job_skills)
+    figure = go.Figure(go.Heatmap(
+        z=np.round(coverage * 100, 1), x=_bin_labels(edges), y=skills, colorscale='Blues',
+        zmin=0, zmax=100, colorbar=dict(title="% with skill"),
+        hovertemplate="%{y} · score %{x}: %{z}%<extra></extra>"
+    ))
+    figure.update_layout(xaxis_title="Overall score band", height=max(260, 22 * len(skills) + 80),
+                         margin=dict(t=30, b=40))
+    return figure
+
+def experience_figures(candidates: List[Dict[str, Any]]) -> Tuple[go.Figure, go.Figure]:
+    """Experience-level bar chart and years-of-experience histogram, from one pass over the pool"""
+    distribution = experience_distribution(candidates)
+    levels = go.Figure(go.Bar(x=list(distribution['levels']), y=list(distribution['levels'].values())))
+    levels.update_layout(xaxis_title="Experience level", yaxis_title="Candidates", height=320,
+                         margin=dict(t=30, b=40))
+    edges = distribution['year_edges']
+    labels = _bin_labels(edges)
+    # The last bin also holds everyone above MAX_EXPERIENCE_YEARS
+    labels[-1] = f"{edges[-2]:g}+"
+    years = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2, y=distribution['year_counts'], width=edges[1] - edges[0],
+        customdata=labels, hovertemplate="%{customdata} years: %{y} candidates<extra></extra>"
+    ))
+    years.update_layout(xaxis_title="Years of experience", yaxis_title="Candidates", height=320,
+                        margin=dict(t=30, b=40))
+    return levels, years
+
+def render_pool_charts(candidates: List[Dict[str, Any]], job_skills: List[str]):
+    """Render the aggregated pool charts"""
+    if not candidates:
+        return
+    levels_figure, years_figure = experience_figures(candidates)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Score distribution**")
+        st.plotly_chart(score_histogram_figure(candidates), use_container_width=True)
+        st.markdown("**Years of experience**")
+        st.plotly_chart(years_figure, use_container_width=True)
+    with col2:
+        st.markdown("**Experience levels**")
+        st.plotly_chart(levels_figure, use_container_width=True)
+    if job_skills:
+        st.markdown("**Skill coverage by score band**")
+        st.plotly_chart(skill_coverage_figure(candidates, job_skills), use_container_width=True)
@@ -0,0 +1,14 @@
+import streamlit as st
+
+def fragment(func):
+    """Rerun ``func`` on its own when its widgets change (st.fragment), or as part of the page on older Streamlit"""
+    decorator = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+    return decorator(func) if decorator else func
+
+def session_cached(key: str, version, build):
+    """Value of ``build()`` kept in session state until ``version`` changes, so reruns do not recompute it"""
+    entry = st.session_state.get(key)
+    if entry is None or entry[0] != version:
+        entry = (version, build())
+        st.session_state[key] = entry
+    return entry[1]
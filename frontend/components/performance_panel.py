@@ -0,0 +1,27 @@
+import streamlit as st
+from backend.metrics import metrics
+
+def render_performance_panel():
+    """Render the latest run's per-stage timing breakdown in the sidebar"""
+    with st.sidebar.expander("⏱️ Performance", expanded=False):
+        last_run = metrics.get_last_run()
+        if not last_run:
+            st.caption("No analysis has run yet in this server process.")
+            return
+
+        st.write(f"**Last run:** {last_run['duration']:.2f}s")
+        st.table([
+            {
+                'Stage': stage['stage'].replace('_', ' ').title(),
+                'Seconds': f"{stage['seconds']:.3f}",
+                'Calls': stage['calls'],
+            }
+            for stage in last_run['stages']
+        ])
+
+        counters = last_run['counters']
+        st.caption(
+            f"📄 {counters['files']} files · {counters['pages']} pages · "
+            f"{counters['bytes'] / 1024:.0f} KB · {counters['cache_hits']} cache hits · "
+            f"{counters['duplicates']} duplicates · {counters['parse_failures']} parse failures"
+        )
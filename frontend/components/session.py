@@ -0,0 +1,8 @@
+import uuid
+import streamlit as st
+
+def session_id() -> str:
+    """Stable id of the current browser session, used to queue its backend work fairly"""
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return st.session_state.session_id
@@ -3,14 +3,69 @@
 import streamlit as st
 import pandas as pd
 import os
-from backend.resume_parser import ResumeParser
+import hashlib
 from backend.job_matcher import JobMatcher
-from config.settings import EXPORT_DIR
+from backend.metrics import metrics
+from backend.analysis_executor import get_executor
+from backend.history_store import HistoryStore
+from frontend.components.session import session_id
+from frontend.components.charts import render_pool_charts
 import re
 
-parser = ResumeParser()
+# Shared by all sessions: only skill extraction and scoring run here, parsing goes to the executor pool
 matcher = JobMatcher()
 
+def _session_cache(name):
+    """Dict kept in this session's state, surviving script reruns"""
+    if name not in st.session_state:
+        st.session_state[name] = {}
+    return st.session_state[name]
+
+def _cached_job_skills(jd_text, job_title):
+    """Extract JD skills once per distinct job description"""
+    cache = _session_cache('jd_skills_cache')
+    key = (hashlib.sha256(jd_text.encode('utf-8')).hexdigest(), job_title)
+    if key not in cache:
+        cache[key] = matcher.extract_skills_from_job_description(jd_text, job_title=job_title)
+    return cache[key]
+
+def _cached_candidates(resume_files, job_skills):
+    """Parse each upload once per session, keyed by its content hash and the job skills
+
+    Returns the candidates and the cache keys they came from.
+    """
+    cache = _session_cache('upload_parse_cache')
+    skills_key = tuple(job_skills)
+    keys, misses = [], {}
+    for f in resume_files:
+        data = f.getvalue()
+        key = (hashlib.sha256(data).hexdigest(), f.name, skills_key)
+        keys.append(key)
+        if key in cache:
+            metrics.increment('cache_hits')
+        else:
+            misses[key] = (f.name, data)
+
+    # New uploads are parsed in the shared process pool, queued fairly with other sessions;
+    # parses still queued from a rerun this session abandoned are dropped first
+    if misses:
+        executor = get_executor()
+        executor.cancel_session(session_id())
+        parsed = executor.parse_uploads(session_id(), list(misses.values()), job_skills)
+        cache.update(zip(misses, parsed))
+
+    # Scoring adds fields to the candidate, so hand out copies
+    return [dict(cache[key]) for key in keys], keys
+
+def _record_run(jd_text, job_skills, ranked_candidates, fingerprint):
+    """Store the ranking in the history once; reruns with the same uploads reuse the run"""
+    runs = _session_cache('recorded_runs')
+    if fingerprint not in runs:
+        runs[fingerprint] = HistoryStore().record_run(
+            jd_text, job_skills, ranked_candidates, "AI Engineer", fingerprint=fingerprint
+        )
+    return runs[fingerprint]
+
 def render_analysis_page():
     st.subheader("📄 Upload Job Description (.txt)")
     jd_file = st.file_uploader("📂 Upload Job Description File", type=['txt'])
@@ -20,7 +75,7 @@ def render_analysis_page():
         st.text_area("📋 Job Description Preview", jd_text, height=180)
 
         # Extract job and skills
-        job_skills = matcher.extract_skills_from_job_description(jd_text, job_title="AI Engineer")
+        job_skills = _cached_job_skills(jd_text, "AI Engineer")
         st.session_state['job_skills'] = job_skills
 
         st.markdown("### 📌 Extracted Skills:")
@@ -50,35 +105,24 @@ def render_analysis_page():
         resume_files = st.file_uploader("📂 Upload Candidate Resumes (PDF/DOCX)", accept_multiple_files=True)
 
         if resume_files:
-            candidates = []
-            for f in resume_files:
-                candidate = parser.parse_resume(f.read(), f.name)
-                if candidate:
-                    candidates.append(candidate)
+            # Reruns (slider, expander, ...) reuse the parsed uploads
+            candidates, parse_keys = _cached_candidates(resume_files, job_skills)
 
-            if not candidates:
+            # Score and rank (drops resumes that could not be parsed)
+            ranked_candidates = matcher.score_candidates(candidates, job_skills)
+            if not ranked_candidates:
                 st.error("❌ No valid resumes parsed.")
                 return
 
-            # Calculate project relevance
-            for candidate in candidates:
-                projects = candidate.get('projects', [])
-                candidate['project_relevance'] = matcher.calculate_project_relevance(projects, job_skills)
-                
-                # Calculate overall score
-                candidate['overall_score'] = matcher.calculate_overall_score(candidate)
-
-            # Rank candidates
-            ranked_candidates = matcher.rank_candidates(candidates)
             df = pd.DataFrame(ranked_candidates).sort_values(by="overall_score", ascending=False)
 
             st.markdown("## 🧠 Candidate Analysis Result")
             st.dataframe(df, use_container_width=True)
 
-            # Save results
-            out_path = EXPORT_DIR / "shortlist.csv"
-            df.to_csv(out_path, index=False)
-            st.success(f"✅ Shortlist saved to `{out_path.name}`")
+            # Save the run (the ranking is fully determined by the parsed uploads and the JD skills)
+            fingerprint = hashlib.sha256(repr((sorted(parse_keys), job_skills)).encode('utf-8')).hexdigest()
+            run_id = _record_run(jd_text, job_skills, ranked_candidates, fingerprint)
+            st.success(f"✅ Saved as run #{run_id} in the analysis history")
 
             # Show top candidate details
             if not df.empty:
@@ -94,9 +138,8 @@ def render_analysis_page():
                     with st.expander("🌟 Best Project Implementation"):
                         st.write(best_project)
                 
-                # Show score comparison
+                # Pool overview, binned so it stays readable for thousands of candidates
                 st.subheader("📊 Score Comparison")
-                chart_data = df[['name', 'overall_score', 'project_relevance', 'skill_match']].set_index('name')
-                st.bar_chart(chart_data)
+                render_pool_charts(ranked_candidates, job_skills)
         else:
             st.info("⬆️ Please upload resumes to proceed.")
\ No newline at end of file
@@ -0,0 +1,54 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from backend.job_queue import JobQueue, expand_resume_paths
+
+def render_batch_jobs_page():
+    """Submit large batches to the job queue and poll their progress"""
+    st.header("📦 Batch Jobs")
+    queue = JobQueue()
+
+    st.subheader("1. Submit a Batch")
+    if not st.session_state.get('job_description'):
+        st.info("Upload a job description on the Candidate Analysis page to submit a batch.")
+    else:
+        resume_dir = st.text_input("Resume folder on the server", placeholder="/data/resumes/requisition-42")
+        if st.button("📥 Queue Batch", type="primary", disabled=not resume_dir):
+            if not Path(resume_dir).is_dir():
+                st.error(f"Folder not found: {resume_dir}")
+            else:
+                paths = expand_resume_paths([resume_dir])
+                if not paths:
+                    st.warning("No .pdf or .docx files found in that folder.")
+                else:
+                    job_id = queue.submit_batch(
+                        st.session_state.job_description, paths, st.session_state.job_title or None
+                    )
+                    st.success(f"✅ Queued job #{job_id} with {len(paths)} resumes. "
+                               "Start workers with `python -m backend.job_queue work`.")
+
+    st.subheader("2. Job Progress")
+    st.button("🔄 Refresh")
+    jobs = queue.list_jobs()
+    if not jobs:
+        st.info("No batch jobs submitted yet.")
+        return
+
+    for job in jobs:
+        created = datetime.fromtimestamp(job['created_at']).strftime('%d %b %H:%M')
+        label = f"#{job['job_id']} {job['job_title']} · {created} · {job['progress']:.0f}%"
+        with st.expander(label, expanded=job is jobs[0]):
+            st.progress(job['progress'] / 100)
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Done", job['done'])
+            col2.metric("In Progress", job['leased'])
+            col3.metric("Pending", job['pending'])
+            col4.metric("Failed", job['failed'])
+
+            if job['done']:
+                ranking = queue.ranking(job['job_id'], limit=25)
+                df = pd.DataFrame(ranking['candidates'])[
+                    ['name', 'overall_score', 'skill_match', 'project_relevance', 'experience_years', 'file_name']
+                ]
+                st.dataframe(df, use_container_width=True)
@@ -1,9 +1,81 @@
 import streamlit as st
 import pandas as pd
+from datetime import datetime
+from backend.history_store import HistoryStore
 
-def download_results():
-    try:
-        df = pd.read_csv("exports/shortlist.csv")
-        st.download_button("Download Shortlist", df.to_csv(index=False), file_name="shortlist.csv")
-    except FileNotFoundError:
-        st.warning("No shortlist file found. Run analysis first.")
+RUN_COLUMNS = ['rank', 'name', 'overall_score', 'project_relevance', 'skill_match', 'experience_years', 'file_name']
+
+def _run_label(run):
+    created = datetime.fromtimestamp(run['created_at']).strftime('%d %b %Y %H:%M')
+    return f"#{run['id']} · {run['job_title'] or run['requisition']} · {created} · {run['total_candidates']} candidates"
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _run_export(run_id):
+    """A stored run and its ranking CSV (recorded runs do not change, so reruns reuse them)"""
+    store = HistoryStore()
+    run = store.get_run(run_id)
+    return run, store.export_csv(run_id) if run else None
+
+def download_results(run_id=None):
+    """Download button for a stored run's ranking (the latest run by default)"""
+    if run_id is None:
+        run_id = next((run['id'] for run in HistoryStore().runs(limit=1)), None)
+    run, csv_data = _run_export(run_id) if run_id else (None, None)
+    if run is None:
+        st.warning("No analysis runs found. Run analysis first.")
+        return
+    st.download_button(
+        "📥 Download Ranking (CSV)",
+        csv_data,
+        file_name=f"run_{run['id']}_{run['requisition'].replace(' ', '_')}.csv",
+        mime="text/csv",
+        key=f"download_run_{run['id']}"
+    )
+
+def render_history_page():
+    """Browse past analysis runs, a candidate's scores across runs and top scorers per skill"""
+    st.header("🗂️ Analysis History")
+    store = HistoryStore()
+
+    st.subheader("1. Past Runs")
+    requisitions = store.requisitions()
+    if not requisitions:
+        st.info("No analysis runs recorded yet.")
+        return
+    requisition = st.selectbox(
+        "Requisition", ["All"] + [r['requisition'] for r in requisitions],
+        format_func=lambda r: r if r == "All" else f"{r} ({next(q['runs'] for q in requisitions if q['requisition'] == r)} runs)"
+    )
+    runs = store.runs(None if requisition == "All" else requisition)
+    run = st.selectbox("Run", runs, format_func=_run_label)
+    if run:
+        st.caption("Skills: " + ", ".join(run['job_skills'][:20]))
+        ranking = store.run_candidates(run['id'])
+        st.dataframe(pd.DataFrame(ranking)[RUN_COLUMNS], use_container_width=True, hide_index=True)
+        download_results(run['id'])
+
+    st.subheader("2. Candidate History")
+    lookup = st.text_input("Find a candidate by name, email or file name")
+    if lookup:
+        matches = store.find_candidates(lookup)
+        if not matches:
+            st.info("No stored candidate matches.")
+        else:
+            candidate = st.selectbox(
+                "Candidate", matches,
+                format_func=lambda c: f"{c['name']} · {c['email']} · {c['runs']} runs · best {c['best_score']}"
+            )
+            history = pd.DataFrame(store.candidate_history(candidate['candidate_hash']))
+            history['date'] = pd.to_datetime(history['created_at'], unit='s').dt.strftime('%Y-%m-%d %H:%M')
+            st.dataframe(history[['date', 'requisition', 'run_id', 'rank', 'overall_score', 'project_relevance',
+                                  'skill_match', 'file_name']], use_container_width=True, hide_index=True)
+
+    st.subheader("3. Top Scorers by Skill")
+    skill = st.text_input("Skill", placeholder="e.g. Python")
+    if skill:
+        leaders = store.top_scorers_for_skill(skill)
+        if leaders:
+            st.dataframe(pd.DataFrame(leaders)[['name', 'email', 'best_score', 'runs', 'file_name']],
+                         use_container_width=True, hide_index=True)
+        else:
+            st.info(f"No stored candidate lists {skill}.")
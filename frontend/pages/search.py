@@ -0,0 +1,46 @@
+import time
+import streamlit as st
+import pandas as pd
+from pathlib import Path
+from backend.job_queue import expand_resume_paths
+from backend.search_index import get_search_store, index_files
+from config.settings import SEARCH_TOP_K
+
+def render_search_page():
+    """Free-text BM25 search over every resume analysed or indexed so far"""
+    st.header("🔎 Resume Search")
+    store = get_search_store()
+    index = store.refresh()
+    st.caption(f"{len(index):,} resumes indexed · wrap exact phrases in quotes, "
+               "e.g. `kafka \"stream processing\" fintech`")
+
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        query = st.text_input("Search resumes", placeholder="kafka streaming fintech")
+    with col2:
+        top_k = st.number_input("Results", min_value=5, max_value=200, value=SEARCH_TOP_K, step=5)
+
+    if query:
+        start = time.perf_counter()
+        hits = index.search(query, int(top_k))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        st.markdown(f"**{len(hits)} results** in {elapsed_ms:.1f} ms")
+        if hits:
+            df = pd.DataFrame(hits)
+            df['matched_terms'] = df['matched_terms'].apply(', '.join)
+            df.insert(0, 'rank', range(1, len(df) + 1))
+            st.dataframe(df[['rank', 'name', 'score', 'matched_terms', 'file_name']],
+                         use_container_width=True, hide_index=True)
+        else:
+            st.info("No resumes match this query.")
+
+    with st.expander("📥 Index a resume folder"):
+        st.caption("Resumes are also indexed automatically whenever they are analysed.")
+        resume_dir = st.text_input("Resume folder on the server", placeholder="/data/resumes/archive")
+        if st.button("Index Folder", disabled=not resume_dir):
+            if not Path(resume_dir).is_dir():
+                st.error(f"Folder not found: {resume_dir}")
+            else:
+                with st.spinner("Indexing resumes..."):
+                    added = index_files(expand_resume_paths([resume_dir]), store)
+                st.success(f"✅ Indexed {added} new resumes.")
@@ -0,0 +1,101 @@
+import os
+import signal
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from backend.analysis_executor import AnalysisExecutor
+
+
+def _task(tag):
+    time.sleep(0.05)
+    return tag
+
+
+def _crash():
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+def test_pool_is_replaced_after_a_worker_dies():
+    executor = AnalysisExecutor(workers=1, max_in_flight=1)
+    try:
+        crashed = executor.submit('a', _crash)
+        queued = executor.submit('b', _task, 'b0')
+        with pytest.raises(BrokenProcessPool):
+            crashed.result(timeout=30)
+        # Only the task that was running fails; queued and later tasks run in the new pool
+        assert queued.result(timeout=30) == 'b0'
+        assert executor.submit('a', _task, 'a1').result(timeout=30) == 'a1'
+    finally:
+        executor.shutdown()
+
+
+def test_sessions_are_served_round_robin():
+    executor = AnalysisExecutor(workers=1, max_in_flight=1)
+    try:
+        finished = []
+        futures = [executor.submit('a', _task, f'a{i}') for i in range(4)]
+        futures += [executor.submit('b', _task, f'b{i}') for i in range(2)]
+        for future in futures:
+            future.add_done_callback(lambda done: finished.append(done.result()))
+        assert executor.pending('a') == 3 and executor.pending('b') == 2
+
+        assert [future.result(timeout=30) for future in futures] == ['a0', 'a1', 'a2', 'a3', 'b0', 'b1']
+        assert finished == ['a0', 'a1', 'b0', 'a2', 'b1', 'a3']
+        assert executor.pending() == 0
+    finally:
+        executor.shutdown()
+
+
+def test_cancelled_session_tasks_never_run():
+    executor = AnalysisExecutor(workers=1, max_in_flight=1)
+    try:
+        first = executor.submit('a', _task, 'a0')
+        queued = [executor.submit('a', _task, f'a{i}') for i in range(1, 3)]
+        assert executor.cancel_session('a') == 2
+        assert first.result(timeout=30) == 'a0'
+        assert all(future.cancelled() for future in queued)
+    finally:
+        executor.shutdown()
+
+
+def test_large_analysis_is_split_into_fairly_queued_chunks(tmp_path, monkeypatch):
+    import shutil
+    import backend.analysis_executor as analysis_executor
+    import backend.workers as workers
+    from backend.search_index import SearchStore
+
+    # Forked workers inherit the patched pool index path
+    monkeypatch.setattr(workers, 'DEDUP_INDEX_PATH', tmp_path / "pool.sqlite3")
+    store = SearchStore(tmp_path / "search")
+    monkeypatch.setattr(analysis_executor, 'get_search_store', lambda: store)
+    data = open("data/sample_resumes/sample_resume_1.pdf", "rb").read()
+    uploads = [(f"candidate_{i}.pdf", data) for i in range(6)]
+
+    executor = AnalysisExecutor(workers=1, max_in_flight=1)
+    try:
+        results = {}
+        thread = threading.Thread(target=lambda: results.update(executor.match_uploads(
+            'big', uploads, "Python developer with SQL", chunk_files=2)))
+        thread.start()
+        deadline = time.monotonic() + 30
+        while executor.pending('big') < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert executor.pending('big') == 2
+
+        # A small session is served before the big analysis's remaining chunks
+        small = executor.submit('small', _task, 'small')
+        big_waiting = []
+        small.add_done_callback(lambda done: big_waiting.append(executor.pending('big')))
+        assert small.result(timeout=60) == 'small'
+        assert big_waiting == [1]
+        thread.join(timeout=120)
+    finally:
+        executor.shutdown()
+
+    assert results['total_candidates'] == 6
+    duplicates = [c for c in results['candidates'] if c.get('is_duplicate')]
+    assert len(duplicates) == 5 and {c['duplicate_of'] for c in duplicates} == {'candidate_0.pdf'}
+    assert len(store.segment_names()) == 1 and len(store.refresh()) == 1
@@ -0,0 +1,44 @@
+import numpy as np
+
+from frontend.components.charts import (
+    score_histogram, skill_coverage, experience_distribution, experience_figures, SCORE_BINS, MAX_EXPERIENCE_YEARS
+)
+
+
+def _pool(size, seed=3):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            'overall_score': float(rng.uniform(0, 10)),
+            'project_relevance': float(rng.uniform(0, 10)),
+            'experience_years': int(rng.integers(0, 30)),
+            'experience_level': ['Fresher', 'Beginner', 'Intermediate', 'Expert'][int(rng.integers(0, 4))],
+            'skills': [s for s in ['python', 'docker', 'aws'] if rng.random() < 0.5],
+        }
+        for _ in range(size)
+    ]
+
+
+def test_aggregates_do_not_grow_with_the_pool():
+    small, large = _pool(10), _pool(5000)
+    for pool in (small, large):
+        counts, edges = score_histogram(pool, 'overall_score')
+        assert len(counts) == SCORE_BINS and counts.sum() == len(pool)
+        skills, coverage, _ = skill_coverage(pool, ['python', 'docker', 'aws', 'python'])
+        assert skills == ['python', 'docker', 'aws'] and coverage.shape == (3, 5)
+        distribution = experience_distribution(pool)
+        assert sum(distribution['levels'].values()) == len(pool)
+        assert distribution['year_counts'].sum() == len(pool)
+        _, years_figure = experience_figures(pool)
+        assert len(years_figure.data[0].y) == MAX_EXPERIENCE_YEARS and sum(years_figure.data[0].y) == len(pool)
+
+
+def test_skill_coverage_is_a_share_per_band():
+    pool = [
+        {'overall_score': 1.0, 'skills': ['python']},
+        {'overall_score': 1.5, 'skills': []},
+        {'overall_score': 9.0, 'skills': ['python', 'python']},
+    ]
+    skills, coverage, _ = skill_coverage(pool, ['python'], bands=2)
+    assert coverage.tolist() == [[0.5, 1.0]]
+    assert np.isnan(skill_coverage(pool[:1], ['python'], bands=2)[1][0, 1])
@@ -0,0 +1,78 @@
+import docx
+
+from backend.dedup import DuplicateIndex
+from backend.resume_parser import ResumeParser
+
+BASE_LINES = [
+    "Jane Doe - Backend Engineer - jane@example.com",
+    "Summary: 4 years of experience building web services in Python and Go.",
+    "Developed a payment service using Flask and PostgreSQL, cutting latency by 40%",
+    "Built a data pipeline with Kafka and Spark processing 2 million events per day",
+    "Implemented CI/CD with Jenkins and Docker for twelve microservices",
+    "Designed a REST API gateway with OAuth and JWT authentication for mobile clients",
+    "Skills: Python, Flask, Docker, Kubernetes, PostgreSQL, Redis, AWS, Git",
+]
+
+def _write(path, lines):
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(str(path))
+    return str(path)
+
+def test_exact_and_near_duplicates_are_flagged(tmp_path):
+    original = _write(tmp_path / "jane_doe.docx", BASE_LINES)
+    renamed = _write(tmp_path / "agency_cv_0193.docx", BASE_LINES)
+    edited = _write(tmp_path / "jane_doe_v2.docx", BASE_LINES[:-1] + [BASE_LINES[-1] + ", Terraform"])
+    other = _write(tmp_path / "john_smith.docx", [
+        "John Smith - Data Analyst", "Created dashboards in Tableau for the finance team",
+        "Skills: Excel, SQL, Tableau",
+    ])
+
+    index = DuplicateIndex()
+    candidates = ResumeParser().parse_multiple_resumes(
+        [original, renamed, edited, other], ["python", "docker", "sql"], index
+    )
+    by_file = {c['file_name']: c for c in candidates}
+
+    assert not by_file['jane_doe.docx'].get('is_duplicate')
+    assert by_file['agency_cv_0193.docx']['duplicate_type'] == 'exact'
+    assert by_file['agency_cv_0193.docx']['name'] == 'Agency Cv 0193'
+    assert by_file['jane_doe_v2.docx']['duplicate_type'] == 'near'
+    assert by_file['jane_doe_v2.docx']['duplicate_of'] == 'jane_doe.docx'
+    assert by_file['jane_doe_v2.docx']['skills'] == by_file['jane_doe.docx']['skills']
+    assert not by_file['john_smith.docx'].get('is_duplicate')
+
+def test_pool_index_persists_across_batches(tmp_path):
+    path = tmp_path / "pool.sqlite3"
+    first = _write(tmp_path / "jane_doe.docx", BASE_LINES)
+    index = DuplicateIndex.load_or_create(path)
+    ResumeParser().parse_multiple_resumes([first], ["python"], index)
+    index.save()
+
+    later = _write(tmp_path / "j_doe_resume.docx", BASE_LINES)
+    reloaded = DuplicateIndex.load_or_create(path)
+    assert len(reloaded) == 1
+    candidates = ResumeParser().parse_multiple_resumes([first, later], ["python", "aws"], reloaded)
+
+    # Re-analysing the same file is a cache hit; the renamed copy is a duplicate
+    assert not candidates[0].get('is_duplicate')
+    assert sorted(candidates[0]['skills']) == ["aws", "python"]
+    assert candidates[1]['duplicate_of'] == 'jane_doe.docx'
+
+def test_concurrent_writers_keep_each_others_entries(tmp_path):
+    path = tmp_path / "pool.sqlite3"
+    ui, daemon = DuplicateIndex.load_or_create(path), DuplicateIndex.load_or_create(path)
+    other = BASE_LINES[:2] + ["Led the migration of a monolith to Go services on GKE"] * 3
+    ui.add("jane_doe.docx", {'name': 'Jane Doe'}, ("python",), text="\n".join(BASE_LINES))
+    daemon.add("john_roe.docx", {'name': 'John Roe'}, (), text="\n".join(other))
+    ui.save()
+    daemon.save()
+    ui.save()
+
+    # Each writer picked up the other's entry instead of overwriting it
+    assert len(ui) == len(daemon) == 2
+    reloaded = DuplicateIndex.load_or_create(path)
+    assert sorted(entry['file_name'] for entry in reloaded.entries) == ["jane_doe.docx", "john_roe.docx"]
+    assert reloaded.find("\n".join(BASE_LINES))['skills_key'] == ("python",)
+    assert reloaded.find("\n".join(other))['match_type'] == 'exact'
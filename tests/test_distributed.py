@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+
+import pytest
+
+from backend.distributed import ShardCoordinator, serve_coordinator, connect, run_shard_worker
+from backend.job_matcher import JobMatcher
+from benchmarks.synthetic import write_resume_corpus
+from config.settings import DIST_DEFAULT_AUTHKEY
+
+AUTHKEY = b'test-key'
+JOB_DESCRIPTION = 'Python, Django, PostgreSQL, Redis and Docker'
+
+
+def _claim_and_die(address):
+    """A worker that leases a shard and crashes without reporting back"""
+    coordinator = connect(address, AUTHKEY)
+    coordinator.register('doomed')
+    coordinator.claim('doomed')
+    os._exit(1)
+
+
+def _worker(address, worker_id):
+    run_shard_worker(address, AUTHKEY, worker_id, poll_interval=0.1, heartbeat_interval=0.2)
+
+
+def test_shards_of_dead_workers_are_redispatched(tmp_path):
+    paths = write_resume_corpus(tmp_path, 14)
+    coordinator = ShardCoordinator(JOB_DESCRIPTION, paths, shard_size=3, top_k=5, lease_seconds=1)
+    address, _ = serve_coordinator(coordinator, '127.0.0.1', 0, AUTHKEY)
+
+    doomed = multiprocessing.Process(target=_claim_and_die, args=(address,))
+    doomed.start()
+    doomed.join()
+    assert coordinator.progress()['leased'] == 1
+
+    workers = [multiprocessing.Process(target=_worker, args=(address, f'w{i}')) for i in range(3)]
+    for worker in workers:
+        worker.start()
+    assert coordinator.wait(timeout=60)
+    for worker in workers:
+        worker.join(timeout=30)
+
+    progress = coordinator.progress()
+    assert progress['done'] == 5 and progress['failed'] == 0 and progress['scored'] == 14
+
+    expected = JobMatcher().match_resumes_to_job(paths, JOB_DESCRIPTION)['candidates']
+    expected = sorted(expected, key=lambda c: JobMatcher.rank_key(c) + (c['file_name'],))[:5]
+    results = coordinator.results()
+    assert [c['file_name'] for c in results['candidates']] == [c['file_name'] for c in expected]
+    assert 'raw_text' not in results['candidates'][0]
+
+
+def test_wait_returns_when_every_worker_is_gone(tmp_path):
+    paths = write_resume_corpus(tmp_path, 4)
+    coordinator = ShardCoordinator(JOB_DESCRIPTION, paths, shard_size=2, lease_seconds=0.5, max_attempts=3)
+    address, _ = serve_coordinator(coordinator, '127.0.0.1', 0, AUTHKEY)
+
+    doomed = multiprocessing.Process(target=_claim_and_die, args=(address,))
+    doomed.start()
+    doomed.join()
+
+    # No worker is left to claim the expired lease or the other shard
+    assert coordinator.wait(timeout=30, poll_interval=0.1)
+    progress = coordinator.progress()
+    assert progress['failed'] == 2 and progress['leased'] == progress['pending'] == 0
+    assert sorted(coordinator.results()['failed_files']) == sorted(os.path.basename(p) for p in paths)
+
+
+def test_default_key_is_refused_off_loopback(tmp_path):
+    coordinator = ShardCoordinator(JOB_DESCRIPTION, write_resume_corpus(tmp_path, 1))
+    with pytest.raises(ValueError, match='HR_DIST_AUTHKEY'):
+        serve_coordinator(coordinator, '0.0.0.0', 0, DIST_DEFAULT_AUTHKEY)
+    address, _ = serve_coordinator(coordinator, '127.0.0.1', 0, DIST_DEFAULT_AUTHKEY)
+    assert address[0] == '127.0.0.1'
@@ -0,0 +1,42 @@
+import zipfile
+
+import docx
+
+from backend.docx_stream import extract_docx_text
+from backend.resume_parser import ResumeParser
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+MC = 'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+
+def test_extracts_tables_and_headers(tmp_path):
+    path = tmp_path / "jane_doe.docx"
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "Jane Doe | jane@example.com"
+    document.add_paragraph("Built a data pipeline using Python")
+    table = document.add_table(rows=1, cols=2)
+    table.rows[0].cells[0].text = "Kubernetes"
+    table.rows[0].cells[1].text = "Terraform"
+    document.save(str(path))
+
+    text = extract_docx_text(str(path))
+    assert text.index("Jane Doe") < text.index("Built a data pipeline")
+    assert "Kubernetes" in text and "Terraform" in text
+
+    candidate = ResumeParser().parse_resume(str(path), ["python", "kubernetes", "terraform"])
+    assert sorted(candidate['skills']) == ["kubernetes", "python", "terraform"]
+
+def test_text_boxes_are_read_once(tmp_path):
+    body = (
+        f'<w:document {W} {MC}><w:body><w:p><w:r><mc:AlternateContent>'
+        '<mc:Choice Requires="wps"><w:txbxContent><w:p><w:r><w:t>Docker</w:t></w:r></w:p></w:txbxContent></mc:Choice>'
+        '<mc:Fallback><w:txbxContent><w:p><w:r><w:t>Docker</w:t></w:r></w:p></w:txbxContent></mc:Fallback>'
+        '</mc:AlternateContent></w:r><w:r><w:t xml:space="preserve">Skills</w:t><w:tab/><w:t>AWS</w:t></w:r></w:p>'
+        '</w:body></w:document>'
+    )
+    path = tmp_path / "text_box.docx"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("word/document.xml", body)
+
+    text = extract_docx_text(str(path))
+    assert text.count("Docker") == 1
+    assert "Skills\tAWS" in text
@@ -0,0 +1,45 @@
+from datetime import date
+
+from backend.experience_timeline import parse_timeline, experience_summary
+from backend.resume_parser import ResumeParser
+
+TODAY = date(2024, 6, 15)
+
+def test_date_ranges_in_common_formats():
+    text = """Acme Corp - Backend Engineer, Jan 2019 – Present
+Beta Ltd 2015-2017
+Gamma Inc 03/2012 to 06/2013
+Delta, Sept. 2010 - Aug '11
+Epsilon 2009-03 to 2009-08
+"""
+    summary = experience_summary(parse_timeline(text), TODAY)
+    assert summary['experience_periods'] == [
+        '2009-03 to 2009-08', '2010-09 to 2011-08', '2012-03 to 2013-06', '2015-01 to 2016-12', '2019-01 to 2024-06',
+    ]
+    assert summary['experience_months'] == 6 + 12 + 16 + 24 + 66
+
+def test_overlaps_are_merged_and_stray_numbers_ignored():
+    text = """Summary
+Engineer with 5+ years of experience. Shipped a 2 years roadmap, 20+ yrs of legacy code.
+Experience
+Acme, Mar 2018 - Dec 2019 (ticket 2019-2020-123)
+Beta, June 2019 – Feb 2021
+"""
+    summary = experience_summary(parse_timeline(text), TODAY)
+    assert summary['experience_months'] == 36
+    assert summary['experience_years'] == 3
+    assert summary['declared_experience_years'] == 5
+
+def test_candidates_report_computed_and_declared_experience():
+    resume = """Jane Doe
+Summary
+Backend engineer with 10 years of experience.
+Work Experience
+Developed billing services in Python, Jan 2020 - Dec 2022
+Education
+B.Sc Computer Science 2012 - 2016
+"""
+    candidate = ResumeParser().parse_text(resume, "jane_doe.docx", ["python"])
+    assert candidate['experience_months'] == 36 and candidate['experience_years'] == 3
+    assert candidate['declared_experience_years'] == 10
+    assert candidate['experience_periods'] == ['2020-01 to 2022-12']
@@ -0,0 +1,70 @@
+import random
+import string
+
+from backend.fuzzy_skills import FuzzySkillMatcher, edit_distance
+from backend.job_matcher import JobMatcher
+from backend.resume_parser import ResumeParser
+from backend.skill_taxonomy import get_taxonomy
+
+def test_misspellings_and_variants_are_reported_as_fuzzy():
+    parser = ResumeParser()
+    matches = parser.match_skills("Skills: Pyhton, Postgre SQL, ReactJS, Node JS and Kubernets")
+    assert matches == {
+        'python': 'fuzzy', 'javascript': 'exact', 'sql': 'exact', 'react': 'exact', 'node.js': 'exact',
+        'postgresql': 'fuzzy', 'kubernetes': 'fuzzy',
+    }
+    assert parser.match_skills("Pyhton and SQL", ['python', 'sql', 'docker']) == {'python': 'fuzzy', 'sql': 'exact'}
+
+    # Ordinary words near a skill name are left alone
+    text = "Led sprint planning, tuned string parsing, scaled the scalar nodes and expressed results"
+    assert parser.match_skills(text) == {}
+
+def test_english_words_near_skill_names_are_not_credited():
+    parser = ResumeParser()
+    assert parser.match_skills("The system reacts to events") == {}
+    text = "Sent postmen schedules, studied Jupiter's moons, wore dockers and sold jerkins and pythons"
+    assert parser.match_skills(text) == {}
+    matcher = FuzzySkillMatcher(get_taxonomy())
+    for word in ["reacts", "reacted", "reacting", "dockers", "springy", "pythons", "postmen", "jupiter", "jerkins"]:
+        assert matcher.lookup(word) is None, word
+    # Misspellings are still corrected
+    assert matcher.lookup("jenkin") is not None and matcher.lookup("pyhton") is not None
+
+def test_fuzzy_matches_get_partial_credit():
+    candidate = ResumeParser().parse_text("Projects\nBuilt an API in Pyhton and SQL\n", "ada.pdf", ['python', 'sql'])
+    assert candidate['skills'] == ['python', 'sql'] and candidate['fuzzy_skills'] == ['python']
+    assert candidate['skill_match'] == 1.8
+
+    exact = ResumeParser().parse_text("Projects\nBuilt an API in Python and SQL\n", "bob.pdf", ['python', 'sql'])
+    matcher = JobMatcher()
+    assert matcher.calculate_overall_score(exact) > matcher.calculate_overall_score(candidate)
+
+def test_symmetric_delete_lookup_agrees_with_brute_force():
+    taxonomy = get_taxonomy()
+    matcher = FuzzySkillMatcher(taxonomy)
+    keys = sorted(matcher.compact_ids)
+    rng = random.Random(5)
+    for _ in range(2000):
+        word = list(rng.choice(keys))
+        for _ in range(rng.randint(0, 2)):
+            position = rng.randrange(1, len(word) + 1)
+            edit = rng.choice('sid')
+            if edit == 's' and position < len(word):
+                word[position] = rng.choice(string.ascii_lowercase)
+            elif edit == 'i':
+                word.insert(position, rng.choice(string.ascii_lowercase))
+            elif position < len(word):
+                del word[position]
+        token = ''.join(word)
+
+        expected = None
+        if token in matcher.compact_ids:
+            expected = (matcher.compact_ids[token], 0) if len(token) >= 4 else None
+        elif (matcher.allowed_distance(len(token)) and token not in taxonomy.fuzzy_ignore
+              and not matcher.is_inflection(token)):
+            scored = sorted(
+                (edit_distance(token, key, 9), key) for key in keys
+                if key[0] == token[0] and edit_distance(token, key, 9) <= matcher.allowed_distance(len(key))
+            )
+            expected = (matcher.compact_ids[scored[0][1]], scored[0][0]) if scored else None
+        assert matcher.lookup(token) == expected, token
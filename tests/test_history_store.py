@@ -0,0 +1,66 @@
+import csv
+import io
+import sqlite3
+
+from backend.history_store import HistoryStore
+
+def _candidate(name, score, skills, content_hash):
+    return {
+        'name': name, 'email': f'{name.lower()}@example.com', 'phone': 'Not provided',
+        'file_name': f'{name.lower()}.pdf', 'overall_score': score, 'project_relevance': score / 2,
+        'skill_match': len(skills), 'experience_years': 2, 'experience_level': 'Beginner',
+        'projects_count': 1, 'skills': skills, 'content_hash': content_hash,
+    }
+
+def test_runs_are_queryable_by_candidate_skill_and_requisition(tmp_path):
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    ada = _candidate('Ada', 8.5, ['Python', 'SQL'], 'h-ada')
+    bob = _candidate('Bob', 6.0, ['Java'], 'h-bob')
+    first = store.record_run("Backend role", ['Python', 'SQL'], [ada, bob], "Backend Engineer", fingerprint='f1')
+    second = store.record_run("Data role", ['Python'], [dict(ada, overall_score=7.0)], "Data Engineer")
+
+    # The same uploads and skills are stored once
+    assert store.record_run("Backend role", ['Python', 'SQL'], [ada, bob], "Backend Engineer", fingerprint='f1') == first
+
+    history = store.candidate_history('h-ada')
+    assert [(row['run_id'], row['overall_score']) for row in history] == [(second, 7.0), (first, 8.5)]
+    assert [row['requisition'] for row in history] == ['data engineer', 'backend engineer']
+
+    leaders = store.top_scorers_for_skill('python')
+    assert [(row['name'], row['best_score'], row['runs']) for row in leaders] == [('Ada', 8.5, 2)]
+    assert [run['id'] for run in store.runs('backend engineer')] == [first]
+
+    store.delete_run(first)
+    assert [(row['name'], row['best_score'], row['runs']) for row in store.top_scorers_for_skill('python')] == [('Ada', 7.0, 1)]
+    assert store.top_scorers_for_skill('java') == []
+
+    rows = list(csv.DictReader(io.StringIO(store.export_csv(second))))
+    assert [(row['rank'], row['name'], row['skills']) for row in rows] == [('1', 'Ada', 'Python; SQL')]
+
+def test_a_resume_uploaded_twice_counts_once_per_run(tmp_path):
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    ada = dict(_candidate('Ada', 8.5, ['Python'], 'h-ada'), skill_match=0.8)
+    copy = dict(ada, file_name='ada_copy.pdf', overall_score=8.0)
+    first = store.record_run("Backend role", ['Python'], [ada, copy])
+    assert [(row['best_score'], row['runs']) for row in store.top_scorers_for_skill('python')] == [(8.5, 1)]
+    assert store.candidate_history('h-ada')[0]['skill_match'] == 0.8
+
+    second = store.record_run("Data role", ['Python'], [copy, ada])
+    assert store.top_scorers_for_skill('python')[0]['runs'] == 2
+    store.delete_run(second)
+    assert store.top_scorers_for_skill('python')[0]['runs'] == 1
+    store.delete_run(first)
+    assert store.top_scorers_for_skill('python') == []
+
+def test_history_queries_use_indexes(tmp_path):
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    conn = sqlite3.connect(store.db_path)
+    plans = {
+        'candidate': "SELECT * FROM run_candidates WHERE candidate_hash = 'x'",
+        'skill': "SELECT * FROM skill_leaders WHERE skill = 'x' ORDER BY best_score DESC LIMIT 20",
+        'requisition': "SELECT * FROM runs WHERE requisition = 'x' ORDER BY created_at DESC",
+        'date': "SELECT * FROM runs WHERE created_at >= 0",
+    }
+    for name, query in plans.items():
+        plan = ' '.join(row[-1] for row in conn.execute(f'EXPLAIN QUERY PLAN {query}'))
+        assert 'USING' in plan and 'INDEX' in plan, (name, plan)
@@ -0,0 +1,80 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+import uuid
+
+import pytest
+
+from backend.http_service import MatchingService, create_server
+
+def _multipart(fields, files):
+    boundary = uuid.uuid4().hex
+    body = b''
+    for name, value in fields.items():
+        body += (f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n').encode()
+    for name, file_name, data in files:
+        body += (f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{file_name}"\r\n'
+                 f'Content-Type: application/octet-stream\r\n\r\n').encode() + data + b'\r\n'
+    body += f'--{boundary}--\r\n'.encode()
+    return body, f'multipart/form-data; boundary={boundary}'
+
+@pytest.fixture(scope="module")
+def server():
+    service = MatchingService(workers=1, max_queued_files=2)
+    httpd = create_server('127.0.0.1', 0, service)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    service.close()
+
+def _post(server, path, body, content_type):
+    request = urllib.request.Request(
+        f'http://127.0.0.1:{server.server_port}{path}', data=body, headers={'Content-Type': content_type}
+    )
+    return urllib.request.urlopen(request, timeout=30)
+
+def test_match_endpoint_ranks_uploaded_resumes(server):
+    with open("data/sample_resumes/sample_resume_1.pdf", "rb") as f:
+        resume = f.read()
+    body, content_type = _multipart(
+        {'job_description': 'Python developer with SQL and Flask', 'job_title': 'Backend Engineer'},
+        [('resumes', 'jane_doe.pdf', resume)],
+    )
+    response = _post(server, '/match', body, content_type)
+    results = json.loads(response.read())
+    assert response.status == 200
+    assert results['total_candidates'] == 1
+    assert results['candidates'][0]['file_name'] == 'jane_doe.pdf'
+
+def test_match_endpoint_rejects_when_saturated(server):
+    service = server.RequestHandlerClass.service
+    body, content_type = _multipart(
+        {'job_description': 'Python developer'}, [('resumes', 'r0.pdf', b'%PDF-')],
+    )
+    service._reserve(2)
+    try:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            _post(server, '/match', body, content_type)
+    finally:
+        service._release()
+        service._release()
+    assert error.value.code == 429 and error.value.headers['Retry-After'] == '1'
+
+def test_match_endpoint_rejects_more_files_than_it_can_ever_queue(server):
+    body, content_type = _multipart(
+        {'job_description': 'Python developer'},
+        [('resumes', f'r{i}.pdf', b'%PDF-') for i in range(3)],
+    )
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _post(server, '/match', body, content_type)
+    # Retrying cannot help, so this is not a 429
+    assert error.value.code == 413 and 'Retry-After' not in error.value.headers
+    assert 'at most 2' in json.loads(error.value.read())['error']
+
+def test_mcq_endpoint(server):
+    body = json.dumps({'job_skills': ['python'], 'num_questions': 3}).encode()
+    response = _post(server, '/mcqs', body, 'application/json')
+    assert len(json.loads(response.read())['mcqs']) == 3
@@ -0,0 +1,82 @@
+import shutil
+
+import pytest
+
+import backend.job_queue as job_queue
+from backend.job_queue import JobQueue, run_worker
+from backend.search_index import SearchStore
+
+def _resumes(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"candidate_{i}.pdf"
+        shutil.copy("data/sample_resumes/sample_resume_1.pdf", path)
+        paths.append(str(path))
+    return paths
+
+@pytest.fixture(autouse=True)
+def search_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_queue, 'SearchStore', lambda: SearchStore(tmp_path / "search"))
+    return tmp_path / "search"
+
+def test_expired_lease_is_resumed_by_another_worker(tmp_path):
+    db = tmp_path / "jobs.sqlite3"
+    queue = JobQueue(db, lease_seconds=0)
+    job_id = queue.submit_batch("Python developer with SQL", _resumes(tmp_path, 3), "Backend Engineer")
+
+    # Worker A leases an item and "crashes" before checkpointing it
+    assert len(queue.claim("worker-a", limit=1)) == 1
+    assert queue.status(job_id)['leased'] == 1
+
+    assert run_worker(db, worker_id="worker-b") == 3
+    status = queue.status(job_id)
+    assert status['done'] == 3 and status['finished']
+
+    ranking = queue.ranking(job_id)
+    assert ranking['total_candidates'] == 3
+    assert len(ranking['shortlist']) == 3
+
+def test_restarted_worker_reclaims_its_own_leases(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite3", lease_seconds=3600)
+    job_id = queue.submit_batch("Python developer", _resumes(tmp_path, 2))
+    first = queue.claim("worker-a", limit=2)
+
+    # Live leases are not taken over, not even by a worker with the same id
+    assert queue.claim("worker-b", limit=2) == []
+    assert queue.claim("worker-a", limit=2) == []
+
+    assert queue.recover("worker-a") == 2
+    again = queue.claim("worker-a", limit=2)
+    assert [item['id'] for item in again] == [item['id'] for item in first]
+    assert queue.status(job_id)['pending'] == 0
+
+def test_exhausted_items_do_not_hide_runnable_ones(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite3", lease_seconds=0, max_attempts=1)
+    job_id = queue.submit_batch("Python developer", _resumes(tmp_path, 4))
+    # Three items are leased and abandoned with no attempts left, ahead of one pending item
+    exhausted = queue.claim("worker-a", limit=3)
+    assert len(exhausted) == 3
+
+    claimed = queue.claim("worker-b", limit=2)
+    assert len(claimed) == 1 and claimed[0]['id'] > max(item['id'] for item in exhausted)
+    status = queue.status(job_id)
+    assert status['failed'] == 3 and status['leased'] == 1
+
+def test_items_are_checkpointed_only_after_their_segment_is_written(tmp_path, search_store, monkeypatch):
+    db = tmp_path / "jobs.sqlite3"
+    queue = JobQueue(db)
+    job_id = queue.submit_batch("Python developer", _resumes(tmp_path, 3))
+
+    def crash(self, index):
+        raise OSError("disk full")
+    monkeypatch.setattr(SearchStore, 'write', crash)
+    with pytest.raises(OSError):
+        run_worker(db, worker_id="worker-a")
+    # Nothing was marked done, so the restarted worker parses and indexes the resumes again
+    assert queue.status(job_id)['done'] == 0
+
+    monkeypatch.undo()
+    monkeypatch.setattr(job_queue, 'SearchStore', lambda: SearchStore(search_store))
+    assert run_worker(db, worker_id="worker-a") == 3
+    # The fixtures are copies of one resume, so the index keeps a single document
+    assert len(SearchStore(search_store).refresh()) == 1
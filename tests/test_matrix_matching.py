@@ -0,0 +1,40 @@
+from backend.job_matcher import JobMatcher
+from benchmarks.synthetic import write_resume_corpus
+
+REQUISITIONS = [
+    {'id': 'backend', 'job_title': 'Backend Engineer', 'job_description': 'Python, Django, PostgreSQL, Redis and Docker'},
+    {'id': 'frontend', 'job_title': 'Frontend Engineer', 'job_description': 'React, TypeScript, GraphQL and Git'},
+    {'id': 'ml', 'job_title': 'AI Engineer', 'job_description': 'Machine learning with PyTorch, TensorFlow and AWS'},
+]
+
+def test_matrix_matches_single_requisition_scoring(tmp_path):
+    paths = write_resume_corpus(tmp_path, 6)
+    matcher = JobMatcher()
+    matrix = matcher.match_resumes_to_jobs(paths, REQUISITIONS, top_k=6)
+
+    assert len(matrix['score_matrix']) == 3 and len(matrix['score_matrix'][0]) == 6
+    for row, requisition in enumerate(REQUISITIONS):
+        single = JobMatcher().match_resumes_to_job(paths, requisition['job_description'], requisition['job_title'])
+        expected = [(c['file_name'], c['overall_score']) for c in single['candidates']]
+        actual = [(c['file_name'], c['overall_score']) for c in matrix['requisitions'][row]['top_candidates']]
+        assert actual == expected
+
+    best = matrix['candidates'][0]['best_fit']
+    assert best[0]['overall_score'] >= best[-1]['overall_score']
+
+
+def test_append_matches_full_reanalysis(tmp_path):
+    paths = write_resume_corpus(tmp_path, 8)
+    requisition = REQUISITIONS[0]
+    matcher = JobMatcher()
+    initial = matcher.match_resumes_to_job(paths[:5], requisition['job_description'], requisition['job_title'])
+    first = initial['candidates'][0]
+
+    appended = matcher.append_resumes_to_analysis(initial, paths[3:])
+    full = JobMatcher().match_resumes_to_job(paths, requisition['job_description'], requisition['job_title'])
+
+    assert [c['file_name'] for c in appended['candidates']] == [c['file_name'] for c in full['candidates']]
+    assert appended['total_candidates'] == 8 and len(appended['added_files']) == 3
+    assert len(appended['skipped_files']) == 2
+    assert appended['shortlist'] == appended['candidates'][:3]
+    assert first in appended['candidates'] and len(initial['candidates']) == 5
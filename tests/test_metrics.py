@@ -0,0 +1,29 @@
+from backend.job_matcher import JobMatcher
+from backend.metrics import PipelineMetrics, metrics
+from backend.text_cache import text_cache
+
+def test_timer_and_counters_feed_last_run():
+    pm = PipelineMetrics()
+    with pm.run("unit"):
+        with pm.timer("scoring"):
+            pm.increment("files", 2)
+    last_run = pm.get_last_run()
+    assert last_run['label'] == "unit"
+    assert last_run['counters']['files'] == 2
+    assert last_run['counters']['cache_hits'] == 0
+    scoring = [s for s in last_run['stages'] if s['stage'] == 'scoring'][0]
+    assert scoring['calls'] == 1
+    assert 'hr_assistant_files_total 2' in pm.to_prometheus()
+
+def test_match_resumes_records_pipeline_breakdown():
+    metrics.reset()
+    text_cache.clear()
+    with open("data/sample_resumes/sample_job_description.txt") as f:
+        job_description = f.read()
+    JobMatcher().match_resumes_to_job(["data/sample_resumes/sample_resume_1.pdf"], job_description)
+    last_run = metrics.get_last_run()
+    stages = {s['stage']: s['calls'] for s in last_run['stages']}
+    assert stages['text_extraction'] == 1
+    assert stages['ranking'] == 1
+    assert last_run['counters']['files'] == 1
+    assert last_run['counters']['pages'] >= 1
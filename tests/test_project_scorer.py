@@ -0,0 +1,30 @@
+import random
+
+from backend.job_matcher import JobMatcher
+from backend.project_scorer import ProjectDepthScorer
+from benchmarks.synthetic import SKILLS
+
+PHRASES = ['Developed', 'built', 'an API', 'using', 'with', 'via', 'Optimized latency by 40%',
+           'saved $300', 'at 3x speed', 'Architected and designed', 'Python', 'docker', 'REACT', 'plain text']
+
+
+def test_batched_scores_match_per_line_scoring():
+    rng = random.Random(7)
+    matcher = JobMatcher()
+    job_skills = ['python', 'docker', 'react', 'python', 'c']
+    pool = [
+        [' '.join(rng.choice(PHRASES + SKILLS) for _ in range(rng.randint(1, 10))) for _ in range(rng.randint(0, 4))]
+        for _ in range(40)
+    ]
+
+    flat = [project for projects in pool for project in projects]
+    scorer = ProjectDepthScorer(job_skills)
+    assert scorer.score_lines(flat) == [matcher.calculate_project_depth(p, job_skills) for p in flat]
+
+    legacy = [
+        min(sum(matcher.calculate_project_depth(p, job_skills) for p in projects) / len(projects) * 2, 10)
+        if projects else 0.0
+        for projects in pool
+    ]
+    assert scorer.score_pool(pool) == legacy
+    assert ProjectDepthScorer([]).score_pool(pool) == [0.0] * len(pool)
@@ -0,0 +1,61 @@
+import os
+import time
+import zipfile
+
+import pytest
+
+from backend.analysis_executor import AnalysisExecutor
+from backend.job_matcher import JobMatcher
+from backend.report_generator import ReportGenerator, prune_exports
+
+
+def _candidate(index):
+    return {
+        'name': f'Candidate <{index}>', 'email': f'c{index}@example.com', 'phone': '',
+        'file_name': f'c{index}.pdf', 'skills': ['python', 'docker'], 'skill_match': 2,
+        'experience_years': index, 'experience_level': 'Mid', 'projects_count': 1,
+        'projects': ['Built a search API using Python & Docker, cutting latency by 40%'],
+        'project_relevance': 6.0, 'overall_score': 5.0 + index / 10,
+    }
+
+
+def test_dossiers_are_streamed_into_one_zip(tmp_path):
+    matcher = JobMatcher()
+    analyses = [matcher.get_candidate_analysis(_candidate(i), ['python', 'docker', 'aws']) for i in range(5)]
+    zip_path = tmp_path / 'dossiers.zip'
+
+    with ReportGenerator(workers=2, max_in_flight=2) as generator:
+        names = generator.write_zip(analyses, zip_path, 'Backend Engineer')
+
+    assert names == [f'{rank:03d}_Candidate_{rank - 1}.pdf' for rank in range(1, 6)]
+    with zipfile.ZipFile(zip_path) as archive:
+        assert sorted(archive.namelist()) == names
+        assert all(archive.read(name).startswith(b'%PDF') for name in names)
+
+
+def test_failed_render_cancels_the_queued_ones(tmp_path):
+    matcher = JobMatcher()
+    analyses = [{}] + [matcher.get_candidate_analysis(_candidate(i), ['python']) for i in range(5)]
+    executor = AnalysisExecutor(workers=1, max_in_flight=1)
+    try:
+        generator = ReportGenerator(executor=executor, session_id='reports', max_in_flight=4)
+        submitted = []
+        submit = generator._submit
+        generator._submit = lambda *args: submitted.append(submit(*args)) or submitted[-1]
+        with pytest.raises(KeyError):
+            generator.write_zip(analyses, tmp_path / 'dossiers.zip')
+        # The render after the failed one may already be running; the ones queued behind it never run
+        assert len(submitted) == 4 and all(future.cancelled() for future in submitted[2:])
+    finally:
+        executor.shutdown()
+
+
+def test_old_exports_are_pruned(tmp_path):
+    old, new, other = tmp_path / 'dossiers_1.zip', tmp_path / 'dossiers_2.zip', tmp_path / 'results.csv'
+    for path in (old, new, other):
+        path.write_bytes(b'x')
+    stale = time.time() - 7200
+    os.utime(old, (stale, stale))
+    os.utime(other, (stale, stale))
+    assert prune_exports(tmp_path, 'dossiers_*.zip', max_age_seconds=3600) == 1
+    assert not old.exists() and new.exists() and other.exists()
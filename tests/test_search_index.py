@@ -0,0 +1,126 @@
+import math
+import random
+
+import pytest
+
+from backend.job_matcher import JobMatcher
+from backend.search_index import SearchIndex, SearchStore, encode_varints, decode_varints, tokenize
+from benchmarks.synthetic import write_resume_corpus
+
+
+def _corpus(count, seed=3):
+    rng = random.Random(seed)
+    vocabulary = [f'w{i}' for i in range(300)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    return [' '.join(rng.choices(vocabulary, weights, k=rng.randint(20, 120))) for _ in range(count)]
+
+
+def _brute_force(texts, query_terms, k1=1.2, b=0.75):
+    docs = [tokenize(text) for text in texts]
+    average = sum(map(len, docs)) / len(docs)
+    scores = []
+    for doc_id, tokens in enumerate(docs):
+        score = 0.0
+        for term in query_terms:
+            df = sum(term in d for d in docs)
+            tf = tokens.count(term)
+            if tf:
+                idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+                score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(tokens) / average))
+        if score:
+            scores.append((score, doc_id))
+    return [(round(score, 4), doc_id) for score, doc_id in sorted(scores, key=lambda hit: (-hit[0], hit[1]))]
+
+
+def test_varints_round_trip():
+    values = [0, 1, 127, 128, 300, 2 ** 21, 2 ** 40]
+    assert decode_varints(encode_varints(values)) == values
+
+
+@pytest.mark.parametrize('dense_postings', [10 ** 9, 0])
+def test_top_k_matches_exhaustive_bm25(monkeypatch, dense_postings):
+    # MaxScore with block skipping, then the NumPy path for common terms
+    monkeypatch.setattr('backend.search_index.SEARCH_DENSE_POSTINGS', dense_postings)
+    texts = _corpus(600)
+    index = SearchIndex(block_size=16)
+    for i, text in enumerate(texts):
+        index.add(text, file_name=f'{i}.pdf')
+
+    for query in ['w0 w150', 'w3 w40 w299', 'w7', 'w1 w2 w5 w90 w200']:
+        expected = _brute_force(texts, query.split())[:10]
+        hits = index.search(query, top_k=10)
+        assert [hit['score'] for hit in hits] == [score for score, _ in expected]
+        assert [hit['doc_id'] for hit in hits] == [doc_id for _, doc_id in expected]
+
+
+def test_phrases_are_required_and_positional():
+    index = SearchIndex(block_size=2)
+    index.add('built kafka stream processing for a fintech', file_name='a.pdf')
+    index.add('stream of kafka processing jobs', file_name='b.pdf')
+    index.add('fintech payments', file_name='c.pdf')
+    index.add('Kafka stream processing', file_name='a-copy.pdf')
+    assert [hit['file_name'] for hit in index.search('"kafka stream processing" fintech')] == ['a.pdf', 'a-copy.pdf']
+    assert index.search('"processing kafka"') == []
+    assert index.search('fintech')[0]['matched_terms'] == ['fintech']
+
+
+@pytest.mark.parametrize('dense_postings', [10 ** 9, 0])
+def test_tombstones_are_left_out_of_bm25_and_purged(monkeypatch, dense_postings):
+    monkeypatch.setattr('backend.search_index.SEARCH_DENSE_POSTINGS', dense_postings)
+    texts = _corpus(80)
+    merged, later = SearchIndex(block_size=8), SearchIndex(block_size=8)
+    for i in range(50):
+        merged.add(texts[i], file_name=f'{i}.pdf', content_hash=str(i))
+    # The later segment re-indexed 20 of the same texts
+    for i in range(30, 80):
+        later.add(texts[i], file_name=f'{i}.pdf', content_hash=str(i))
+    merged.merge(later)
+    lengths = [len(tokenize(text)) for text in texts]
+    assert len(merged) == 80 and merged.total_length - merged.deleted_length == sum(lengths)
+
+    purged = merged.purged()
+    assert not purged.deleted and len(purged.documents) == 80 and purged.terms['w0'].df <= 80
+    for query in ['w0 w150', 'w3 w40 w299', '"w0 w1"']:
+        if query.startswith('"'):
+            # Phrases match the same live documents before and after purging
+            assert ({hit['file_name'] for hit in purged.search(query, top_k=80)}
+                    == {hit['file_name'] for hit in merged.search(query, top_k=80)})
+            continue
+        expected = _brute_force(texts, query.split())[:10]
+        hits = purged.search(query, top_k=10)
+        assert [(hit['score'], int(hit['file_name'][:-4])) for hit in hits] == expected
+
+
+def test_segments_are_merged_and_compacted(tmp_path):
+    store = SearchStore(tmp_path, max_segments=2)
+    texts = _corpus(30)
+    for start in range(0, 30, 10):
+        segment = SearchIndex()
+        for i in range(start, start + 10):
+            segment.add(texts[i], file_name=f'{i}.pdf', content_hash=str(i))
+        store.write(segment)
+    # A text already indexed in an earlier segment is tombstoned, not counted twice
+    duplicate = SearchIndex()
+    duplicate.add(texts[0], file_name='again.pdf', content_hash='0')
+    store.write(duplicate)
+    # Writes never compact inline; a long-running writer does it in the background
+    assert len(store.segment_names()) == 4
+    store.compact_in_background().join()
+
+    reader = SearchStore(tmp_path)
+    index = reader.refresh()
+    assert len(index) == 30 and len(reader.segment_names()) == 1
+    # The tombstoned copy is gone from the compacted segment
+    assert len(index.documents) == 30 and not index.deleted
+    assert store.compact_in_background() is None
+    expected = [doc_id for _, doc_id in _brute_force(texts, ['w0', 'w9'])[:5]]
+    assert [int(hit['file_name'][:-4]) for hit in index.search('w0 w9', top_k=5)] == expected
+
+
+def test_matching_indexes_parsed_resumes(tmp_path):
+    paths = write_resume_corpus(tmp_path, 6)
+    index = SearchIndex()
+    JobMatcher(search_index=index).match_resumes_to_job(paths, 'Python, Django, PostgreSQL')
+    assert len(index) == 6
+    hits = index.search('python')
+    assert hits and {hit['file_name'] for hit in hits} <= {p.split('/')[-1] for p in paths}
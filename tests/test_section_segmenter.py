@@ -0,0 +1,50 @@
+from backend.resume_parser import ResumeParser
+from backend.section_segmenter import segment_sections
+
+RESUME = """Jane Doe
+jane@example.com
+Summary
+Backend engineer with 4 years of experience.
+Work Experience
+Developed a billing service using Python and PostgreSQL
+Projects
+Built a chess engine in Rust with alpha-beta search
+Education
+B.Sc Computer Science - developed a thesis on compilers; coursework in Java
+Skills & Tools
+Python, Docker, Kubernetes
+"""
+
+def test_sections_are_labelled_in_order():
+    sections = segment_sections(RESUME)
+    assert [s.label for s in sections] == ['header', 'summary', 'experience', 'projects', 'education', 'skills']
+    education = sections[4]
+    assert RESUME[education.start:education.end].startswith("Education\nB.Sc")
+
+def test_extractors_skip_education():
+    parser = ResumeParser()
+    candidate = parser.parse_text(RESUME, "jane_doe.docx", ["python", "java", "rust", "docker"])
+    assert candidate['projects'] == [
+        "Developed a billing service using Python and PostgreSQL",
+        "Built a chess engine in Rust with alpha-beta search",
+    ]
+    assert sorted(candidate['skills']) == ["docker", "python", "rust"]
+    assert candidate['experience_years'] == 4
+
+def test_unsectioned_resumes_use_the_whole_text():
+    parser = ResumeParser()
+    text = "Developed a payments platform using Java\n3 years of experience"
+    candidate = parser.parse_text(text, "john.docx", ["java"])
+    assert candidate['projects'] == ["Developed a payments platform using Java"]
+    assert candidate['experience_years'] == 3
+
+def test_languages_sections_count_as_skills():
+    parser = ResumeParser()
+    for heading in ["Languages", "Programming Languages"]:
+        text = f"Jane Doe\nEducation\nB.Sc Computer Science\n{heading}\nPython, Java, Go\n"
+        candidate = parser.parse_text(text, "jane.docx", ["python", "java", "go"])
+        assert sorted(candidate['skills']) == ["go", "java", "python"], heading
+
+    # Spoken languages are not skills
+    text = "Education\nB.Sc Computer Science\nSpoken Languages\nEnglish, Spanish, Go\nSkills\nPython\n"
+    assert parser.parse_text(text, "ana.docx", ["python", "go"])['skills'] == ["python"]
@@ -0,0 +1,75 @@
+import os
+import random
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from multiprocessing import shared_memory
+
+import backend.shm_transport as shm_transport
+from backend.dedup import DuplicateIndex
+from backend.shm_transport import write_payload, read_payload, discard, sweep_orphans, SEGMENT_PREFIX, SHM_DIR
+from backend.watch_daemon import ingest_file
+from benchmarks.synthetic import write_docx_resume
+
+def _segments():
+    return {name for name in os.listdir(SHM_DIR) if name.startswith(SEGMENT_PREFIX + '_')}
+
+def _make_payload(text):
+    return write_payload(text=text, features=np.arange(1000, dtype=np.float32))
+
+def test_worker_payload_is_read_in_place_and_unlinked():
+    before = _segments()
+    text = "Résumé — " + "python developer " * 2000
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        payload = pool.submit(_make_payload, text).result()
+        discarded = pool.submit(_make_payload, text).result()
+    # The worker has exited, but the parent now owns the segments
+    assert payload.shared and payload.name in _segments()
+
+    with read_payload(payload) as fields:
+        assert fields.text('text') == text
+        features = fields.array('features')
+        assert features.dtype == np.float32 and features[-1] == 999
+        assert not features.flags.writeable
+        del features
+    discard(discarded)
+    assert _segments() == before
+
+def test_small_payloads_are_carried_inline():
+    payload = write_payload(text="short", signature=np.ones(4, dtype=np.uint32))
+    assert not payload.shared
+    with read_payload(payload) as fields:
+        assert fields.text('text') == "short"
+        assert fields.array('signature').tolist() == [1, 1, 1, 1]
+
+def test_orphaned_segments_of_dead_processes_are_swept():
+    dead = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'],
+                          capture_output=True, text=True, check=True)
+    orphan = shared_memory.SharedMemory(name=f'{SEGMENT_PREFIX}_{dead.stdout.strip()}_abc123', create=True, size=64)
+    orphan.close()
+    live = shared_memory.SharedMemory(name=f'{SEGMENT_PREFIX}_{os.getpid()}_abc123', create=True, size=64)
+    try:
+        assert sweep_orphans() >= 1
+        assert orphan.name not in _segments() and live.name in _segments()
+    finally:
+        live.close()
+        live.unlink()
+
+def test_ingested_text_and_signature_match_the_parent_fingerprint(tmp_path, monkeypatch):
+    # Forked workers inherit the patched threshold, so even small resumes go through a segment
+    monkeypatch.setattr(shm_transport, 'SHM_MIN_BYTES', 0)
+    path = tmp_path / "resume.docx"
+    write_docx_resume(path, random.Random(5))
+    index = DuplicateIndex()
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        result = pool.submit(ingest_file, str(path), (index.hasher.num_perm, index.hasher.shingle_size)).result()
+
+    assert result['payload'].shared
+    with read_payload(result['payload']) as fields:
+        text = fields.text('text')
+        digest, signature = index.fingerprint(text)
+        assert result['content_hash'] == digest
+        assert np.array_equal(fields.array('signature'), signature)
+    assert result['payload'].name not in _segments()
@@ -0,0 +1,40 @@
+import json
+import os
+
+from backend import skill_taxonomy
+from backend.job_matcher import JobMatcher
+from backend.resume_parser import ResumeParser
+from backend.skill_taxonomy import SkillTaxonomy, get_taxonomy
+
+def test_aliases_resolve_to_canonical_skills():
+    text = "Deployed on K8s with Postgres; front end in JS, models in sklearn. Exposed a REST API."
+    skills = ResumeParser().extract_skills_from_text(text)
+    for expected in ['kubernetes', 'postgresql', 'javascript', 'scikit-learn', 'rest api', 'rest', 'api']:
+        assert expected in skills
+
+def test_title_only_skills_follow_the_job_title():
+    description = "We use NLP and deep learning in Python"
+    matcher = JobMatcher()
+    assert 'nlp' not in matcher.extract_skills_from_job_description(description, "Backend Engineer")
+    assert {'nlp', 'deep learning', 'python'} <= set(
+        matcher.extract_skills_from_job_description(description, "AI Engineer")
+    )
+
+def test_hierarchy_and_large_taxonomies():
+    taxonomy = get_taxonomy()
+    assert taxonomy.ancestors('express') == ['node.js', 'javascript', 'frameworks']
+
+    data = {'skills': [{'skill': f'tool{i}', 'category': 'tools'} for i in range(5000)]}
+    data['skills'].append({'skill': 'python', 'category': 'languages', 'aliases': ['py3']})
+    big = SkillTaxonomy(data)
+    assert big.find_skills("Wrote tool4999 and tool12 plugins in py3") == ['tool12', 'tool4999', 'python']
+
+def test_taxonomy_hot_reload(tmp_path, monkeypatch):
+    monkeypatch.setattr(skill_taxonomy, 'TAXONOMY_RELOAD_INTERVAL', 0)
+    path = tmp_path / "taxonomy.json"
+    path.write_text(json.dumps({'skills': [{'skill': 'python'}]}))
+    assert get_taxonomy(path).find_skills("python and rust") == ['python']
+
+    path.write_text(json.dumps({'skills': [{'skill': 'python'}, {'skill': 'rust'}]}))
+    os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 10))
+    assert get_taxonomy(path).find_skills("python and rust") == ['python', 'rust']
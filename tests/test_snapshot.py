@@ -0,0 +1,61 @@
+import os
+import time
+
+from backend import snapshot
+from backend.mcq_generator import MCQGenerator
+from backend.skill_taxonomy import SkillTaxonomy
+
+
+def test_snapshot_round_trips_compiled_tables(tmp_path):
+    path = tmp_path / 'startup.snapshot'
+    built = snapshot.build_snapshot(path)
+    loaded = snapshot.Snapshot(path)
+
+    reference = SkillTaxonomy.from_file()
+    taxonomy = SkillTaxonomy.from_tables(loaded.section('taxonomy'))
+    text = 'Shipped k8s services in golang and reactjs on postgres behind a REST API'
+    assert taxonomy.find_skills(text) == reference.find_skills(text)
+    assert taxonomy.ancestors('sklearn') == reference.ancestors('sklearn')
+
+    bank = loaded.section('question_bank')
+    assert bank == MCQGenerator.index_question_bank(MCQGenerator.build_question_bank())
+    assert loaded.source_digest == built.source_digest == snapshot.source_digest()
+    built.close()
+    loaded.close()
+
+
+def test_stale_snapshot_is_rebuilt(tmp_path, monkeypatch):
+    source = tmp_path / 'source.json'
+    source.write_text('{"a": 1}')
+    monkeypatch.setattr(snapshot, 'SOURCE_FILES', snapshot.SOURCE_FILES + [source])
+    path = tmp_path / 'startup.snapshot'
+
+    first = snapshot.load_snapshot(path)
+    assert snapshot.load_snapshot(path) is first
+
+    source.write_text('{"a": 2}')
+    second = snapshot.load_snapshot(path)
+    assert second is not first and second.source_digest == snapshot.source_digest()
+    assert second.section('taxonomy')['skills']
+    second.close()
+    snapshot._snapshots.pop(str(path))
+
+
+def test_source_digest_is_cached_until_a_source_changes(tmp_path, monkeypatch):
+    source = tmp_path / 'source.json'
+    source.write_text('{"a": 1}')
+    hour_ago = time.time() - 3600
+    os.utime(source, (hour_ago, hour_ago))
+    monkeypatch.setattr(snapshot, 'SOURCE_FILES', snapshot.SOURCE_FILES + [source])
+    monkeypatch.setattr(snapshot, '_digest_cache', None)
+    hashed = []
+    hash_sources = snapshot._hash_sources
+    monkeypatch.setattr(snapshot, '_hash_sources', lambda: hashed.append(1) or hash_sources())
+
+    first = snapshot.source_digest()
+    assert snapshot.source_digest() == first and len(hashed) == 1
+
+    # Same size, older mtime: still noticed
+    source.write_text('{"a": 2}')
+    os.utime(source, (hour_ago - 60, hour_ago - 60))
+    assert snapshot.source_digest() != first and len(hashed) == 2
@@ -0,0 +1,43 @@
+import json
+import random
+
+from backend.dedup import DuplicateIndex
+from backend.job_matcher import JobMatcher
+from backend.spill_store import SpillStore
+from backend.text_cache import text_cache
+from benchmarks.synthetic import write_resume_corpus
+
+
+def test_merged_runs_match_a_stable_sort(tmp_path):
+    rng = random.Random(5)
+    items = [{'id': i, 'score': rng.randint(0, 20), 'pad': 'x' * rng.randint(0, 200)} for i in range(500)]
+    key = lambda item: (-item['score'],)
+
+    with SpillStore(key, memory_budget=4096, directory=tmp_path) as store:
+        for item in items:
+            store.add(item)
+        assert len(store.runs) > 5 and len(store) == 500
+        assert store.peak_buffer_bytes < 4096 + 1024
+        assert [item['id'] for item in store] == [item['id'] for item in sorted(items, key=key)]
+    assert not any(tmp_path.iterdir())
+
+
+def test_budgeted_matching_ranks_like_in_memory_matching(tmp_path):
+    paths = write_resume_corpus(tmp_path / 'resumes', 12)
+    job_description = 'Python, Django, PostgreSQL, Redis and Docker'
+    expected = JobMatcher().match_resumes_to_job(paths, job_description)
+
+    ranking_path = tmp_path / 'ranking.jsonl'
+    text_cache.clear()
+    pool = DuplicateIndex.load_or_create(tmp_path / 'pool.sqlite3')
+    results = JobMatcher(duplicate_index=pool).match_resumes_to_job_budgeted(
+        paths, job_description, memory_budget=2048, top_k=5, ranking_path=ranking_path
+    )
+
+    order = [(c['file_name'], c['overall_score']) for c in expected['candidates']]
+    assert results['spilled_runs'] > 1 and results['total_candidates'] == 12
+    assert [(c['file_name'], c['overall_score']) for c in results['candidates']] == order[:5]
+    streamed = [json.loads(line) for line in ranking_path.read_text().splitlines()]
+    assert [(c['file_name'], c['overall_score']) for c in streamed] == order
+    # Neither the text cache nor the candidate pool holds the batch
+    assert len(text_cache) == 0 and len(pool) == 0
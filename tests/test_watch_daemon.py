@@ -0,0 +1,126 @@
+import random
+import shutil
+import threading
+import time
+
+import docx
+import pytest
+
+from backend.dedup import DuplicateIndex
+from backend.resume_parser import ResumeParser
+from backend.search_index import SearchStore
+from backend.watch_daemon import Debouncer, WatchDaemon, InotifyWatcher
+from benchmarks.synthetic import write_docx_resume
+
+def _run_until(daemon, condition, timeout=60):
+    stop = threading.Event()
+    thread = threading.Thread(target=daemon.run, args=(stop,))
+    thread.start()
+    try:
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        stop.set()
+        thread.join()
+    assert condition()
+
+def test_debouncer_waits_for_a_file_to_settle(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(b"%PDF-1.4 partial")
+    debouncer = Debouncer(quiet_seconds=1.0)
+    debouncer.touch(str(path), now=0.0)
+    assert debouncer.ready(now=0.5) == []
+
+    # Still being written, without a new event: another quiet period starts
+    path.write_bytes(b"%PDF-1.4 partial, now complete")
+    assert debouncer.ready(now=1.0) == []
+    assert debouncer.next_due(now=1.0) == 1.0
+    assert [p for p, _ in debouncer.ready(now=2.0)] == [str(path)]
+    assert len(debouncer) == 0
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_watched_files_are_ingested_once_across_restarts(tmp_path, use_inotify):
+    if use_inotify:
+        try:
+            InotifyWatcher([str(tmp_path)]).close()
+        except OSError:
+            pytest.skip("inotify is not available")
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    rng = random.Random(3)
+    for i in range(3):
+        write_docx_resume(inbox / f"candidate_{i}.docx", rng)
+    options = dict(state_db=tmp_path / "watch.sqlite3", workers=2, debounce_seconds=0.2, poll_interval=0.1,
+                   use_inotify=use_inotify, duplicate_index_path=tmp_path / "pool.sqlite3",
+                   search_store=SearchStore(tmp_path / "search"))
+
+    daemon = WatchDaemon([inbox], **options)
+    _run_until(daemon, lambda: daemon.state.stats()['done'] == 3)
+    assert len(daemon.duplicate_index) == 3
+
+    # After a restart, files already ingested are not parsed again; new ones are, including in new subfolders
+    daemon = WatchDaemon([inbox], **options)
+    def drop_files():
+        time.sleep(0.5)
+        (inbox / "referrals").mkdir()
+        write_docx_resume(inbox / "referrals" / "candidate_3.docx", rng)
+        shutil.copy(inbox / "candidate_0.docx", inbox / "candidate_0_copy.docx")
+        (inbox / "candidate_4.docx.part").write_bytes(b"incomplete")
+    threading.Thread(target=drop_files).start()
+    _run_until(daemon, lambda: sum(daemon.state.stats().values()) == 5)
+
+    assert daemon.parsed == 2
+    assert daemon.state.stats() == {'done': 4, 'duplicate': 1, 'failed': 0}
+    assert len(daemon.duplicate_index) == 4
+    assert len(SearchStore(tmp_path / "search").refresh()) == 4
+    assert {c['file_name'] for c in daemon.state.candidates()} == {f"candidate_{i}.docx" for i in range(4)}
+
+def test_daemon_and_ui_share_the_candidate_pool(tmp_path):
+    inbox, uploads = tmp_path / "inbox", tmp_path / "uploads"
+    inbox.mkdir()
+    uploads.mkdir()
+    rng = random.Random(11)
+    for i in range(2):
+        write_docx_resume(inbox / f"candidate_{i}.docx", rng)
+    write_docx_resume(uploads / "jane_doe.docx", rng)
+    pool = tmp_path / "pool.sqlite3"
+    daemon = WatchDaemon([inbox], state_db=tmp_path / "watch.sqlite3", workers=2, debounce_seconds=0.2,
+                         poll_interval=0.1, use_inotify=False, duplicate_index_path=pool,
+                         search_store=SearchStore(tmp_path / "search"))
+    ui = DuplicateIndex.load_or_create(pool)
+
+    def upload_then_copy():
+        # The UI saves an analysed upload while the daemon is running, then the same file lands in the inbox
+        time.sleep(0.5)
+        ResumeParser().parse_multiple_resumes([str(uploads / "jane_doe.docx")], ["python"], ui)
+        ui.save()
+        shutil.copy(uploads / "jane_doe.docx", inbox / "agency_cv_0193.docx")
+    threading.Thread(target=upload_then_copy).start()
+    _run_until(daemon, lambda: sum(daemon.state.stats().values()) == 3)
+
+    assert daemon.state.stats() == {'done': 2, 'duplicate': 1, 'failed': 0}
+    ui.refresh()
+    reloaded = DuplicateIndex.load_or_create(pool)
+    expected = ["candidate_0.docx", "candidate_1.docx", "jane_doe.docx"]
+    assert sorted(entry['file_name'] for entry in reloaded.entries) == expected
+    assert sorted(entry['file_name'] for entry in ui.entries) == expected
+
+def test_same_named_files_in_different_folders_are_not_the_same_file(tmp_path):
+    inbox = tmp_path / "inbox"
+    lines = ["Jane Doe - Backend Engineer", "Built a billing service in Python and PostgreSQL",
+             "Ran Kafka pipelines processing 2 million events per day", "Skills: Python, Docker, AWS, Redis"]
+    for folder, extra in [("agency_a", "Git"), ("agency_b", "Terraform")]:
+        (inbox / folder).mkdir(parents=True)
+        document = docx.Document()
+        for line in lines[:-1] + [f"{lines[-1]}, {extra}"]:
+            document.add_paragraph(line)
+        document.save(str(inbox / folder / "resume.docx"))
+    daemon = WatchDaemon([inbox], state_db=tmp_path / "watch.sqlite3", workers=1, debounce_seconds=0.2,
+                         poll_interval=0.1, use_inotify=False, duplicate_index_path=tmp_path / "pool.sqlite3",
+                         search_store=SearchStore(tmp_path / "search"))
+    _run_until(daemon, lambda: sum(daemon.state.stats().values()) == 2)
+
+    # The second upload is a near-duplicate of the first, not a new version of the same file
+    assert daemon.state.stats() == {'done': 1, 'duplicate': 1, 'failed': 0}
+    assert all('source_path' not in candidate for candidate in daemon.state.candidates())